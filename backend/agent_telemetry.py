@@ -0,0 +1,198 @@
+"""
+agent_telemetry.py — Per-agent, per-tool and per-event timings for ADK runs
+• AgentRunTelemetry wraps runner.run_async event streams for one request and
+  records, per agent: time to first event, model turns and the time spent
+  waiting on them, tool time and token usage (where events report it);
+  per tool call: latency and status
+• AgentMetrics aggregates finished requests for the /metrics/agents endpoint
+Model time is the gap before each model-authored event; tool time runs from
+the function call event to its function response, so a slow run can be put
+down to search, reasoning or the agent chain.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+# Recent samples kept per agent/tool for the aggregate percentiles
+METRIC_SAMPLES = 1000
+
+TOKEN_FIELDS = {
+    "prompt_tokens": "prompt_token_count",
+    "output_tokens": "candidates_token_count",
+    "total_tokens": "total_token_count"
+}
+
+
+def _new_agent_stats() -> Dict[str, Any]:
+    return {
+        "runs": 0, "events": 0, "first_event_seconds": None, "last_event_seconds": None,
+        "model_turns": 0, "model_seconds": 0.0, "tool_calls": 0, "tool_seconds": 0.0,
+        **{field: 0 for field in TOKEN_FIELDS}
+    }
+
+
+class AgentRunTelemetry:
+    """Event interceptor for the ADK runs of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.tool_calls: List[Dict[str, Any]] = []
+
+    def _agent(self, name: str) -> Dict[str, Any]:
+        if name not in self.agents:
+            self.agents[name] = _new_agent_stats()
+        return self.agents[name]
+
+    async def observe(self, events: AsyncIterator[Any], agent_name: Optional[str] = None) -> AsyncIterator[Any]:
+        """Pass events through unchanged while timing them.
+
+        agent_name is the root agent of the run; its first-event time counts from the
+        call, so it includes session loading and the first model turn.
+        """
+        run_started = previous = time.perf_counter()
+        pending_calls: Dict[str, tuple] = {}
+        if agent_name:
+            self._agent(agent_name)["runs"] += 1
+
+        async for event in events:
+            now = time.perf_counter()
+            self._record(event, run_started, previous, now, pending_calls)
+            previous = now
+            yield event
+
+    def _record(self, event, run_started: float, previous: float, now: float,
+                pending_calls: Dict[str, tuple]) -> None:
+        stats = self._agent(event.author)
+        stats["events"] += 1
+        if stats["first_event_seconds"] is None:
+            stats["first_event_seconds"] = round(now - run_started, 4)
+        stats["last_event_seconds"] = round(now - run_started, 4)
+
+        responses = event.get_function_responses()
+        for response in responses:
+            call = pending_calls.pop(response.id, None)
+            if call is None:
+                continue
+            tool, agent, called_at = call
+            seconds = now - called_at
+            result = response.response or {}
+            self.tool_calls.append({
+                "tool": tool, "agent": agent, "seconds": round(seconds, 4),
+                "status": result.get("status", "success"),
+                "cached": bool(result.get("cached", False))
+            })
+            caller = self._agent(agent)
+            caller["tool_calls"] += 1
+            caller["tool_seconds"] += seconds
+
+        if responses or event.author == "user":
+            return
+        # A model turn: the wait since the previous event was spent in the model
+        if not event.partial:
+            stats["model_turns"] += 1
+            stats["model_seconds"] += now - previous
+        for call in event.get_function_calls():
+            pending_calls[call.id] = (call.name, event.author, now)
+        usage = event.usage_metadata
+        if usage is not None:
+            for field, source in TOKEN_FIELDS.items():
+                stats[field] += getattr(usage, source, None) or 0
+
+    def summary(self) -> Dict[str, Any]:
+        tools: Dict[str, Dict[str, Any]] = {}
+        for call in self.tool_calls:
+            tool = tools.setdefault(call["tool"], {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            tool["calls"] += 1
+            tool["seconds"] = round(tool["seconds"] + call["seconds"], 4)
+            tool["max_seconds"] = max(tool["max_seconds"], call["seconds"])
+        agents = {
+            name: {**stats, "model_seconds": round(stats["model_seconds"], 4),
+                   "tool_seconds": round(stats["tool_seconds"], 4)}
+            for name, stats in self.agents.items()
+        }
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "agents": agents,
+            "tools": tools,
+            "tool_calls": self.tool_calls
+        }
+
+
+def _percentile(samples: List[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+
+def _distribution(samples: Deque[float]) -> Dict[str, Any]:
+    values = list(samples)
+    return {
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "max": round(max(values), 4) if values else None
+    }
+
+
+class AgentMetrics:
+    """Process-wide aggregate of AgentRunTelemetry summaries."""
+
+    def __init__(self, samples: int = METRIC_SAMPLES):
+        self._lock = threading.Lock()
+        self._samples = samples
+        self.requests = 0
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.tools: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, telemetry: AgentRunTelemetry) -> Dict[str, Any]:
+        """Add one request's telemetry and return its summary."""
+        summary = telemetry.summary()
+        with self._lock:
+            self.requests += 1
+            for name, stats in summary["agents"].items():
+                agent = self.agents.setdefault(name, {
+                    "runs": 0, "events": 0, "model_turns": 0, "model_seconds": 0.0,
+                    "tool_calls": 0, "tool_seconds": 0.0, **{field: 0 for field in TOKEN_FIELDS},
+                    "first_event": deque(maxlen=self._samples)
+                })
+                for key in ("runs", "events", "model_turns", "model_seconds",
+                            "tool_calls", "tool_seconds", *TOKEN_FIELDS):
+                    agent[key] += stats[key]
+                if stats["first_event_seconds"] is not None:
+                    agent["first_event"].append(stats["first_event_seconds"])
+            for call in summary["tool_calls"]:
+                tool = self.tools.setdefault(call["tool"], {
+                    "calls": 0, "seconds": 0.0, "cached": 0, "statuses": {},
+                    "latency": deque(maxlen=self._samples)
+                })
+                tool["calls"] += 1
+                tool["seconds"] += call["seconds"]
+                tool["cached"] += int(call["cached"])
+                tool["statuses"][call["status"]] = tool["statuses"].get(call["status"], 0) + 1
+                tool["latency"].append(call["seconds"])
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {
+                name: {
+                    **{key: value for key, value in agent.items() if key != "first_event"},
+                    "model_seconds": round(agent["model_seconds"], 4),
+                    "tool_seconds": round(agent["tool_seconds"], 4),
+                    "first_event_seconds": _distribution(agent["first_event"])
+                }
+                for name, agent in self.agents.items()
+            }
+            tools = {
+                name: {
+                    **{key: value for key, value in tool.items() if key not in {"latency", "statuses"}},
+                    "seconds": round(tool["seconds"], 4),
+                    "statuses": dict(tool["statuses"]),
+                    "latency_seconds": _distribution(tool["latency"])
+                }
+                for name, tool in self.tools.items()
+            }
+            return {"requests": self.requests, "agents": agents, "tools": tools}
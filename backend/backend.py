@@ -1,18 +1,85 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Request, UploadFile, HTTPException
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import tempfile
+from typing import Any, Dict, List, Optional
+from sse_starlette.sse import EventSourceResponse
+import json
 import os
+import time
 import asyncio
-from document_ingestor import StartupAnalyzer
-from factcheck_agent import factcheck_agent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.artifacts import InMemoryArtifactService
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from document_ingestor import StartupAnalyzer, warm_render_pool
+from job_queue import AnalysisJobManager, JobQueueFull
+from factcheck_agent import factcheck_agent, normalization_agent
+from normalizer import format_normalization_table, normalize_text, parse_table_rows
+from metrics_engine import MetricsEngine, format_verification_block
+from search_tool import default_search_service
+from prompt_registry import prompt_stats
+from economics_pipeline import ECONOMICS_APP_NAME, analyze_startup_economics
+from session_store import (
+    DEFAULT_ARTIFACT_DIR, DEFAULT_SESSION_DB_PATH, RunnerPool, attach_model_callbacks, create_agent_services,
+    run_agent_once
+)
+from business_model_agent import economics_parallel_agent, report_making_agent
+from cassette import default_cassette
+from telemetry import propagate, span
+from agent_telemetry import AgentMetrics, AgentRunTelemetry
+from service_metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REQUEST_BUCKETS, AdkModelTimer, registry as metrics_registry
 from google.genai import types
 
 app = FastAPI(title="Startup Document Analyzer API", version="1.0.0")
 
+# Uploads are read straight into memory, so cap them before the body is parsed
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Multipart boundaries and part headers on top of the files themselves
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+def _max_request_bytes(path: str) -> int:
+    # A job submission may carry as many documents as the queue holds
+    files = MAX_QUEUED_JOBS if path == "/jobs/documents" else 1
+    return files * MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+
+class RequestSizeLimit:
+    """
+    Rejects oversized request bodies with 413 before Starlette spools them:
+    up front from Content-Length, otherwise by counting body bytes as they arrive
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        max_bytes = _max_request_bytes(scope["path"])
+        detail = f"Request too large. Maximum size is {max_bytes} bytes"
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Raised while FastAPI parses the body, which passes HTTPException through
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+# Added first so it runs inside CORS (a 413 still carries the CORS headers the browser
+# needs to read it) and inside the metrics middleware: rejections are timed, and the 413
+# raised mid-body isn't wrapped by BaseHTTPMiddleware's task group
+app.add_middleware(RequestSizeLimit)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -22,12 +89,152 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route template (SSE routes: time until the stream starts)
+REQUEST_SECONDS = metrics_registry.histogram(
+    "http_request_duration_seconds", "Request latency by route", labels=("method", "route", "status"),
+    buckets=REQUEST_BUCKETS
+)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started, method=request.method,
+            route=getattr(route, "path", "unmatched"), status=status
+        )
+
 # Initialize analyzer
 analyzer = StartupAnalyzer()
 
-# Initialize fact-checking services
-session_service = InMemorySessionService()
-artifact_service = InMemoryArtifactService()
+# Dedicated executor for the synchronous analyzer pipeline, so long analyses
+# never block the event loop (and /health keeps answering under load).
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "4"))
+analysis_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_ANALYSES,
+    thread_name_prefix="analysis"
+)
+
+ANALYSES_IN_FLIGHT = metrics_registry.gauge(
+    "analyses_in_flight", "Analyzer calls queued or running on the analysis executor"
+)
+
+async def run_analysis(func, *args, **kwargs):
+    """Run a blocking analyzer call on the analysis executor (inside the caller's trace)."""
+    loop = asyncio.get_running_loop()
+    ANALYSES_IN_FLIGHT.inc()
+    try:
+        return await loop.run_in_executor(analysis_executor, partial(propagate(func), *args, **kwargs))
+    finally:
+        ANALYSES_IN_FLIGHT.dec()
+
+async def read_upload_limited(file: UploadFile, max_bytes: Optional[int] = None) -> bytes:
+    """Read an upload into a single bytes object, rejecting files over max_bytes (default MAX_UPLOAD_BYTES)."""
+    if max_bytes is None:
+        max_bytes = MAX_UPLOAD_BYTES
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {max_bytes} bytes")
+
+    with span("upload.read", file_name=file.filename, content_type=file.content_type) as upload_span:
+        # One read, bounded by the limit; bytes (unlike a bytearray) are shared, not copied, by BytesIO
+        content = await file.read(max_bytes + 1)
+        if len(content) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {max_bytes} bytes")
+        upload_span.set_attribute("bytes", len(content))
+    return content
+
+# Upload types every document endpoint accepts, and the extension the analyzer dispatches on
+DOCUMENT_CONTENT_TYPES = {
+    'application/pdf': '.pdf',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': '.pptx'
+}
+LEGACY_PPT_CONTENT_TYPE = 'application/vnd.ms-powerpoint'
+
+def _check_document_type(file: UploadFile) -> None:
+    """Reject uploads the analyzer can't read: 415 for legacy .ppt, 400 for other types."""
+    if file.content_type == LEGACY_PPT_CONTENT_TYPE:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Legacy .ppt files are not supported ({file.filename}). Please convert to PPTX or PDF."
+        )
+    if file.content_type not in DOCUMENT_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type for {file.filename}: {file.content_type}. Supported types: PDF, PPTX"
+        )
+
+def _document_file_name(file: UploadFile) -> str:
+    """Upload name with an extension matching its content type."""
+    file_name = file.filename or "document"
+    suffix = DOCUMENT_CONTENT_TYPES[file.content_type]
+    return file_name if file_name.lower().endswith(suffix) else file_name + suffix
+
+# Background document jobs share the analysis executor with direct requests
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "20"))
+JOB_LONG_POLL_MAX_SECONDS = 30.0
+
+async def _run_document_job(job, progress_callback):
+    return await run_analysis(
+        analyzer.analyze_document_bytes, job.content, job.file_name, progress_callback=progress_callback
+    )
+
+job_manager = AnalysisJobManager(_run_document_job, workers=JOB_WORKERS, max_queued_jobs=MAX_QUEUED_JOBS)
+
+# Initialize fact-checking services: session storage and one long-lived runner per agent
+FACTCHECK_APP_NAME = "FactCheck-Studio"
+FACTCHECK_USER_ID = "Investment_Analyst"
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")  # memory or sqlite
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", DEFAULT_SESSION_DB_PATH)
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+SESSION_EVENT_WINDOW = int(os.getenv("SESSION_EVENT_WINDOW", "0"))
+
+session_service, artifact_service = create_agent_services(
+    SESSION_BACKEND,
+    max_sessions=MAX_SESSIONS,
+    ttl_seconds=SESSION_TTL_SECONDS,
+    session_db_path=SESSION_DB_PATH,
+    artifact_dir=ARTIFACT_DIR,
+    event_window=SESSION_EVENT_WINDOW
+)
+runner_pool = RunnerPool(FACTCHECK_APP_NAME, session_service, artifact_service)
+economics_runner_pool = RunnerPool(ECONOMICS_APP_NAME, session_service, artifact_service)
+
+# Agent model call latency by model (attached first, so replayed cassette calls are not timed)
+adk_model_timer = AdkModelTimer()
+attach_model_callbacks(
+    [factcheck_agent, normalization_agent, economics_parallel_agent, report_making_agent],
+    before=adk_model_timer.before_model_callback, after=adk_model_timer.after_model_callback
+)
+
+# MODEL_CASSETTE_MODE=record|replay: agent model calls go through the cassette
+cassette = default_cassette()
+if cassette is not None:
+    attach_model_callbacks(
+        [factcheck_agent, normalization_agent, economics_parallel_agent, report_making_agent],
+        before=cassette.before_model_callback, after=cassette.after_model_callback
+    )
+
+# Per-agent/per-tool timings of every fact-check and economics request (/metrics/agents)
+agent_metrics = AgentMetrics()
+
+# Numbers are normalized locally; only spans the rules cannot parse go to Normalization_Agent
+NORMALIZER_LLM_FALLBACK = os.getenv("NORMALIZER_LLM_FALLBACK", "true").lower() not in {"0", "false", "no"}
+
+# Runway, growth, LTV:CAC, MRR×12 and contradictions are computed locally, not by the agent
+metrics_engine = MetricsEngine()
+
+# Economics branches run concurrently; each is cut off independently
+ECONOMICS_BRANCH_TIMEOUT_SECONDS = float(os.getenv("ECONOMICS_BRANCH_TIMEOUT_SECONDS", "60"))
+ECONOMICS_REPORT_TIMEOUT_SECONDS = float(os.getenv("ECONOMICS_REPORT_TIMEOUT_SECONDS", "90"))
 
 class TextAnalysisRequest(BaseModel):
     email_text: str = None
@@ -36,54 +243,221 @@ class TextAnalysisRequest(BaseModel):
 class FactCheckRequest(BaseModel):
     content: str
     analysis_type: str = "general"  # general, document, email, call
+    related_documents: Dict[str, str] = None  # earlier documents ({name: text}, oldest first) to cross-check
+
+class EconomicsRequest(BaseModel):
+    content: str
+    branch_timeout_seconds: float = None  # defaults to ECONOMICS_BRANCH_TIMEOUT_SECONDS
+
+def _cache_lookups() -> Dict[tuple, float]:
+    lookups = {}
+    if analyzer.result_cache is not None:
+        stats = analyzer.result_cache.stats()
+        lookups[("result", "hit")] = stats["hits"]
+        lookups[("result", "miss")] = stats["misses"]
+    stats = default_search_service().stats()
+    lookups[("search", "hit")] = stats["cache_hits"] + stats["collapsed"]
+    lookups[("search", "miss")] = stats["searches"]
+    return lookups
+
+def _cache_hit_ratios() -> Dict[tuple, float]:
+    ratios = {("search",): default_search_service().stats()["hit_ratio"]}
+    if analyzer.result_cache is not None:
+        ratios[("result",)] = analyzer.result_cache.stats()["hit_ratio"]
+    return ratios
+
+metrics_registry.counter(
+    "cache_lookups_total", "Result cache and web search cache lookups by outcome",
+    labels=("cache", "outcome"), collect=_cache_lookups
+)
+metrics_registry.gauge(
+    "cache_hit_ratio", "Hit ratio since start (use rate(cache_lookups_total) for windows)",
+    labels=("cache",), collect=_cache_hit_ratios
+)
+def _live_sessions() -> Dict[tuple, float]:
+    session_service.evict_expired()
+    stats = session_service.stats()
+    return {(stats["backend"],): stats["live_sessions"]}
+
+metrics_registry.gauge("agent_sessions", "Live agent sessions", labels=("backend",), collect=_live_sessions)
+metrics_registry.gauge(
+    "document_jobs_queued", "Background document jobs waiting for a worker",
+    collect=lambda: {(): job_manager.stats()["queued"]}
+)
+
+@app.on_event("startup")
+async def start_render_workers():
+    # Worker start-up takes seconds; pay it before serving, not on the first document
+    await asyncio.get_running_loop().run_in_executor(None, warm_render_pool)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text-format metrics"""
+    adk_model_timer.expire()
+    return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "message": "Startup Document Analyzer API is running"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and size of the analysis result cache, plus model cassette counters"""
+    if analyzer.result_cache is None:
+        stats = {"enabled": False}
+    else:
+        stats = {"enabled": True, **analyzer.result_cache.stats()}
+    stats["cassette"] = cassette.stats() if cassette is not None else {"mode": "off"}
+    return stats
+
+@app.get("/sessions/stats")
+async def session_stats():
+    """Live agent sessions, artifact bytes and pooled runners"""
+    session_service.evict_expired()
+    return {**session_service.stats(), "runners": len(runner_pool) + len(economics_runner_pool)}
+
+@app.get("/search/stats")
+async def search_stats():
+    """Fact-check web searches: live calls, cache hits, collapsed duplicates, quota rejections"""
+    return default_search_service().stats()
+
+@app.get("/metrics/agents")
+async def agent_metrics_stats():
+    """Per-agent time to first event, model/tool time and tokens; per-tool call latency"""
+    return agent_metrics.stats()
+
+@app.get("/prompts/stats")
+async def prompts_stats():
+    """Version and token counts (total vs reusable instructions) of each prompt template"""
+    return {"prompts": prompt_stats()}
+
 @app.post("/analyze/document")
 async def analyze_document(file: UploadFile = File(...)):
     """
-    Analyze uploaded document (PDF, PPTX, PPT)
+    Analyze uploaded document (PDF, PPTX)
     """
     try:
-        # Validate file type
-        allowed_types = {
-            'application/pdf': '.pdf',
-            'application/vnd.openxmlformats-officedocument.presentationml.presentation': '.pptx',
-            'application/vnd.ms-powerpoint': '.ppt'
-        }
-        
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file type: {file.content_type}. Supported types: PDF, PPTX, PPT"
-            )
-        
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=allowed_types[file.content_type]) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        try:
+        _check_document_type(file)
+
+        with span("POST /analyze/document", content_type=file.content_type) as request_span:
+            # Read the upload once and hand the buffer straight to the analyzer
+            content = await read_upload_limited(file)
+
             # Analyze the document
             if file.content_type == 'application/pdf':
-                result = analyzer.analyze_pdf_document(tmp_file_path)
+                result = await run_analysis(analyzer.analyze_pdf_bytes, content, file_name=file.filename)
             else:
-                # For now, we'll handle PPTX/PPT as PDFs (you can extend this)
-                result = analyzer.analyze_pdf_document(tmp_file_path)
-            
-            return result
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+                # PPTX is read from its XML; only slides with pictures cost a vision call
+                result = await run_analysis(analyzer.analyze_pptx_bytes, content, file_name=file.filename)
+            request_span.set_attribute("status", result.get("status", "failed"))
+
+        return result
                 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Document analysis failed: {str(e)}")
 
+@app.post("/analyze/document/stream")
+async def analyze_document_stream(file: UploadFile = File(...)):
+    """
+    Analyze an uploaded document, streaming each page analysis as soon as it
+    finishes, then the summary, as Server-Sent Events
+    """
+    _check_document_type(file)
+    content = await read_upload_limited(file)
+    file_name = _document_file_name(file)
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def progress(event: str, data: Dict[str, Any]) -> None:
+        # Called from analyzer threads; hand over to the event loop
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    stream_names = {
+        "document_started": "started",
+        "page_completed": "page",
+        "summary_started": "summary_started",
+        "summary_completed": "summary"
+    }
+
+    async def event_stream():
+        analysis = asyncio.ensure_future(
+            run_analysis(analyzer.analyze_document_bytes, content, file_name, progress_callback=progress)
+        )
+        while True:
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({next_event, analysis}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                event, data = next_event.result()
+                yield _sse(stream_names.get(event, event), data)
+                continue
+            next_event.cancel()
+            break
+
+        # Flush progress that landed alongside completion
+        while not events.empty():
+            event, data = events.get_nowait()
+            yield _sse(stream_names.get(event, event), data)
+
+        try:
+            result = analysis.result()
+        except Exception as exc:
+            yield _sse("error", {"error": f"Document analysis failed: {exc}"})
+            return
+        # Pages and summary were already streamed; finish with the metadata
+        yield _sse("done", {key: value for key, value in result.items() if key != "page_analyses"})
+
+    return EventSourceResponse(event_stream())
+
+@app.post("/jobs/documents", status_code=202)
+async def submit_document_jobs(files: List[UploadFile] = File(...)):
+    """
+    Queue one or many documents (e.g. a data room) for background analysis
+    """
+    # Check every file before queueing any, so a bad one rejects the whole submission
+    for file in files:
+        _check_document_type(file)
+
+    submissions = []
+    for file in files:
+        content = await read_upload_limited(file)
+        submissions.append({"file_name": _document_file_name(file), "content": content})
+
+    try:
+        jobs = job_manager.submit(submissions)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return {"jobs": [job.to_status() for job in jobs]}
+
+@app.get("/jobs/{job_id}")
+async def get_document_job(job_id: str, wait: float = 0, since: int = -1):
+    """
+    Job status with per-page progress. With wait > 0, long-polls until the
+    job's version is newer than `since` (or it finishes, or wait elapses).
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if wait > 0:
+        await job_manager.wait_for_change(job, since, min(wait, JOB_LONG_POLL_MAX_SECONDS))
+    return job.to_status()
+
+@app.get("/jobs/{job_id}/result")
+async def get_document_job_result(job_id: str):
+    """
+    Final analysis for a finished job
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job.status in {"queued", "running"}:
+        raise HTTPException(status_code=409, detail=f"Job is still {job.status}")
+    return job.result or {"error": job.error, "status": "failed"}
+
 @app.post("/analyze/email")
 async def analyze_email(request: TextAnalysisRequest):
     """
@@ -93,7 +467,7 @@ async def analyze_email(request: TextAnalysisRequest):
         if not request.email_text:
             raise HTTPException(status_code=400, detail="Email text is required")
         
-        result = analyzer.analyze_raw_email(request.email_text)
+        result = await run_analysis(analyzer.analyze_raw_email, request.email_text)
         return result
         
     except Exception as e:
@@ -108,24 +482,27 @@ async def analyze_call(request: TextAnalysisRequest):
         if not request.call_text:
             raise HTTPException(status_code=400, detail="Call text is required")
         
-        result = analyzer.analyze_raw_call_transcript(request.call_text)
+        result = await run_analysis(analyzer.analyze_raw_call_transcript, request.call_text)
         return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Call analysis failed: {str(e)}")
 
 # Fact-checking helper functions
-async def call_agent_async(runner, user_id, session_id, query):
-    """Call the fact-checking agent asynchronously"""
+async def call_agent_async(runner, user_id, session_id, query, telemetry: AgentRunTelemetry = None):
+    """Call the fact-checking agent asynchronously (timing its events when telemetry is given)"""
     content = types.Content(role="user", parts=[types.Part(text=query)])
     
     last_response = None
     try:
-        async for event in runner.run_async(
+        events = runner.run_async(
             user_id=user_id,
             session_id=session_id,
             new_message=content,
-        ):
+        )
+        if telemetry is not None:
+            events = telemetry.observe(events, runner.agent.name)
+        async for event in events:
             response = await _process_event(event)
             if response:
                 last_response = response
@@ -141,11 +518,93 @@ async def _process_event(event):
     final_response = None
     if event.content and event.content.parts:
         for part in event.content.parts:
-            text = getattr(part, "text", "").strip()
+            text = (getattr(part, "text", None) or "").strip()
             if text:
                 final_response = text
     return final_response
 
+async def normalize_for_factcheck(content: str, telemetry: AgentRunTelemetry = None) -> Dict[str, Any]:
+    """Build the NORMALIZATION TABLE for the fact-check stage (rules first, LLM for leftovers)"""
+    started = time.perf_counter()
+    values, unparsed = normalize_text(content)
+    rows = [value.table_row() for value in values]
+    fallback_rows = []
+    if unparsed and NORMALIZER_LLM_FALLBACK:
+        spans = []
+        for fragment in unparsed:
+            position = content.find(fragment)
+            snippet = content[max(0, position - 40):position + len(fragment) + 40].replace("\n", " ")
+            spans.append(f'- "{fragment}" (in: "...{snippet}...")')
+        query = "Normalize ONLY the following spans:\n" + "\n".join(spans)
+        try:
+            fallback_rows = parse_table_rows(await run_agent_once(
+                runner_pool, session_service, normalization_agent, query, FACTCHECK_USER_ID, telemetry
+            ))
+        except Exception as exc:
+            print(f"⚠️ Normalization fallback failed: {exc}")
+    return {
+        "table": format_normalization_table(rows + fallback_rows),
+        "rule_rows": len(rows),
+        "unparsed_spans": unparsed,
+        "llm_rows": len(fallback_rows),
+        "seconds": round(time.perf_counter() - started, 6)
+    }
+
+def verify_for_factcheck(request: FactCheckRequest) -> Dict[str, Any]:
+    """Deterministic calculations and contradictions across the content and any related documents"""
+    return metrics_engine.verify({**(request.related_documents or {}), "content": request.content})
+
+def _build_factcheck_query(request: FactCheckRequest, normalization_table: str,
+                           verification: Dict[str, Any]) -> str:
+    return f"""
+        Please fact-check the following {request.analysis_type} content:
+        
+        {request.content}
+        
+        Normalization Table (already computed; use these normalized values for all calculations):
+        
+        {normalization_table}
+        
+        {format_verification_block(verification)}
+        
+        Provide a comprehensive analysis including internal consistency checks and external verification where possible.
+        """
+
+def _serialize_event(event) -> Dict[str, Any]:
+    """Flatten an ADK event (text, tool calls/results, search queries) for streaming"""
+    texts, function_calls, function_responses = [], [], []
+    if event.content and event.content.parts:
+        for part in event.content.parts:
+            if getattr(part, "text", None) and part.text.strip():
+                texts.append(part.text)
+            if part.function_call:
+                function_calls.append({
+                    "name": part.function_call.name,
+                    "args": dict(part.function_call.args or {})
+                })
+            if part.function_response:
+                function_responses.append({
+                    "name": part.function_response.name,
+                    "response": part.function_response.response
+                })
+    search_queries = []
+    if event.grounding_metadata and event.grounding_metadata.web_search_queries:
+        search_queries = list(event.grounding_metadata.web_search_queries)
+    return {
+        "id": event.id,
+        "author": event.author,
+        "timestamp": event.timestamp,
+        "partial": bool(event.partial),
+        "is_final": event.is_final_response(),
+        "text": "\n".join(texts),
+        "function_calls": function_calls,
+        "function_responses": function_responses,
+        "search_queries": search_queries
+    }
+
+def _sse(event: str, data: Any) -> Dict[str, str]:
+    return {"event": event, "data": json.dumps(data, default=str)}
+
 @app.post("/analyze/factcheck")
 async def fact_check_content(request: FactCheckRequest):
     """
@@ -155,48 +614,129 @@ async def fact_check_content(request: FactCheckRequest):
         if not request.content:
             raise HTTPException(status_code=400, detail="Content is required for fact-checking")
         
-        # Create a new session for this fact-checking request
-        session = await session_service.create_session(
-            app_name="FactCheck-Studio",
-            user_id="Investment_Analyst",
-            state={}
-        )
-        
-        # Create runner
-        runner = Runner(
-            agent=factcheck_agent,
-            app_name="FactCheck-Studio",
-            session_service=session_service,
-            artifact_service=artifact_service
-        )
-        
-        # Prepare the fact-checking query
-        factcheck_query = f"""
-        Please fact-check the following {request.analysis_type} content:
+        runner = runner_pool.get(factcheck_agent)
+        telemetry = AgentRunTelemetry()
         
-        {request.content}
-        
-        Provide a comprehensive analysis including data normalization, internal consistency checks, and external verification where possible.
-        """
+        # Normalize numbers locally, then prepare the fact-checking query
+        normalization = await normalize_for_factcheck(request.content, telemetry)
+        verification = verify_for_factcheck(request)
+        factcheck_query = _build_factcheck_query(request, normalization["table"], verification)
         
-        # Call the fact-checking agent
-        result = await call_agent_async(
-            runner=runner,
-            user_id="Investment_Analyst",
-            session_id=session.id,
-            query=factcheck_query
+        # One-shot session on the shared runner; created right before the block that deletes it
+        session = await session_service.create_session(
+            app_name=FACTCHECK_APP_NAME,
+            user_id=FACTCHECK_USER_ID,
+            state={}
         )
+        try:
+            # Call the fact-checking agent
+            result = await call_agent_async(
+                runner=runner,
+                user_id=FACTCHECK_USER_ID,
+                session_id=session.id,
+                query=factcheck_query,
+                telemetry=telemetry
+            )
+        finally:
+            await session_service.delete_session(
+                app_name=FACTCHECK_APP_NAME, user_id=FACTCHECK_USER_ID, session_id=session.id
+            )
         
         return {
             "document_type": f"factcheck_{request.analysis_type}",
             "analysis": result,
+            "normalization": normalization,
+            "verification": verification,
+            "agent_timings": agent_metrics.record(telemetry),
             "status": "success",
             "session_id": session.id
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Fact-checking failed: {str(e)}")
 
+@app.post("/analyze/factcheck/stream")
+async def fact_check_content_stream(request: FactCheckRequest):
+    """
+    Fact-check content, streaming the local normalization table, then every
+    ADK event (tool calls, final verdict) as Server-Sent Events while it arrives
+    """
+    if not request.content:
+        raise HTTPException(status_code=400, detail="Content is required for fact-checking")
+
+    runner = runner_pool.get(factcheck_agent)
+    telemetry = AgentRunTelemetry()
+
+    async def event_stream():
+        # Created once the stream starts, so a client that never reads it leaves no session behind
+        session = await session_service.create_session(
+            app_name=FACTCHECK_APP_NAME,
+            user_id=FACTCHECK_USER_ID,
+            state={}
+        )
+        last_response = None
+        try:
+            yield _sse("started", {"session_id": session.id, "analysis_type": request.analysis_type})
+            normalization = await normalize_for_factcheck(request.content, telemetry)
+            yield _sse("normalization", normalization)
+            verification = verify_for_factcheck(request)
+            yield _sse("verification", verification)
+            content = types.Content(
+                role="user",
+                parts=[types.Part(text=_build_factcheck_query(request, normalization["table"], verification))]
+            )
+            async for event in telemetry.observe(runner.run_async(
+                user_id=FACTCHECK_USER_ID,
+                session_id=session.id,
+                new_message=content,
+            ), factcheck_agent.name):
+                payload = _serialize_event(event)
+                if payload["text"]:
+                    last_response = payload["text"]
+                yield _sse("agent_event", payload)
+        except Exception as exc:
+            yield _sse("error", {"error": f"Error during fact-checking: {exc}"})
+            return
+        finally:
+            # Runs on completion, error and client disconnect alike
+            await session_service.delete_session(
+                app_name=FACTCHECK_APP_NAME, user_id=FACTCHECK_USER_ID, session_id=session.id
+            )
+        yield _sse("done", {
+            "document_type": f"factcheck_{request.analysis_type}",
+            "analysis": last_response or "No response received from fact-checking agent",
+            "agent_timings": agent_metrics.record(telemetry),
+            "status": "success",
+            "session_id": session.id
+        })
+
+    return EventSourceResponse(event_stream())
+
+@app.post("/analyze/economics")
+async def analyze_economics(request: EconomicsRequest):
+    """
+    Revenue, pricing and monetization analyses run in parallel, then are
+    synthesized into one report. Slow or failed branches yield a partial result.
+    """
+    if not request.content:
+        raise HTTPException(status_code=400, detail="Content is required for economics analysis")
+    telemetry = AgentRunTelemetry()
+    try:
+        result = await analyze_startup_economics(
+            economics_runner_pool,
+            session_service,
+            request.content,
+            branch_timeout=request.branch_timeout_seconds or ECONOMICS_BRANCH_TIMEOUT_SECONDS,
+            report_timeout=ECONOMICS_REPORT_TIMEOUT_SECONDS,
+            telemetry=telemetry
+        )
+        agent_metrics.record(telemetry)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Economics analysis failed: {str(e)}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
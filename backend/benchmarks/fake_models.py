@@ -0,0 +1,162 @@
+"""
+fake_models.py — Local stand-ins for Gemini used by the offline benchmarks
+• LatencyProfile: per-call latency drawn from a fixed, uniform or lognormal
+  distribution, plus an injected error rate
+• FakeChatModel: replaces the LangChain ChatGoogleGenerativeAI models of
+  StartupAnalyzer (text and multimodal); answers batched page requests with
+  "=== PAGE n ===" sections
+• FakeAdkLlm: replaces the Gemini model of ADK LlmAgents (fact-check and
+  economics agents)
+Both record calls, simulated model seconds and injected errors.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Dict, Iterable
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+PAGE_HEADING_RE = re.compile(r"\*\*PAGE (\d+) TEXT CONTENT:\*\*")
+
+CANNED_SENTENCE = (
+    "Acme Robotics reports $41K MRR (Mar 2024), 120 paying customers, 2.1% monthly churn "
+    "and $1.2M raised in a seed round led by Example Ventures. "
+)
+
+
+class InjectedModelError(RuntimeError):
+    """Raised by the fakes to simulate a failed model call."""
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Latency distribution for one fake model.
+
+    spec strings: "fixed:0.2", "uniform:0.1:0.5" (low, high) or
+    "lognormal:0.3:0.5" (median seconds, sigma).
+    """
+    distribution: str = "fixed"
+    first: float = 0.05
+    second: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.distribution not in {"fixed", "uniform", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: str, error_rate: float = 0.0, seed: int = 0) -> "LatencyProfile":
+        name, *values = spec.split(":")
+        numbers = [float(value) for value in values] + [0.0, 0.0]
+        return cls(name, numbers[0], numbers[1], error_rate=error_rate, seed=seed)
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.distribution == "uniform":
+                return self._random.uniform(self.first, self.second)
+            if self.distribution == "lognormal":
+                return self._random.lognormvariate(0.0, self.second) * self.first
+            return self.first
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def describe(self) -> Dict[str, Any]:
+        return {"distribution": self.distribution, "params": [self.first, self.second], "error_rate": self.error_rate}
+
+
+class CallStats:
+    """Thread-safe counters shared by a fake model's calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.model_seconds = 0.0
+
+    def record(self, seconds: float, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self.model_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors, "model_seconds": round(self.model_seconds, 3)}
+
+
+def canned_text(response_words: int) -> str:
+    words = CANNED_SENTENCE.split()
+    return " ".join(words[index % len(words)] for index in range(response_words))
+
+
+class FakeChatModel:
+    """Sync LangChain chat model stand-in (only .invoke and .model are used by StartupAnalyzer)."""
+
+    def __init__(self, profile: LatencyProfile, response_words: int = 300, model: str = "fake-gemini"):
+        self.profile = profile
+        self.response_words = response_words
+        self.model = model
+        self.stats = CallStats()
+
+    def invoke(self, messages: Iterable[Any]) -> SimpleNamespace:
+        seconds = self.profile.sample()
+        failed = self.profile.should_fail()
+        time.sleep(seconds)
+        self.stats.record(seconds, failed)
+        if failed:
+            raise InjectedModelError(f"Injected error from {self.model}")
+
+        page_numbers = []
+        for message in messages:
+            parts = message.content if isinstance(message.content, list) else [message.content]
+            for part in parts:
+                text = part if isinstance(part, str) else part.get("text", "")
+                page_numbers += [int(number) for number in PAGE_HEADING_RE.findall(text)]
+        body = canned_text(self.response_words)
+        if len(page_numbers) > 1:
+            return SimpleNamespace(content="\n".join(f"=== PAGE {n} ===\n{body}" for n in page_numbers))
+        return SimpleNamespace(content=body)
+
+
+class FakeAdkLlm(BaseLlm):
+    """ADK model stand-in: async latency, then one text response (no tool calls)."""
+
+    profile: LatencyProfile
+    stats: CallStats
+    response_words: int = 300
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    async def generate_content_async(self, llm_request, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        seconds = self.profile.sample()
+        failed = self.profile.should_fail()
+        await asyncio.sleep(seconds)
+        self.stats.record(seconds, failed)
+        if failed:
+            raise InjectedModelError(f"Injected error from {self.model}")
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=canned_text(self.response_words))]))
+
+
+def install_fake_adk_model(agents: Iterable[Any], llm: FakeAdkLlm) -> None:
+    """Point every LlmAgent in the given agent trees at the fake model."""
+    for agent in agents:
+        if hasattr(agent, "model"):
+            agent.model = llm
+        install_fake_adk_model(getattr(agent, "sub_agents", []) or [], llm)
@@ -0,0 +1,444 @@
+"""
+harness.py — Offline benchmark suite for the analysis pipelines and API
+• Every Gemini model is replaced by an in-process fake (benchmarks/fake_models.py)
+  with a configurable latency distribution and error rate
+• Scenarios: pdf (N-page deck through StartupAnalyzer), email, call, factcheck
+  and economics (through the FastAPI app, in-process), and health (/health
+  latency, idle and while --documents uploads are being analyzed)
+• Reports wall time, latency percentiles, requests/sec, errors, per-stage time
+  and peak RSS per scenario; results are written to JSON and can be compared
+  against an earlier run
+
+Usage:
+    python benchmarks/harness.py
+    python benchmarks/harness.py --scenarios pdf email --pages 48 --iterations 20 --concurrency 4
+    python benchmarks/harness.py --latency lognormal:0.3:0.5 --error-rate 0.02 --json after.json --compare before.json
+"""
+
+import os
+
+# Benchmarks measure the pipelines, not the caches or the network
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("SEARCH_BACKEND", "stub")
+os.environ.setdefault("SESSION_BACKEND", "memory")
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fake_models import CallStats, FakeAdkLlm, FakeChatModel, LatencyProfile, install_fake_adk_model
+from render_policy_benchmark import build_synthetic_deck
+
+SCENARIOS = ["pdf", "email", "call", "factcheck", "economics", "health"]
+
+SAMPLE_EMAIL = """From: founder@acme-robotics.example
+Subject: March update
+
+Hi all, quick update for March. We hit $41K MRR (up from $38K in February), 120 paying
+customers and churn held at 2.1% monthly. Burn is $85K/month with $1.1M in the bank, so
+roughly 13 months of runway. We're raising a $3M seed extension at a $15M pre-money valuation.
+"""
+
+SAMPLE_CALL = """Investor: Can you walk me through the numbers?
+Founder: Sure. We're at $41K MRR, growing about 8% month over month since last summer.
+Investor: And customers?
+Founder: 120 paying customers, average contract around $340 a month, CAC is about $1,200.
+Investor: Churn?
+Founder: 2.1% monthly. Gross margin is 72%. We have 13 months of runway at current burn.
+"""
+
+SAMPLE_STARTUP = """Acme Robotics sells warehouse picking robots as a service for $340/month per unit.
+MRR is $41K across 120 customers with 2.1% monthly churn. CAC is $1,200 and gross margin 72%.
+The team of 14 raised $1.2M seed in 2023 and plans a $3M extension at a $15M pre-money valuation.
+"""
+
+
+class RssSampler:
+    """Samples resident set size in a background thread; reports the peak while running."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current_bytes() -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            # Lifetime peak in KiB on Linux; the best available without /proc
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self.start_bytes = self.current_bytes()
+        self.peak_bytes = self.start_bytes
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(name: str, latencies: List[float], stages: List[Dict[str, float]], errors: int,
+              wall_seconds: float, concurrency: int, sampler: RssSampler, model_stats: CallStats,
+              extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    stage_names = sorted({stage for sample in stages for stage in sample})
+    result = {
+        "scenario": name,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(latencies) / wall_seconds, 3) if wall_seconds else 0.0,
+        "latency_seconds": {
+            "mean": round(statistics.fmean(latencies), 4) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 0.50), 4),
+            "p95": round(_percentile(latencies, 0.95), 4),
+            "max": round(max(latencies), 4) if latencies else 0.0
+        },
+        # Mean seconds per request spent in each stage
+        "stages": {
+            stage: round(statistics.fmean(sample.get(stage, 0.0) for sample in stages), 4)
+            for stage in stage_names
+        },
+        "model": model_stats.snapshot(),
+        "rss_mb": {
+            "start": round(sampler.start_bytes / 2 ** 20, 1),
+            "peak": round(sampler.peak_bytes / 2 ** 20, 1)
+        }
+    }
+    if extra:
+        result.update(extra)
+    return result
+
+
+def run_pdf(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    from document_ingestor import StartupAnalyzer, warm_render_pool
+
+    analyzer = StartupAnalyzer(use_cache=False, page_batch_tokens=args.page_batch_tokens)
+    # The API starts its render workers at startup; keep that out of the timings too
+    warm_render_pool(analyzer.render_workers)
+    analyzer.text_model = models["text"]
+    analyzer.multimodal_model = models["multimodal"]
+    pdf_bytes = build_synthetic_deck(pages=args.pages)
+
+    def one_request(_) -> Dict[str, Any]:
+        marks = {"start": time.perf_counter()}
+
+        def progress(event: str, data: Dict[str, Any]) -> None:
+            marks.setdefault(event, time.perf_counter())
+
+        result = analyzer.analyze_pdf_bytes(pdf_bytes, file_name="synthetic.pdf", progress_callback=progress)
+        end = time.perf_counter()
+        summary_started = marks.get("summary_started", end)
+        stages = {
+            "open_and_count_pages": marks.get("document_started", summary_started) - marks["start"],
+            "page_analysis": summary_started - marks.get("document_started", marks["start"]),
+            "summary": end - summary_started
+        }
+        failed = result.get("status") != "success" or result.get("successful_analyses") != result.get("total_pages")
+        return {"latency": end - marks["start"], "stages": stages, "failed": failed}
+
+    with RssSampler() as sampler:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            samples = list(pool.map(one_request, range(args.iterations)))
+        wall = time.perf_counter() - started
+    return summarize(
+        "pdf", [s["latency"] for s in samples], [s["stages"] for s in samples],
+        sum(s["failed"] for s in samples), wall, args.concurrency, sampler, models["stats"],
+        extra={"pages": args.pages, "pages_per_second": round(args.pages * len(samples) / wall, 3)}
+    )
+
+
+async def _drive_api(args, models: Dict[str, Any], name: str, path: str, payload: Dict[str, Any],
+                     stages_from: Callable[[Dict[str, Any], float], Dict[str, float]]) -> Dict[str, Any]:
+    import backend
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    samples = []
+
+    async def one_request(client: httpx.AsyncClient) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latency = time.perf_counter() - started
+            body = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+            failed = response.status_code != 200 or body.get("status") == "failed"
+            samples.append({
+                "latency": latency,
+                "stages": stages_from(body, latency) if not failed else {},
+                "failed": failed,
+                # Degraded but usable answers, e.g. economics with a branch timed out
+                "partial": body.get("status") == "partial"
+            })
+
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        with RssSampler() as sampler:
+            started = time.perf_counter()
+            await asyncio.gather(*(one_request(client) for _ in range(args.iterations)))
+            wall = time.perf_counter() - started
+    return summarize(
+        name, [s["latency"] for s in samples], [s["stages"] for s in samples if s["stages"]],
+        sum(s["failed"] for s in samples), wall, args.concurrency, sampler, models["stats"],
+        extra={"partial": sum(s["partial"] for s in samples)}
+    )
+
+
+def _text_stages(model_stats: CallStats) -> Callable[[Dict[str, Any], float], Dict[str, float]]:
+    def stages(body: Dict[str, Any], latency: float) -> Dict[str, float]:
+        # One model call per request: the rest is endpoint, thread hand-off and serialization
+        model_seconds = model_stats.model_seconds / max(1, model_stats.calls)
+        return {"model": model_seconds, "overhead": max(0.0, latency - model_seconds)}
+    return stages
+
+
+def run_email(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    return asyncio.run(_drive_api(args, models, "email", "/analyze/email", {"email_text": SAMPLE_EMAIL},
+                                  _text_stages(models["stats"])))
+
+
+def run_call(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    return asyncio.run(_drive_api(args, models, "call", "/analyze/call", {"call_text": SAMPLE_CALL},
+                                  _text_stages(models["stats"])))
+
+
+def run_factcheck(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    def stages(body: Dict[str, Any], latency: float) -> Dict[str, float]:
+        normalization = body["normalization"]["seconds"]
+        verification = body["verification"]["seconds"]
+        return {
+            "normalization": normalization,
+            "verification": verification,
+            "agent": max(0.0, latency - normalization - verification)
+        }
+    return asyncio.run(_drive_api(args, models, "factcheck", "/analyze/factcheck",
+                                  {"content": SAMPLE_EMAIL, "analysis_type": "email"}, stages))
+
+
+def run_economics(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    def stages(body: Dict[str, Any], latency: float) -> Dict[str, float]:
+        timings = body["timings"]
+        return {
+            "parallel_branches": timings["parallel_seconds"],
+            "report": timings["total_seconds"] - timings["parallel_seconds"],
+            "sequential_branch_equivalent": timings["sequential_branch_seconds"]
+        }
+    return asyncio.run(_drive_api(args, models, "economics", "/analyze/economics",
+                                  {"content": SAMPLE_STARTUP}, stages))
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(_percentile(latencies, 0.50), 4),
+        "p99": round(_percentile(latencies, 0.99), 4),
+        "max": round(max(latencies), 4) if latencies else 0.0
+    }
+
+
+async def _drive_health(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    """Probe /health back to back, first idle, then while documents are analyzed."""
+    import backend
+    from document_ingestor import warm_render_pool
+
+    # ASGITransport doesn't run the startup hooks that start the render workers
+    warm_render_pool(backend.analyzer.render_workers)
+    pdf_bytes = build_synthetic_deck(pages=args.pages)
+    idle, loaded = [], []
+    health_errors = 0
+
+    async def probe(client: httpx.AsyncClient, into: List[float]) -> None:
+        nonlocal health_errors
+        started = time.perf_counter()
+        response = await client.get("/health")
+        into.append(time.perf_counter() - started)
+        health_errors += response.status_code != 200
+        await asyncio.sleep(args.health_interval)
+
+    async def upload(client: httpx.AsyncClient) -> bool:
+        response = await client.post("/analyze/document",
+                                     files={"file": ("synthetic.pdf", pdf_bytes, "application/pdf")})
+        return response.status_code == 200 and response.json().get("status") == "success"
+
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for _ in range(args.health_probes):
+            await probe(client, idle)
+        with RssSampler() as sampler:
+            started = time.perf_counter()
+            uploads = asyncio.gather(*(upload(client) for _ in range(args.documents)))
+            while not uploads.done():
+                await probe(client, loaded)
+            succeeded = await uploads
+            wall = time.perf_counter() - started
+
+    idle_summary, loaded_summary = _latency_summary(idle), _latency_summary(loaded)
+    return summarize(
+        "health", loaded, [], health_errors, wall, args.documents, sampler, models["stats"],
+        extra={
+            "documents": args.documents,
+            "document_errors": len(succeeded) - sum(succeeded),
+            "health_idle_seconds": idle_summary,
+            "health_loaded_seconds": loaded_summary,
+            # How much worse /health gets with the documents in flight (1.0 = flat)
+            "health_p99_ratio": round(loaded_summary["p99"] / idle_summary["p99"], 2) if idle_summary["p99"] else None
+        }
+    )
+
+
+def run_health(args, models: Dict[str, Any]) -> Dict[str, Any]:
+    return asyncio.run(_drive_health(args, models))
+
+
+RUNNERS = {"pdf": run_pdf, "email": run_email, "call": run_call, "factcheck": run_factcheck, "economics": run_economics,
+           "health": run_health}
+
+
+def build_models(args) -> Dict[str, Any]:
+    """Fresh fakes per scenario, so model counters cover one scenario only."""
+    profile = LatencyProfile.parse(args.latency, error_rate=args.error_rate, seed=args.seed)
+    stats = CallStats()
+    text_model = FakeChatModel(profile, args.response_words, model="fake-gemini-text")
+    multimodal_model = FakeChatModel(profile, args.response_words, model="fake-gemini-multimodal")
+    text_model.stats = multimodal_model.stats = stats
+    adk_model = FakeAdkLlm(model="fake-gemini-agent", profile=profile, stats=stats,
+                           response_words=args.response_words)
+    return {"text": text_model, "multimodal": multimodal_model, "adk": adk_model, "stats": stats,
+            "profile": profile}
+
+
+def install_api_models(models: Dict[str, Any]) -> None:
+    import backend
+    from business_model_agent import economics_parallel_agent, report_making_agent
+    from factcheck_agent import factcheck_agent, normalization_agent
+
+    backend.analyzer.text_model = models["text"]
+    backend.analyzer.multimodal_model = models["multimodal"]
+    install_fake_adk_model(
+        [factcheck_agent, normalization_agent, economics_parallel_agent, report_making_agent], models["adk"]
+    )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {row["scenario"]: row for row in json.load(f)["scenarios"]}
+    print(f"\n📊 Compared with {baseline_path}")
+    for row in results:
+        before = baseline.get(row["scenario"])
+        if before is None:
+            print(f"  {row['scenario']:<10} (not in baseline)")
+            continue
+
+        def change(after: float, previous: float) -> str:
+            return f"{(after - previous) / previous:+.1%}" if previous else "n/a"
+
+        print(f"  {row['scenario']:<10} req/s {before['requests_per_second']:>8} → {row['requests_per_second']:<8}"
+              f" ({change(row['requests_per_second'], before['requests_per_second'])})"
+              f"  p50 {change(row['latency_seconds']['p50'], before['latency_seconds']['p50'])}"
+              f"  peak RSS {change(row['rss_mb']['peak'], before['rss_mb']['peak'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--iterations", type=int, default=8, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight")
+    parser.add_argument("--pages", type=int, default=12, help="pages in the synthetic PDF deck")
+    parser.add_argument("--documents", type=int, default=10, help="uploads in flight during the health scenario")
+    parser.add_argument("--health-probes", type=int, default=100, help="idle /health probes before the uploads")
+    parser.add_argument("--health-interval", type=float, default=0.02, help="pause between /health probes")
+    parser.add_argument("--max-health-p99-ratio", type=float,
+                        help="exit non-zero when loaded /health p99 exceeds this multiple of idle p99")
+    parser.add_argument("--page-batch-tokens", type=int, default=0, help="multi-page batching budget (0 = off)")
+    parser.add_argument("--latency", default="lognormal:0.2:0.4",
+                        help="model latency: fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of model calls that fail")
+    parser.add_argument("--response-words", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.scenarios:
+        models = build_models(args)
+        if name != "pdf":
+            install_api_models(models)
+        print(f"\n▶️ {name}: {args.iterations} requests, concurrency {args.concurrency}")
+        row = RUNNERS[name](args, models)
+        results.append(row)
+        print(f"  {row['wall_seconds']}s wall, {row['requests_per_second']} req/s, "
+              f"p50 {row['latency_seconds']['p50']}s, p95 {row['latency_seconds']['p95']}s, "
+              f"{row['errors']} errors, peak RSS {row['rss_mb']['peak']} MB")
+        print(f"  stages: {row['stages']}")
+        if name == "health":
+            print(f"  /health p99 idle {row['health_idle_seconds']['p99']}s, "
+                  f"with {row['documents']} documents in flight {row['health_loaded_seconds']['p99']}s "
+                  f"({row['health_p99_ratio']}x), {row['document_errors']} document errors")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+            "latency_profile": LatencyProfile.parse(args.latency, args.error_rate).describe()
+        },
+        "scenarios": results
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+    if args.max_health_p99_ratio is not None:
+        for row in results:
+            if row["scenario"] == "health" and (row["health_p99_ratio"] or 0) > args.max_health_p99_ratio:
+                print(f"\n❌ /health p99 is {row['health_p99_ratio']}x idle with documents in flight "
+                      f"(limit {args.max_health_p99_ratio}x)")
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+page_batch_benchmark.py — Per-page analysis latency and tokens by multi-page batch size
+• Replaces the multimodal model with a fake whose latency grows with input and
+  output tokens, answering batched requests with "=== PAGE n ===" sections
+• Reports total page-analysis wall time, request count and total input/output
+  tokens for each batch size (1 = one request per page)
+• Pages are extracted once per deck; no network calls are made
+
+Usage:
+    python benchmarks/page_batch_benchmark.py path/to/decks/ other_deck.pdf
+    python benchmarks/page_batch_benchmark.py --batch-sizes 1 2 4 8 --json batch_results.json
+With no paths, the synthetic deck from render_policy_benchmark.py is used.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_ingestor import IMAGE_TOKENS_ESTIMATE, StartupAnalyzer
+from render_policy_benchmark import build_synthetic_deck
+from token_counter import count_tokens
+
+PAGE_HEADING_RE = re.compile(r"\*\*PAGE (\d+) TEXT CONTENT:\*\*")
+
+
+class LatencyMultimodalModel:
+    """Multimodal model stand-in with token-proportional latency and token accounting."""
+
+    model = "fake-multimodal-model"
+
+    def __init__(self, base_seconds: float, input_seconds_per_1k: float, output_seconds_per_1k: float,
+                 output_tokens_per_page: int):
+        self.base_seconds = base_seconds
+        self.input_seconds_per_1k = input_seconds_per_1k
+        self.output_seconds_per_1k = output_seconds_per_1k
+        self.output_tokens_per_page = output_tokens_per_page
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def invoke(self, messages):
+        input_tokens, page_numbers = 0, []
+        for message in messages:
+            parts = message.content if isinstance(message.content, list) else [{"type": "text", "text": message.content}]
+            for part in parts:
+                if part["type"] == "text":
+                    input_tokens += count_tokens(part["text"])
+                    page_numbers += [int(number) for number in PAGE_HEADING_RE.findall(part["text"])]
+                else:
+                    input_tokens += IMAGE_TOKENS_ESTIMATE
+
+        body = "Revenue $40K MRR, 120 customers, 8% churn. " * (self.output_tokens_per_page // 15)
+        if len(page_numbers) > 1:
+            reply = "\n".join(f"=== PAGE {number} ===\n{body}" for number in page_numbers)
+        else:
+            reply = body
+        output_tokens = count_tokens(reply)
+
+        time.sleep(self.base_seconds
+                   + input_tokens / 1000 * self.input_seconds_per_1k
+                   + output_tokens / 1000 * self.output_seconds_per_1k)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+        return SimpleNamespace(content=reply)
+
+
+def load_decks(paths: List[str]) -> Dict[str, bytes]:
+    decks = {}
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.pdf")) if path.is_dir() else [path]
+        for file in files:
+            decks[file.name] = file.read_bytes()
+    return decks or {"synthetic-24-slides.pdf": build_synthetic_deck()}
+
+
+def run(decks: Dict[str, bytes], batch_sizes: List[int], concurrency: int,
+        model: LatencyMultimodalModel) -> List[Dict]:
+    results = []
+    for deck_name, pdf_bytes in decks.items():
+        pages = list(StartupAnalyzer(use_cache=False).iter_pdf_pages(pdf_bytes))
+        print(f"\n📄 {deck_name}: {len(pages)} pages")
+        for batch_size in batch_sizes:
+            analyzer = StartupAnalyzer(
+                max_concurrent_pages=concurrency, use_cache=False,
+                page_batch_tokens=10 ** 9 if batch_size > 1 else 0, max_pages_per_batch=batch_size
+            )
+            analyzer.multimodal_model = model
+            model.reset()
+            started = time.perf_counter()
+            analyses = analyzer.analyze_pages(pages)
+            row = {
+                "deck": deck_name,
+                "pages": len(pages),
+                "batch_size": batch_size,
+                "seconds": round(time.perf_counter() - started, 3),
+                "requests": model.calls,
+                "input_tokens": model.input_tokens,
+                "output_tokens": model.output_tokens,
+                "failed_pages": sum(1 for page in analyses if page["status"] != "success")
+            }
+            results.append(row)
+            print(f"  batch {batch_size}: {row['seconds']:>7.3f}s  {row['requests']:>3} requests  "
+                  f"{row['input_tokens']:>7} in / {row['output_tokens']:>7} out tokens")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="PDF files or directories of PDFs")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight (max_concurrent_pages)")
+    parser.add_argument("--base-seconds", type=float, default=0.4, help="fixed per-request overhead")
+    parser.add_argument("--input-seconds-per-1k", type=float, default=0.05)
+    parser.add_argument("--output-seconds-per-1k", type=float, default=0.2)
+    parser.add_argument("--output-tokens-per-page", type=int, default=600)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    model = LatencyMultimodalModel(args.base_seconds, args.input_seconds_per_1k,
+                                   args.output_seconds_per_1k, args.output_tokens_per_page)
+    results = run(load_decks(args.paths), args.batch_sizes, args.concurrency, model)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
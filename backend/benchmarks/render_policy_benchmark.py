@@ -0,0 +1,179 @@
+"""
+render_policy_benchmark.py — Compare page render policies on a corpus of decks
+• Reports image bytes per page and render+encode time per page for each policy
+• Optionally sweeps render worker processes to produce a speedup curve
+• No model calls are made; only PyMuPDF extraction/rasterisation is timed
+
+Usage:
+    python benchmarks/render_policy_benchmark.py path/to/decks/ other_deck.pdf
+    python benchmarks/render_policy_benchmark.py --json render_results.json
+    python benchmarks/render_policy_benchmark.py --workers 0 1 2 4 8 16   # 0 = in-process baseline
+With no paths, a synthetic corpus (text, chart and photo slides) is generated.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+from document_ingestor import RENDER_POLICIES, StartupAnalyzer, render_pdf_page
+
+
+def build_synthetic_deck(pages: int = 24, seed: int = 7) -> bytes:
+    """A deck mixing text-only, chart-like and photo slides."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for index in range(pages):
+        page = doc.new_page(width=960, height=540)
+        kind = index % 3
+        page.insert_text((48, 60), f"Slide {index + 1}: Quarterly update", fontsize=28)
+        if kind == 0:
+            body = " ".join(
+                f"Revenue grew to ${rng.randint(20, 90)}K MRR with {rng.randint(100, 900)} customers."
+                for _ in range(8)
+            )
+            page.insert_textbox(fitz.Rect(48, 90, 912, 500), body, fontsize=14)
+        elif kind == 1:
+            # Bar chart drawn with vector paths
+            for bar in range(48):
+                height = rng.randint(20, 380)
+                x = 60 + bar * 17
+                page.draw_rect(fitz.Rect(x, 500 - height, x + 12, 500), color=(0, 0, 0), fill=(0.2, 0.4, 0.8))
+        else:
+            # Noisy gradient "photo" embedded as a raster image
+            width, height = 480, 270
+            samples = bytearray()
+            for y in range(height):
+                for x in range(width):
+                    noise = rng.randint(-25, 25)
+                    samples += bytes((
+                        max(0, min(255, x * 255 // width + noise)),
+                        max(0, min(255, y * 255 // height + noise)),
+                        max(0, min(255, 128 + noise)),
+                    ))
+            pix = fitz.Pixmap(fitz.csRGB, width, height, bytes(samples), 0)
+            page.insert_image(fitz.Rect(240, 100, 720, 370), pixmap=pix)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def load_corpus(paths: List[str]) -> List[Tuple[str, bytes]]:
+    """Collect (name, bytes) for every PDF in the given files/directories."""
+    corpus = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(".pdf"):
+                    with open(os.path.join(path, name), "rb") as f:
+                        corpus.append((name, f.read()))
+        else:
+            with open(path, "rb") as f:
+                corpus.append((os.path.basename(path), f.read()))
+    return corpus
+
+
+def benchmark_policy(policy_name: str, corpus: List[Tuple[str, bytes]]) -> Dict[str, float]:
+    """Render every page of the corpus under one policy."""
+    policy = RENDER_POLICIES[policy_name]
+    pages = 0
+    images_sent = 0
+    total_image_bytes = 0
+    total_payload_bytes = 0
+    total_seconds = 0.0
+
+    for _, pdf_bytes in corpus:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        for page_num in range(doc.page_count):
+            started = time.perf_counter()
+            page_data = render_pdf_page(doc, page_num, policy)
+            total_seconds += time.perf_counter() - started
+            pages += 1
+            images_sent += bool(page_data["image_base64"])
+            total_image_bytes += page_data["image_bytes"]
+            total_payload_bytes += len(page_data["image_base64"]) + len(page_data["text_content"])
+        doc.close()
+
+    return {
+        "policy": policy_name,
+        "pages": pages,
+        "images_sent": images_sent,
+        "image_bytes_per_page": total_image_bytes / pages if pages else 0.0,
+        "payload_bytes_per_page": total_payload_bytes / pages if pages else 0.0,
+        "ms_per_page": 1000 * total_seconds / pages if pages else 0.0,
+    }
+
+
+def benchmark_render_workers(worker_counts: List[int], corpus: List[Tuple[str, bytes]],
+                             policy_name: str = "adaptive") -> List[Dict[str, float]]:
+    """Time full-document rasterisation at each render worker count."""
+    analyzer = StartupAnalyzer(render_policy=RENDER_POLICIES[policy_name], use_cache=False)
+    # Always use the pool (when workers > 0) so the curve reflects it on any deck size
+    analyzer.render_pool_min_pages = 0
+
+    rows = []
+    for workers in worker_counts:
+        analyzer.render_workers = workers
+        # The render pool is long-lived in the server: start its workers outside the timing
+        for _, pdf_bytes in corpus[:1]:
+            for _ in analyzer.iter_pdf_pages(pdf_bytes):
+                pass
+        started = time.perf_counter()
+        pages = sum(1 for _, pdf_bytes in corpus for _ in analyzer.iter_pdf_pages(pdf_bytes))
+        rows.append({"workers": workers, "pages": pages, "seconds": time.perf_counter() - started})
+
+    baseline = rows[0]["seconds"] if rows else 0.0
+    for row in rows:
+        row["speedup"] = baseline / row["seconds"] if row["seconds"] else 0.0
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark page render policies")
+    parser.add_argument("paths", nargs="*", help="PDF files or directories of PDFs")
+    parser.add_argument("--policies", nargs="*", default=list(RENDER_POLICIES), help="Policies to compare")
+    parser.add_argument("--workers", nargs="*", type=int, default=[],
+                        help="Render worker counts to sweep (first count is the speedup baseline)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths) if args.paths else [("synthetic.pdf", build_synthetic_deck())]
+    print(f"📚 Corpus: {len(corpus)} deck(s)")
+
+    results = [benchmark_policy(name, corpus) for name in args.policies]
+
+    print(f"\n{'policy':<10} {'pages':>6} {'images':>7} {'img KB/page':>12} {'payload KB/page':>16} {'ms/page':>8}")
+    for row in results:
+        print(
+            f"{row['policy']:<10} {row['pages']:>6} {row['images_sent']:>7} "
+            f"{row['image_bytes_per_page'] / 1024:>12.1f} {row['payload_bytes_per_page'] / 1024:>16.1f} "
+            f"{row['ms_per_page']:>8.1f}"
+        )
+
+    worker_results = []
+    if args.workers:
+        worker_results = benchmark_render_workers(args.workers, corpus)
+        print(f"\n🧵 CPU cores: {os.cpu_count()}")
+        print(f"{'workers':>8} {'pages':>6} {'seconds':>8} {'speedup':>8}")
+        for row in worker_results:
+            print(f"{row['workers']:>8} {row['pages']:>6} {row['seconds']:>8.2f} {row['speedup']:>7.2f}x")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "corpus": [name for name, _ in corpus],
+                "cpu_count": os.cpu_count(),
+                "results": results,
+                "render_workers": worker_results
+            }, f, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+summary_benchmark.py — Single-shot vs map-reduce document summary latency
+• Replaces the text model with a fake whose latency grows with prompt tokens
+  (a fixed overhead plus time per input token and per output token)
+• Reports summary wall time per page count for both modes
+• No network calls are made
+
+Usage:
+    python benchmarks/summary_benchmark.py
+    python benchmarks/summary_benchmark.py --pages 10 40 160 --json summary_results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import document_ingestor
+from document_ingestor import StartupAnalyzer
+from token_counter import count_tokens
+
+
+class LatencyModel:
+    """Chat model stand-in: sleeps in proportion to the prompt and answer size."""
+
+    model = "fake-summary-model"
+
+    def __init__(self, base_seconds: float, input_seconds_per_1k: float,
+                 output_seconds_per_1k: float, output_ratio: float = 0.25, max_output_tokens: int = 8192):
+        self.base_seconds = base_seconds
+        self.input_seconds_per_1k = input_seconds_per_1k
+        self.output_seconds_per_1k = output_seconds_per_1k
+        self.output_ratio = output_ratio
+        self.max_output_tokens = max_output_tokens
+        self.calls = 0
+
+    def invoke(self, messages):
+        prompt_tokens = sum(count_tokens(message.content) for message in messages)
+        output_tokens = min(self.max_output_tokens, int(prompt_tokens * self.output_ratio))
+        self.calls += 1
+        time.sleep(self.base_seconds
+                   + prompt_tokens / 1000 * self.input_seconds_per_1k
+                   + output_tokens / 1000 * self.output_seconds_per_1k)
+        return SimpleNamespace(content="Revenue $40K MRR (p. 3). " * (output_tokens // 10))
+
+
+def synthetic_page_analyses(pages: int, tokens_per_page: int) -> List[Dict]:
+    sentence = "Slide shows ARR of $1.2M growing 15% month over month with 40 customers. "
+    repeats = max(1, tokens_per_page // count_tokens(sentence))
+    return [
+        {"page_number": page, "status": "success", "analysis": sentence * repeats}
+        for page in range(1, pages + 1)
+    ]
+
+
+def run(page_counts: List[int], tokens_per_page: int, model: LatencyModel) -> List[Dict]:
+    analyzer = StartupAnalyzer(use_cache=False)
+    analyzer.text_model = model
+    single_shot_budget = document_ingestor.SUMMARY_SINGLE_SHOT_TOKENS
+    results = []
+    for pages in page_counts:
+        page_analyses = synthetic_page_analyses(pages, tokens_per_page)
+        row = {"pages": pages, "input_tokens": sum(count_tokens(p["analysis"]) for p in page_analyses)}
+        for mode, budget in (("single_shot", float("inf")), ("map_reduce", single_shot_budget)):
+            document_ingestor.SUMMARY_SINGLE_SHOT_TOKENS = budget
+            model.calls = 0
+            started = time.perf_counter()
+            analyzer.generate_document_summary_from_pages(page_analyses, "pitch_deck")
+            row[f"{mode}_seconds"] = round(time.perf_counter() - started, 3)
+            row[f"{mode}_calls"] = model.calls
+        document_ingestor.SUMMARY_SINGLE_SHOT_TOKENS = single_shot_budget
+        results.append(row)
+        print(f"{pages:>5} pages {row['input_tokens']:>8} tokens | single-shot {row['single_shot_seconds']:>7.3f}s"
+              f" | map-reduce {row['map_reduce_seconds']:>7.3f}s ({row['map_reduce_calls']} calls)")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 20, 40, 80, 160])
+    parser.add_argument("--tokens-per-page", type=int, default=600)
+    parser.add_argument("--base-seconds", type=float, default=0.05)
+    parser.add_argument("--input-seconds-per-1k", type=float, default=0.02)
+    parser.add_argument("--output-seconds-per-1k", type=float, default=0.5)
+    parser.add_argument("--max-output-tokens", type=int, default=8192)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    model = LatencyModel(args.base_seconds, args.input_seconds_per_1k, args.output_seconds_per_1k,
+                         max_output_tokens=args.max_output_tokens)
+    results = run(args.pages, args.tokens_per_page, model)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
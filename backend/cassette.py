@@ -0,0 +1,158 @@
+"""
+cassette.py — Record/replay of model and search calls for offline, reproducible runs
+• record: every LangChain model call, ADK agent model call and web search is
+  performed live and its response stored under a hash of the request
+• replay: responses are served from the cassette without network access
+  (optionally with the recorded latency); an unrecorded request is an error
+• Entries live in a single SQLite file that is never evicted
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from result_cache import ResultCache, make_cache_key
+
+CASSETTE_MODE = os.getenv("MODEL_CASSETTE_MODE", "off")  # off, record or replay
+DEFAULT_CASSETTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "cassette.sqlite3")
+CASSETTE_PATH = os.getenv("MODEL_CASSETTE_PATH", DEFAULT_CASSETTE_PATH)
+CASSETTE_REPLAY_TIMING = os.getenv("MODEL_CASSETTE_REPLAY_TIMING", "false").lower() in {"1", "true", "yes"}
+
+CASSETTE_MODES = {"off", "record", "replay"}
+
+
+class CassetteMissError(RuntimeError):
+    """Replay mode met a request that was never recorded."""
+
+
+def _strip_call_ids(value: Any) -> Any:
+    """Drop generated function call ids, which differ between otherwise identical runs."""
+    if isinstance(value, dict):
+        return {key: _strip_call_ids(item) for key, item in value.items() if key != "id"}
+    if isinstance(value, list):
+        return [_strip_call_ids(item) for item in value]
+    return value
+
+
+def langchain_request(model_name: str, messages: Iterable[Any]) -> List[Any]:
+    """Hashable description of a LangChain chat call."""
+    return [model_name, [[message.type, message.content] for message in messages]]
+
+
+def adk_request(agent_name: str, llm_request) -> List[Any]:
+    """Hashable description of an ADK model call: model, instruction, tools and conversation."""
+    config = llm_request.config
+    return [
+        agent_name,
+        llm_request.model,
+        _strip_call_ids([content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents]),
+        str(config.system_instruction) if config and config.system_instruction else None,
+        sorted(llm_request.tools_dict)
+    ]
+
+
+class Cassette:
+    """Request-hash → response store shared by every recorded call site."""
+
+    def __init__(self, mode: str = CASSETTE_MODE, path: str = CASSETTE_PATH,
+                 replay_timing: bool = CASSETTE_REPLAY_TIMING):
+        if mode not in CASSETTE_MODES - {"off"}:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected 'record' or 'replay')")
+        self.mode = mode
+        self.path = path
+        self.replay_timing = replay_timing
+        # Cassettes are reference data: never evicted
+        self.store = ResultCache(path=path, max_bytes=sys.maxsize)
+        self.counters = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._lock = threading.Lock()
+        # (invocation_id, agent_name) → (key, started) for ADK calls in flight
+        self._pending: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+    @staticmethod
+    def key(kind: str, request: Any) -> str:
+        return make_cache_key("cassette", kind, json.dumps(request, sort_keys=True, default=str))
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def lookup(self, kind: str, key: str) -> Dict[str, Any]:
+        """Recorded {"response", "seconds"} for key; raises CassetteMissError when absent."""
+        entry = self.store.get(key)
+        if entry is None:
+            self._count("misses")
+            raise CassetteMissError(f"No recorded {kind} response for request {key[:12]} in {self.path}")
+        self._count("replayed")
+        return entry
+
+    def record(self, key: str, response: Any, seconds: float) -> None:
+        self.store.set(key, {"response": response, "seconds": round(seconds, 4)})
+        self._count("recorded")
+
+    def call(self, kind: str, request: Any, invoke: Callable[[], Any]) -> Any:
+        """Replay or record a synchronous call whose result is JSON-serializable."""
+        key = self.key(kind, request)
+        if self.mode == "replay":
+            entry = self.lookup(kind, key)
+            if self.replay_timing:
+                time.sleep(entry["seconds"])
+            return entry["response"]
+        started = time.perf_counter()
+        response = invoke()
+        self.record(key, response, time.perf_counter() - started)
+        return response
+
+    async def acall(self, kind: str, request: Any, invoke: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of call."""
+        key = self.key(kind, request)
+        if self.mode == "replay":
+            entry = self.lookup(kind, key)
+            if self.replay_timing:
+                await asyncio.sleep(entry["seconds"])
+            return entry["response"]
+        started = time.perf_counter()
+        response = await invoke()
+        self.record(key, response, time.perf_counter() - started)
+        return response
+
+    async def before_model_callback(self, callback_context, llm_request):
+        """ADK hook: serve the recorded response in replay mode, remember the request in record mode."""
+        from google.adk.models.llm_response import LlmResponse
+
+        key = self.key("adk", adk_request(callback_context.agent_name, llm_request))
+        if self.mode == "replay":
+            entry = self.lookup("adk", key)
+            if self.replay_timing:
+                await asyncio.sleep(entry["seconds"])
+            return LlmResponse.model_validate(entry["response"])
+        with self._lock:
+            self._pending[(callback_context.invocation_id, callback_context.agent_name)] = (key, time.perf_counter())
+        return None
+
+    async def after_model_callback(self, callback_context, llm_response):
+        """ADK hook: store the live response in record mode (non-streaming calls yield one response)."""
+        with self._lock:
+            pending = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if pending is not None:
+            key, started = pending
+            self.record(key, llm_response.model_dump(mode="json", exclude_none=True), time.perf_counter() - started)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "path": self.path, "replay_timing": self.replay_timing,
+                **self.counters, "entries": self.store.stats()["entries"]}
+
+
+@lru_cache(maxsize=None)
+def default_cassette() -> Optional[Cassette]:
+    """Shared process-wide cassette from environment settings (None when MODEL_CASSETTE_MODE=off)."""
+    if CASSETTE_MODE == "off":
+        return None
+    cassette = Cassette()
+    print(f"📼 Model cassette in {cassette.mode} mode: {cassette.path}")
+    return cassette
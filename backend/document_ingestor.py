@@ -1,23 +1,463 @@
 import os
+import re
 import json
 import fitz  # PyMuPDF
 import traceback
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from pptx import Presentation
-from prompts import pdf_analysis_prompt,email_analysis_prompt,call_analysis_prompt,Multimodal_analysis_prompt
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.shapes.picture import Picture
+from prompt_registry import get_prompt
 # import aspose.slides as slides
 import tempfile 
 import base64
+import hashlib
+from dataclasses import dataclass
 from io import BytesIO
+import multiprocessing
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from result_cache import ResultCache, default_result_cache, make_cache_key
+from cassette import Cassette, default_cassette, langchain_request
+from token_counter import count_tokens
+from telemetry import TRACING_ENABLED, propagate, record_span, set_status, span
+from service_metrics import MODEL_CALL_ERRORS, MODEL_CALL_SECONDS, PAGE_ANALYSIS_SECONDS, PAGES_ANALYZED
 
 # Setup API key
 os.environ["GOOGLE_API_KEY"] = "your-google-api-key"
 
+# Progress hook: called as callback(event, data) with events "document_started"
+# ({"total_pages"}), "page_completed" (the page analysis), "summary_started" ({})
+# and "summary_completed" ({"overall_summary"}). May be called from worker threads.
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# Maximum number of page analyses sent to the multimodal model at the same time
+MAX_CONCURRENT_PAGES = int(os.getenv("MAX_CONCURRENT_PAGES", "4"))
+
+# Page analyses up to this many tokens are summarised in one call; larger documents
+# are summarised map-reduce style in chunks of at most SUMMARY_CHUNK_TOKENS
+SUMMARY_SINGLE_SHOT_TOKENS = int(os.getenv("SUMMARY_SINGLE_SHOT_TOKENS", "24000"))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "8000"))
+# Chunk summaries sent to the text model at the same time
+SUMMARY_MAX_CONCURRENT_CHUNKS = int(os.getenv("SUMMARY_MAX_CONCURRENT_CHUNKS", "8"))
+# Guards against digests that never shrink below the single-shot budget
+MAX_SUMMARY_REDUCE_LEVELS = 3
+
+PDF_PROMPT = get_prompt("pdf_analysis")
+EMAIL_PROMPT = get_prompt("email_analysis")
+CALL_PROMPT = get_prompt("call_analysis")
+PAGE_PROMPT = get_prompt("page_analysis")
+PAGE_BATCH_PROMPT = get_prompt("page_batch_analysis")
+SUMMARY_PROMPT = get_prompt("document_summary")
+CHUNK_SUMMARY_PROMPT = get_prompt("document_chunk_summary")
+
+# Part of every whole-document cache key: editing a prompt invalidates old results
+DOCUMENT_PROMPTS_VERSION = make_cache_key(
+    PAGE_PROMPT.version, SUMMARY_PROMPT.version, CHUNK_SUMMARY_PROMPT.version,
+    str(SUMMARY_SINGLE_SHOT_TOKENS), str(SUMMARY_CHUNK_TOKENS)
+)
+PAGE_PROMPT_VERSION = PAGE_PROMPT.version
+
+# Multi-page batching: pack consecutive pages into one multimodal request while their
+# estimated input stays within PAGE_BATCH_TOKENS (0 = one page per request)
+PAGE_BATCH_TOKENS = int(os.getenv("PAGE_BATCH_TOKENS", "0"))
+PAGE_BATCH_MAX_PAGES = int(os.getenv("PAGE_BATCH_MAX_PAGES", "8"))
+# The reply holds every page's analysis, so the model's output limit also caps the batch
+PAGE_BATCH_OUTPUT_TOKENS = int(os.getenv("PAGE_BATCH_OUTPUT_TOKENS", "8192"))
+EXPECTED_PAGE_ANALYSIS_TOKENS = 1000
+# Gemini bills an image as 258 tokens per 768x768 tile; rendered pages are usually 1-2 tiles
+IMAGE_TOKENS_ESTIMATE = 516
+
+# "=== PAGE 3 ===" markers separating per-page sections of a batched reply
+PAGE_SECTION_RE = re.compile(r"^[#*\s]*=+\s*PAGE\s+(\d+)\s*=+[*\s]*$", re.MULTILINE | re.IGNORECASE)
+
+
+def estimate_page_tokens(page_data: Dict[str, Any]) -> int:
+    """Approximate input tokens a page adds to a multimodal request."""
+    return count_tokens(page_data.get("text_content") or "") + IMAGE_TOKENS_ESTIMATE * len(page_data_images(page_data))
+
+
+def prompt_size(messages: List[BaseMessage]) -> Dict[str, int]:
+    """Estimated input tokens and attached image count of a chat request (span attributes)."""
+    tokens, images = 0, 0
+    for message in messages:
+        for part in message.content if isinstance(message.content, list) else [message.content]:
+            if isinstance(part, str):
+                tokens += count_tokens(part)
+            elif part.get("type") == "text":
+                tokens += count_tokens(part["text"])
+            else:
+                images += 1
+    return {"prompt_tokens": tokens + IMAGE_TOKENS_ESTIMATE * images, "images": images}
+
+
+def split_page_sections(text: str) -> Dict[int, str]:
+    """Split a batched reply on its page markers into {page_number: analysis}."""
+    markers = list(PAGE_SECTION_RE.finditer(text))
+    sections: Dict[int, str] = {}
+    for index, marker in enumerate(markers):
+        end = markers[index + 1].start() if index + 1 < len(markers) else len(text)
+        section = text[marker.end():end].strip()
+        page_number = int(marker.group(1))
+        if section and page_number not in sections:
+            sections[page_number] = section
+    return sections
+
+
+def perceptual_hash(pix: "fitz.Pixmap") -> int:
+    """64-bit difference hash (dHash) of a rendered page."""
+    gray = fitz.Pixmap(fitz.csGRAY, pix) if pix.n - pix.alpha != 1 else pix
+    thumb = fitz.Pixmap(gray, 9, 8)
+    samples = thumb.samples
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = samples[row * 9 + col]
+            right = samples[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def page_fingerprint(page_text: str, pix: "fitz.Pixmap") -> str:
+    """Exact page identity: digests of the extracted text and the rendered pixels.
+
+    Re-exports of an unchanged slide render the same pixels and keep the same
+    fingerprint even when the PDF bytes differ, so its previous analysis can
+    be reused; any visible change (a new chart value, a swapped logo) gives a
+    new one. The dHash is only a similarity hint and never decides reuse.
+    """
+    text_digest = hashlib.sha256(page_text.strip().encode("utf-8")).hexdigest()[:16]
+    pixel_digest = hashlib.sha256(pix.samples).hexdigest()[:16]
+    return f"{text_digest}-{pixel_digest}"
+
+
+@dataclass(frozen=True)
+class PageRenderPolicy:
+    """How a PDF page is rasterised before it is sent to the multimodal model."""
+    name: str = "adaptive"
+    # Zoom is picked so the long edge lands near the target, then clamped
+    min_zoom: float = 1.0
+    max_zoom: float = 2.0
+    dense_long_edge: int = 1600    # pages with raster images or charts
+    sparse_long_edge: int = 1024   # mostly text, a few shapes
+    dense_drawings: int = 40       # vector paths beyond this look like a chart/diagram
+    # "png", "jpeg" or "auto" (JPEG only for pages containing raster images)
+    image_format: str = "auto"
+    jpeg_quality: int = 80
+    # Text-only pages are fully captured by get_text, so the image can be skipped
+    skip_text_only_pages: bool = True
+    text_only_min_chars: int = 200
+    text_only_max_drawings: int = 5
+
+    def plan(self, page: "fitz.Page", page_text: str) -> Dict[str, Any]:
+        """Decide zoom, format and whether to send an image for one page."""
+        image_count = len(page.get_images(full=False))
+        # Vector paths are only counted when a decision actually depends on them
+        needs_layout = self.skip_text_only_pages or self.min_zoom != self.max_zoom
+        drawing_count = len(page.get_cdrawings()) if needs_layout else 0
+
+        if (self.skip_text_only_pages and image_count == 0
+                and drawing_count <= self.text_only_max_drawings
+                and len(page_text.strip()) >= self.text_only_min_chars):
+            return {"send_image": False, "zoom": 0.0, "format": None}
+
+        dense = image_count > 0 or drawing_count >= self.dense_drawings
+        long_edge_points = max(page.rect.width, page.rect.height) or 1.0
+        target = self.dense_long_edge if dense else self.sparse_long_edge
+        zoom = min(self.max_zoom, max(self.min_zoom, target / long_edge_points))
+
+        image_format = self.image_format
+        if image_format == "auto":
+            # Photos compress far better as JPEG; flat slide art stays smaller and sharper as PNG
+            image_format = "jpeg" if image_count > 0 else "png"
+        return {"send_image": True, "zoom": zoom, "format": image_format}
+
+
+RENDER_POLICIES: Dict[str, PageRenderPolicy] = {
+    # Original behaviour: every page at 2x as PNG
+    "legacy": PageRenderPolicy(name="legacy", min_zoom=2.0, max_zoom=2.0, image_format="png",
+                               skip_text_only_pages=False),
+    "adaptive": PageRenderPolicy(),
+    # Smaller payloads for fast triage passes
+    "compact": PageRenderPolicy(name="compact", max_zoom=1.5, dense_long_edge=1280, sparse_long_edge=896,
+                                jpeg_quality=70),
+}
+
+PAGE_RENDER_POLICY = os.getenv("PAGE_RENDER_POLICY", "adaptive")
+
+# Thumbnail zoom used only to fingerprint pages whose image is skipped
+FINGERPRINT_ZOOM = 0.25
+
+# Multi-process rasterisation: documents with at least RENDER_POOL_MIN_PAGES pages are
+# split into ranges of at most RENDER_CHUNK_PAGES across RENDER_WORKERS processes of one
+# long-lived pool shared by every analysis (0 = in-process). MuPDF holds the GIL while
+# rasterising, so even one worker process keeps the event loop and /health responsive
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_POOL_MIN_PAGES = int(os.getenv("RENDER_POOL_MIN_PAGES", "1"))
+RENDER_CHUNK_PAGES = int(os.getenv("RENDER_CHUNK_PAGES", "4"))
+
+
+def render_pdf_page(doc: "fitz.Document", page_num: int, policy: PageRenderPolicy) -> Dict[str, Any]:
+    """Extract text and render one page according to the render policy.
+
+    Stage timings go in "render_timings" as wall-clock (stage, start_ns, end_ns),
+    so the tracing side can rebuild them even when a worker process rendered the page.
+    """
+    started = time.time_ns()
+    page = doc.load_page(page_num)  # modern method
+    page_text = page.get_text("text")  # modern method
+    text_done = time.time_ns()
+    plan = policy.plan(page, page_text)
+    planned = time.time_ns()
+
+    img_base64 = ""
+    image_mime = None
+    image_bytes = 0
+    if plan["send_image"]:
+        pix = page.get_pixmap(matrix=fitz.Matrix(plan["zoom"], plan["zoom"]))
+        rendered = time.time_ns()
+        if plan["format"] == "jpeg":
+            img_data = pix.tobytes("jpeg", jpg_quality=policy.jpeg_quality)
+            image_mime = "image/jpeg"
+        else:
+            img_data = pix.tobytes("png")
+            image_mime = "image/png"
+        img_base64 = base64.b64encode(img_data).decode('utf-8')
+        image_bytes = len(img_data)
+        del img_data
+        encoded = time.time_ns()
+    else:
+        pix = page.get_pixmap(matrix=fitz.Matrix(FINGERPRINT_ZOOM, FINGERPRINT_ZOOM))
+        rendered = encoded = time.time_ns()
+
+    fingerprint = page_fingerprint(page_text, pix)
+    similarity_hash = f"{perceptual_hash(pix):016x}"
+    finished = time.time_ns()
+    # Release the raw pixmap before handing the page on
+    del pix, page
+
+    return {
+        "page_number": page_num + 1,
+        "text_content": page_text.strip(),
+        "image_base64": img_base64,
+        "image_mime": image_mime,
+        "image_bytes": image_bytes,
+        "render_zoom": plan["zoom"],
+        "render_policy": policy.name,
+        "fingerprint": fingerprint,
+        "similarity_hash": similarity_hash,
+        "has_content": True,
+        "render_timings": [
+            ("get_text", started, text_done),
+            ("plan", text_done, planned),
+            ("get_pixmap", planned, rendered),
+            ("encode", rendered, encoded),
+            ("fingerprint", encoded, finished)
+        ]
+    }
+
+
+def trace_page_render(page_data: Dict[str, Any]) -> None:
+    """Emit a page.render span (one child per stage) from a rendered page's timings."""
+    timings = page_data.pop("render_timings", None)
+    if timings:
+        record_span(
+            "page.render", timings[0][1], timings[-1][2], stages=timings,
+            page_number=page_data["page_number"], image_bytes=page_data["image_bytes"],
+            render_zoom=page_data["render_zoom"]
+        )
+
+def page_data_images(page_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(mime, base64) pairs to attach for a page: PPTX picture list or rendered PDF page."""
+    if page_data.get("images"):
+        return [(image["mime"], image["base64"]) for image in page_data["images"]]
+    if page_data.get("image_base64"):
+        return [(page_data.get("image_mime") or "image/png", page_data["image_base64"])]
+    return []
+
+
+# Embedded picture formats the multimodal model accepts; others (EMF/WMF/TIFF) are skipped
+PPTX_VISION_MIME_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+# Icons and bullets below this size carry no data worth a vision call
+PPTX_MIN_IMAGE_BYTES = int(os.getenv("PPTX_MIN_IMAGE_BYTES", "4096"))
+PPTX_MAX_IMAGES_PER_SLIDE = int(os.getenv("PPTX_MAX_IMAGES_PER_SLIDE", "4"))
+
+
+def _iter_slide_shapes(shapes) -> Iterator[Any]:
+    """Walk slide shapes, descending into groups."""
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _iter_slide_shapes(shape.shapes)
+        else:
+            yield shape
+
+
+def _format_pptx_table(table) -> str:
+    rows = [" | ".join(cell.text.strip() for cell in row.cells) for row in table.rows]
+    return "\n".join(rows)
+
+
+def _format_pptx_chart(chart) -> str:
+    """Chart type, title, categories and series values read from the chart XML."""
+    lines = []
+    title = ""
+    if chart.has_title and chart.chart_title.has_text_frame:
+        title = chart.chart_title.text_frame.text.strip()
+    chart_type = getattr(chart.chart_type, "name", chart.chart_type)
+    lines.append(f"Chart ({chart_type}){': ' + title if title else ''}")
+    for plot in chart.plots:
+        categories = [str(category) for category in plot.categories]
+        if categories:
+            lines.append(f"Categories: {', '.join(categories)}")
+        for series in plot.series:
+            values = ", ".join("" if value is None else f"{value:g}" for value in series.values)
+            lines.append(f"Series '{series.name}': {values}")
+    return "\n".join(lines)
+
+
+def extract_pptx_slide(slide, slide_number: int) -> Dict[str, Any]:
+    """Structured text, tables, chart data, notes and pictures for one slide."""
+    sections = []
+    images = []
+    for shape in _iter_slide_shapes(slide.shapes):
+        if shape.has_text_frame and shape.text_frame.text.strip():
+            sections.append(shape.text_frame.text.strip())
+        if getattr(shape, "has_table", False) and shape.has_table:
+            sections.append("TABLE:\n" + _format_pptx_table(shape.table))
+        if getattr(shape, "has_chart", False) and shape.has_chart:
+            sections.append("CHART DATA:\n" + _format_pptx_chart(shape.chart))
+        if isinstance(shape, Picture) and len(images) < PPTX_MAX_IMAGES_PER_SLIDE:
+            try:
+                image = shape.image
+            except (AttributeError, KeyError, ValueError):
+                continue  # linked or missing picture
+            if image.content_type in PPTX_VISION_MIME_TYPES and len(image.blob) >= PPTX_MIN_IMAGE_BYTES:
+                images.append({
+                    "mime": image.content_type,
+                    "base64": base64.b64encode(image.blob).decode('utf-8'),
+                    "sha1": image.sha1
+                })
+
+    if slide.has_notes_slide:
+        notes = slide.notes_slide.notes_text_frame.text.strip()
+        if notes:
+            sections.append("SPEAKER NOTES:\n" + notes)
+
+    slide_text = "\n\n".join(sections)
+    text_digest = hashlib.sha256(slide_text.encode("utf-8")).hexdigest()[:16]
+    images_digest = hashlib.sha256("".join(image["sha1"] for image in images).encode("utf-8")).hexdigest()[:16]
+
+    return {
+        "page_number": slide_number,
+        "text_content": slide_text,
+        "image_base64": "",
+        "images": images,
+        "image_bytes": sum(len(image["base64"]) * 3 // 4 for image in images),
+        "fingerprint": f"{text_digest}-{images_digest}",
+        "has_content": bool(slide_text or images)
+    }
+
+
+def iter_pptx_slides(pptx_bytes: bytes,
+                     on_page_count: Optional[Callable[[int], None]] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily extract PPTX slides straight from the package XML (no rendering)."""
+    print("🔄 Processing PPTX from memory with python-pptx")
+    presentation = Presentation(BytesIO(pptx_bytes))
+    if on_page_count:
+        on_page_count(len(presentation.slides))
+    for index, slide in enumerate(presentation.slides):
+        slide_data = extract_pptx_slide(slide, index + 1)
+        print(f"✅ Processed slide {index + 1} ({len(slide_data['images'])} image(s))")
+        yield slide_data
+
+
+# Documents a render worker keeps open, by spool file path (most recent last)
+_worker_docs: "OrderedDict[str, fitz.Document]" = OrderedDict()
+WORKER_OPEN_DOCUMENTS = 2
+
+
+def _worker_document(path: str) -> "fitz.Document":
+    doc = _worker_docs.get(path)
+    if doc is None:
+        # MuPDF keeps the file open, so the parent may delete it once rendering is done
+        doc = _worker_docs[path] = fitz.open(path)
+        while len(_worker_docs) > WORKER_OPEN_DOCUMENTS:
+            _worker_docs.popitem(last=False)[1].close()
+    _worker_docs.move_to_end(path)
+    return doc
+
+
+def _render_page_range(path: str, start: int, stop: int, policy: PageRenderPolicy) -> List[Dict[str, Any]]:
+    """Render pages [start, stop) of the spooled document inside a render worker process."""
+    doc = _worker_document(path)
+    return [render_pdf_page(doc, page_num, policy) for page_num in range(start, stop)]
+
+
+_render_pools: Dict[int, ProcessPoolExecutor] = {}
+_render_pools_lock = threading.Lock()
+
+
+def render_pool(workers: int) -> ProcessPoolExecutor:
+    """Long-lived render pool with the given worker count, created on first use.
+
+    Workers come from a forkserver (spawn where unavailable), never from forking
+    the server itself, whose analysis, SQLite and MuPDF threads could leave
+    locks held in the child.
+    """
+    with _render_pools_lock:
+        pool = _render_pools.get(workers)
+        if pool is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                # Imported once in the (single-threaded) fork server, so workers start warm
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            pool = _render_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return pool
+
+
+def warm_render_pool(workers: int = RENDER_WORKERS) -> None:
+    """Start the render workers now rather than on the first large document.
+
+    Worker start-up imports this module (and the main script) in each process,
+    which takes seconds; no-op when rendering in-process.
+    """
+    if workers > 0:
+        pool = render_pool(workers)
+        for future in [pool.submit(os.getpid) for _ in range(workers)]:
+            future.result()
+
+
 class StartupAnalyzer:
-    def __init__(self):
+    def __init__(self, max_concurrent_pages: int = MAX_CONCURRENT_PAGES,
+                 result_cache: Optional[ResultCache] = None, use_cache: bool = True,
+                 render_policy: Optional[PageRenderPolicy] = None,
+                 render_workers: int = RENDER_WORKERS, render_pool_min_pages: int = RENDER_POOL_MIN_PAGES,
+                 page_batch_tokens: int = PAGE_BATCH_TOKENS, max_pages_per_batch: int = PAGE_BATCH_MAX_PAGES,
+                 cassette: Optional[Cassette] = None):
+        # Upper bound on in-flight per-page model calls (1 = sequential)
+        self.max_concurrent_pages = max(1, max_concurrent_pages)
+        # Pages packed into one multimodal request, by estimated input tokens (0 = no batching)
+        self.page_batch_tokens = page_batch_tokens
+        self.max_pages_per_batch = max(1, min(max_pages_per_batch,
+                                              PAGE_BATCH_OUTPUT_TOKENS // EXPECTED_PAGE_ANALYSIS_TOKENS))
+        # Per-page zoom/format/skip decisions for rasterisation
+        self.render_policy = render_policy or RENDER_POLICIES[PAGE_RENDER_POLICY]
+        # Process-pool rasterisation (0 = always in-process)
+        self.render_workers = max(0, render_workers)
+        self.render_pool_min_pages = render_pool_min_pages
+        # Record/replay of model calls (MODEL_CASSETTE_MODE); None calls the models directly
+        self.cassette = cassette or default_cassette()
+        # Content-addressed result cache shared by every analyzer in the process. Off while a
+        # cassette is active: a cache hit would skip recording a call, or answer in place of the recording
+        self.result_cache = (result_cache or default_result_cache()) if use_cache and self.cassette is None else None
+
         # Initialize text-only model
         self.text_model = ChatGoogleGenerativeAI(
             model="gemini-1.5-flash",
@@ -28,34 +468,124 @@ class StartupAnalyzer:
         temperature=0.1
         )
     
-    def extract_pdf_pages_content_from_bytes(self,pdf_bytes: bytes) -> List[Dict[str, Any]]:
-        """Extract from PDF bytes (useful for S3/GCS files)."""
-        try:
-            print("🔄 Processing PDF from memory with PyMuPDF")
-
-            # Open PDF from bytes
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            pages_data = []
+    def _invoke_model(self, model, messages: List[BaseMessage], cache_key: Optional[str] = None) -> Tuple[str, bool]:
+        """Invoke a chat model, serving and storing the text response via the result cache.
+
+        Returns the response text and whether it came from the cache.
+        """
+        with span("model.invoke", model=self._model_name(model)) as model_span:
+            if self.result_cache is not None and cache_key:
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    model_span.set_attributes({"cache_hit": True, "status": "success"})
+                    return cached, True
+
+            if TRACING_ENABLED:
+                model_span.set_attributes({"cache_hit": False, **prompt_size(messages)})
+            if self.cassette is not None:
+                content = self.cassette.call(
+                    "langchain", langchain_request(self._model_name(model), messages),
+                    lambda: self._timed_invoke(model, messages)
+                )
+            else:
+                content = self._timed_invoke(model, messages)
+            model_span.set_attribute("status", "success")
 
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)  # modern method
-                page_text = page.get_text("text")  # modern method
+        if self.result_cache is not None and cache_key:
+            self.result_cache.set(cache_key, content)
+        return content, False
 
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                img_data = pix.tobytes("png")
-                img_base64 = base64.b64encode(img_data).decode('utf-8')
+    def _timed_invoke(self, model, messages: List[BaseMessage]) -> str:
+        """Live model call, recorded in the model latency/error metrics."""
+        model_name = self._model_name(model)
+        started = time.perf_counter()
+        try:
+            content = model.invoke(messages).content
+        except Exception:
+            MODEL_CALL_ERRORS.inc(model=model_name, caller="analyzer")
+            raise
+        MODEL_CALL_SECONDS.observe(time.perf_counter() - started, model=model_name, caller="analyzer")
+        return content
+
+    @staticmethod
+    def _model_name(model) -> str:
+        return getattr(model, "model", type(model).__name__)
+
+    def iter_pdf_pages(self, pdf_bytes: bytes,
+                       on_page_count: Optional[Callable[[int], None]] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily render PDF pages one at a time.
+
+        Only the page being yielded holds its pixmap/base64 image, so callers
+        that consume pages as they arrive keep memory bounded by how many
+        pages they hold, not by the page count.
+        """
+        print("🔄 Processing PDF from memory with PyMuPDF")
+
+        # Open PDF from bytes
+        with span("pdf.open", bytes=len(pdf_bytes)) as open_span:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            page_count = doc.page_count
+            open_span.set_attribute("page_count", page_count)
+        if on_page_count:
+            on_page_count(page_count)
 
-                pages_data.append({
-                    "page_number": page_num + 1,
-                    "text_content": page_text.strip(),
-                    "image_base64": img_base64,
-                    "has_content": True
-                })
+        if self.render_workers > 0 and page_count >= self.render_pool_min_pages:
+            doc.close()
+            yield from self._iter_pdf_pages_pooled(pdf_bytes, page_count)
+            return
 
+        try:
+            for page_num in range(page_count):
+                page_data = render_pdf_page(doc, page_num, self.render_policy)
+                trace_page_render(page_data)
                 print(f"✅ Processed page {page_num + 1} from memory")
-
+                yield page_data
+                page_data = None
+        finally:
             doc.close()
-            return pages_data
+
+    def _iter_pdf_pages_pooled(self, pdf_bytes: bytes, page_count: int) -> Iterator[Dict[str, Any]]:
+        """Render page ranges across the shared render pool, yielding pages in order.
+
+        Ranges shrink so max_concurrent_pages pages cover every worker, and
+        at least one range per worker stays in flight so none sits idle, so
+        memory is bounded by max(workers, max_concurrent_pages) pages rather
+        than by page count. Page analysis keeps its own max_concurrent_pages
+        bound in analyze_pages. Workers read the document from a
+        spool file written once per call.
+        """
+        workers = self.render_workers
+        chunk_pages = max(1, min(RENDER_CHUNK_PAGES, self.max_concurrent_pages // workers))
+        max_pending = max(workers, self.max_concurrent_pages // chunk_pages)
+        print(f"🧵 Rendering {page_count} pages across {workers} processes")
+        ranges = deque(
+            (start, min(start + chunk_pages, page_count))
+            for start in range(0, page_count, chunk_pages)
+        )
+        pool = render_pool(workers)
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as spool:
+            spool.write(pdf_bytes)
+            spool.flush()
+            pending = deque()
+            try:
+                while ranges or pending:
+                    while ranges and len(pending) < max_pending:
+                        start, stop = ranges.popleft()
+                        pending.append(pool.submit(_render_page_range, spool.name, start, stop, self.render_policy))
+                    for page_data in pending.popleft().result():
+                        trace_page_render(page_data)
+                        print(f"✅ Processed page {page_data['page_number']} in render pool")
+                        yield page_data
+                    page_data = None
+            finally:
+                # An abandoned iteration must not leave ranges queued on the shared pool
+                for future in pending:
+                    future.cancel()
+
+    def extract_pdf_pages_content_from_bytes(self,pdf_bytes: bytes) -> List[Dict[str, Any]]:
+        """Extract from PDF bytes (useful for S3/GCS files)."""
+        try:
+            return list(self.iter_pdf_pages(pdf_bytes))
 
         except Exception as e:
             print(f"❌ Error processing PDF from bytes: {e}")
@@ -72,105 +602,337 @@ class StartupAnalyzer:
     def create_per_page_multimodal_prompt(self, page_number: int, page_text: str) -> str:
 
         """Create prompt for analyzing individual PDF page with text + visual."""
-        return Multimodal_analysis_prompt.format(page_number=page_number, page_text=page_text)
+        return PAGE_PROMPT.render(page_number=page_number, page_text=page_text)
     
     def create_pdf_analysis_prompt(self, pdf_text: str) -> str:
         """Create detailed information extraction prompt for PDF documents."""
-        return pdf_analysis_prompt.format(pdf_text=pdf_text)
+        return PDF_PROMPT.render(pdf_text=pdf_text)
 
     def create_email_analysis_prompt(self, raw_email_text: str) -> str:
         """Create detailed information extraction prompt for raw email text."""
-        return email_analysis_prompt.format(raw_email_text=raw_email_text)
+        return EMAIL_PROMPT.render(raw_email_text=raw_email_text)
 
 
     def create_call_analysis_prompt(self, raw_transcript: str) -> str:
         """Create detailed information extraction prompt for raw call transcript."""
-        return call_analysis_prompt.format(raw_transcript=raw_transcript)
+        return CALL_PROMPT.render(raw_transcript=raw_transcript)
+
+    @staticmethod
+    def _page_image_content(page_images: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        return [
+            {"type": "image_url", "image_url": {"url": f"data:{image_mime};base64,{image_base64}"}}
+            for image_mime, image_base64 in page_images
+        ]
+
+    def _page_cache_key(self, page_data: Dict[str, Any]) -> str:
+        page_images = page_data_images(page_data)
+        # Pages are keyed by fingerprint rather than position, so unchanged
+        # slides are reused even after slides are inserted or removed. The
+        # render policy is part of the key since it decides what the model sees.
+        fingerprint = page_data.get("fingerprint")
+        if fingerprint:
+            return make_cache_key(
+                "page", self._model_name(self.multimodal_model), PAGE_PROMPT_VERSION,
+                page_data.get("render_policy", ""), fingerprint, str(bool(page_images))
+            )
+        return make_cache_key(
+            "page", self._model_name(self.multimodal_model), PAGE_PROMPT_VERSION,
+            str(page_data["page_number"]), page_data["text_content"] or "",
+            *(image_base64 for _, image_base64 in page_images)
+        )
+
+    @staticmethod
+    def _page_result(page_data: Dict[str, Any], analysis: str, reused: bool, status: str = "success") -> Dict[str, Any]:
+        return {
+            "page_number": page_data["page_number"],
+            "text_content": page_data["text_content"],
+            "has_image": bool(page_data_images(page_data)),
+            "fingerprint": page_data.get("fingerprint"),
+            "similarity_hash": page_data.get("similarity_hash"),
+            "analysis": analysis,
+            "reused": reused,
+            "status": status
+        }
+
+    def analyze_single_page(self, page_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze one extracted page with the multimodal model."""
+        page_number = page_data["page_number"]
+        page_text = page_data["text_content"]
+
+        print(f"\n🤖 Analyzing page {page_number} with multimodal AI...")
+
+        started = time.perf_counter()
+        page_images = page_data_images(page_data)
+        with span("page.analyze", page_number=page_number, has_image=bool(page_images),
+                  image_bytes=page_data.get("image_bytes", 0)) as page_span:
+            try:
+                # Static instructions go in the system message so every page shares the prefix;
+                # page images follow the page text in the user message
+                image_content = self._page_image_content(page_images)
+                messages = PAGE_PROMPT.messages(image_content, page_number=page_number, page_text=page_text)
+                analysis, reused = self._invoke_model(self.multimodal_model, messages, self._page_cache_key(page_data))
+
+                print(f"{'♻️ Reused' if reused else '✅'} Page {page_number} analysis completed")
+                page_span.set_attributes({"reused": reused, "status": "success"})
+                if not reused:
+                    PAGE_ANALYSIS_SECONDS.observe(time.perf_counter() - started, batch_size=1, status="success")
+                return self._page_result(page_data, analysis, reused)
+
+            except Exception as e:
+                print(f"❌ Page {page_number} analysis failed: {e}")
+                set_status(page_span, "failed", e)
+                PAGE_ANALYSIS_SECONDS.observe(time.perf_counter() - started, batch_size=1, status="failed")
+                return self._page_result(page_data, f"Analysis failed: {str(e)}", False, status="failed")
+
+    def _page_batch_messages(self, batch: List[Dict[str, Any]]) -> List[BaseMessage]:
+        content = []
+        for page_data in batch:
+            content.append({"type": "text", "text": PAGE_PROMPT.payload_text(
+                page_number=page_data["page_number"], page_text=page_data["text_content"]
+            )})
+            content.extend(self._page_image_content(page_data_images(page_data)))
+        instructions = f"{PAGE_PROMPT.system_text()}\n\n{PAGE_BATCH_PROMPT.system_text()}"
+        return [SystemMessage(content=instructions), HumanMessage(content=content)]
+
+    def analyze_page_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze several pages in one multimodal request and split the reply per page.
+
+        Cached pages are not resent, and pages missing from the reply (or a
+        failed request) fall back to one request per page.
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+        pending = []
+        for page_data in batch:
+            cache_key = self._page_cache_key(page_data)
+            cached = self.result_cache.get(cache_key) if self.result_cache is not None else None
+            if cached is not None:
+                print(f"♻️ Reused Page {page_data['page_number']} analysis completed")
+                results[page_data["page_number"]] = self._page_result(page_data, cached, True)
+            else:
+                pending.append((page_data, cache_key))
+
+        sections: Dict[int, str] = {}
+        if len(pending) > 1:
+            page_numbers = [page_data["page_number"] for page_data, _ in pending]
+            print(f"\n🤖 Analyzing pages {page_numbers} in one multimodal request...")
+            started = time.perf_counter()
+            try:
+                reply, _ = self._invoke_model(self.multimodal_model,
+                                              self._page_batch_messages([page_data for page_data, _ in pending]))
+                sections = split_page_sections(reply)
+                PAGE_ANALYSIS_SECONDS.observe(time.perf_counter() - started, batch_size=len(pending), status="success")
+            except Exception as e:
+                print(f"⚠️ Batched request for pages {page_numbers} failed, retrying page by page: {e}")
+                PAGE_ANALYSIS_SECONDS.observe(time.perf_counter() - started, batch_size=len(pending), status="failed")
+
+        for page_data, cache_key in pending:
+            analysis = sections.get(page_data["page_number"])
+            if analysis is None:
+                results[page_data["page_number"]] = self.analyze_single_page(page_data)
+                continue
+            if self.result_cache is not None:
+                self.result_cache.set(cache_key, analysis)
+            print(f"✅ Page {page_data['page_number']} analysis completed")
+            results[page_data["page_number"]] = self._page_result(page_data, analysis, False)
+        return [results[page_data["page_number"]] for page_data in batch]
+
+    def iter_page_batches(self, pages: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Group consecutive pages within the token budget and page cap (single pages when batching is off)."""
+        if self.page_batch_tokens <= 0 or self.max_pages_per_batch <= 1:
+            for page_data in pages:
+                yield [page_data]
+            return
+        batch, batch_tokens = [], 0
+        for page_data in pages:
+            tokens = estimate_page_tokens(page_data)
+            if batch and (len(batch) >= self.max_pages_per_batch or batch_tokens + tokens > self.page_batch_tokens):
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(page_data)
+            batch_tokens += tokens
+        if batch:
+            yield batch
+
+    def _analyze_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if len(batch) == 1:
+            results = [self.analyze_single_page(batch[0])]
+        else:
+            with span("page_batch.analyze", pages=len(batch),
+                      page_numbers=[page_data["page_number"] for page_data in batch]) as batch_span:
+                results = self.analyze_page_batch(batch)
+                failed = sum(1 for page in results if page["status"] != "success")
+                batch_span.set_attributes({"failed_pages": failed, "status": "failed" if failed else "success"})
+        # Latency is recorded per model call (see PAGE_ANALYSIS_SECONDS), not per page
+        for page in results:
+            PAGES_ANALYZED.inc(status=page["status"], reused=str(page["reused"]).lower())
+        return results
+
+    def analyze_pages(self, pages: Iterable[Dict[str, Any]],
+                      progress_callback: Optional[ProgressCallback] = None) -> List[Dict[str, Any]]:
+        """Analyze pages as they are produced, with at most max_concurrent_pages requests in flight.
+
+        Pages are grouped by iter_page_batches (one page per request unless
+        batching is enabled). The next batch is only pulled from the iterator
+        once a slot frees up, and a finished page's image is dropped with its
+        work item, so peak memory tracks the concurrency level rather than the
+        page count.
+        """
+        def report(future) -> None:
+            if progress_callback and not future.exception():
+                for page_analysis in future.result():
+                    progress_callback("page_completed", page_analysis)
+
+        results: Dict[int, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_pages, thread_name_prefix="page-analysis") as pool:
+            in_flight = set()
+            for batch in self.iter_page_batches(pages):
+                if len(in_flight) >= self.max_concurrent_pages:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for page_analysis in future.result():
+                            results[page_analysis["page_number"]] = page_analysis
+                future = pool.submit(propagate(self._analyze_batch), batch)
+                future.add_done_callback(report)
+                in_flight.add(future)
+                batch = None
+
+            for future in in_flight:
+                for page_analysis in future.result():
+                    results[page_analysis["page_number"]] = page_analysis
+
+        # Completion order varies; report pages in document order
+        return [results[page_number] for page_number in sorted(results)]
+
     def analyze_pdf_document(self, pdf_path: str, doc_type: str = "general") -> Dict[str, Any]:
-        """Analyze PDF using per-page multimodal approach."""
-        try:
-            print(f"\n🔄 Starting per-page multimodal PDF analysis: {pdf_path}")
-            
-            # Step 1: Extract content and images for each page
-            pdf_bytes = self.read_pdf_to_bytes(pdf_path)
-            pages_data = self.extract_pdf_pages_content_from_bytes(pdf_bytes)
+        """Analyze PDF file using per-page multimodal approach."""
+        pdf_bytes = self.read_pdf_to_bytes(pdf_path)
+        return self.analyze_pdf_bytes(pdf_bytes, doc_type=doc_type, file_name=pdf_path)
+
+    def analyze_pdf_bytes(self, pdf_bytes: bytes, doc_type: str = "general", file_name: str = "",
+                          progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Analyze in-memory PDF bytes (bytes, bytearray or memoryview) page by page."""
+        print(f"\n🔄 Starting per-page multimodal PDF analysis: {file_name}")
+        return self._analyze_document(
+            pdf_bytes, self.iter_pdf_pages, doc_type, file_name,
+            analysis_type="per_page_multimodal", cache_variant=f"pdf:{self.render_policy.name}",
+            progress_callback=progress_callback
+        )
+
+    def analyze_pptx_document(self, pptx_path: str, doc_type: str = "general") -> Dict[str, Any]:
+        """Analyze PPTX file slide by slide from its native structure."""
+        with open(pptx_path, 'rb') as f:
+            pptx_bytes = f.read()
+        return self.analyze_pptx_bytes(pptx_bytes, doc_type=doc_type, file_name=pptx_path)
+
+    def analyze_pptx_bytes(self, pptx_bytes: bytes, doc_type: str = "general", file_name: str = "",
+                           progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Analyze in-memory PPTX bytes; only slides with pictures send images."""
+        print(f"\n🔄 Starting per-slide structured PPTX analysis: {file_name}")
+        return self._analyze_document(
+            pptx_bytes, iter_pptx_slides, doc_type, file_name,
+            analysis_type="per_slide_structured", cache_variant="pptx",
+            progress_callback=progress_callback
+        )
+
+    def analyze_document_bytes(self, content: bytes, file_name: str, doc_type: str = "general",
+                               progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Dispatch an in-memory document to the right pipeline by file extension."""
+        suffix = Path(file_name).suffix.lower()
+        if suffix == '.pdf':
+            return self.analyze_pdf_bytes(content, doc_type, file_name, progress_callback)
+        if suffix == '.pptx':
+            return self.analyze_pptx_bytes(content, doc_type, file_name, progress_callback)
+        if suffix == '.ppt':
+            return {"error": "Legacy .ppt files are not supported. Please convert to PPTX or PDF.", "status": "failed"}
+        return {"error": f"Unsupported file type: {suffix}", "status": "failed"}
+
+    def _analyze_document(self, source_bytes: bytes, iter_pages: Callable[..., Iterable[Dict[str, Any]]],
+                          doc_type: str, file_name: str, analysis_type: str, cache_variant: str,
+                          progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Run the shared pipeline under a document.analyze span."""
+        with span("document.analyze", file_name=file_name, doc_type=doc_type,
+                  analysis_type=analysis_type, bytes=len(source_bytes or b"")) as document_span:
+            result = self._run_document_pipeline(source_bytes, iter_pages, doc_type, file_name,
+                                                 analysis_type, cache_variant, progress_callback)
+            document_span.set_attributes({
+                "total_pages": result.get("total_pages", 0),
+                "cache_hit": result.get("cache_hit", False),
+                "status": result.get("status", "failed")
+            })
+            return result
+
+    def _run_document_pipeline(self, source_bytes: bytes, iter_pages: Callable[..., Iterable[Dict[str, Any]]],
+                               doc_type: str, file_name: str, analysis_type: str, cache_variant: str,
+                               progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Shared pipeline: document cache → streamed per-page analysis → summary."""
+        pdf_path = file_name
+
+        def notify(event: str, data: Dict[str, Any]) -> None:
+            if progress_callback:
+                progress_callback(event, data)
 
-            if not pages_data:
+        try:
+            # Step 1: Identical bytes + prompts + models: serve the whole analysis from cache
+            document_key = None
+            if self.result_cache is not None and source_bytes:
+                document_key = make_cache_key(
+                    "document", doc_type, DOCUMENT_PROMPTS_VERSION, cache_variant,
+                    self._model_name(self.multimodal_model), self._model_name(self.text_model), source_bytes
+                )
+                cached = self.result_cache.get(document_key)
+                if cached is not None:
+                    print("⚡ Returning cached document analysis")
+                    notify("document_started", {"total_pages": cached["total_pages"]})
+                    for page_analysis in cached["page_analyses"]:
+                        notify("page_completed", page_analysis)
+                    notify("summary_completed", {"overall_summary": cached["overall_summary"]})
+                    return {**cached, "file_path": pdf_path, "cache_hit": True}
+
+            # Step 2: Extract pages lazily and stream them into the analysis stage
+            pages = iter_pages(
+                source_bytes,
+                on_page_count=lambda total: notify("document_started", {"total_pages": total})
+            )
+            page_analyses = self.analyze_pages(pages, progress_callback)
+
+            if not page_analyses:
                 return {
                    "page_number": None,
                    "text_content": None,
                    "image_base64": None,
                    "has_content": False
                 }
+
+            successful_analyses = sum(1 for page in page_analyses if page["status"] == "success")
+            reused_pages = sum(1 for page in page_analyses if page["reused"])
+            if reused_pages:
+                print(f"♻️ Reused {reused_pages}/{len(page_analyses)} unchanged page analyses")
             
-            # Step 2: Analyze each page individually with multimodal model
-            page_analyses = []
-            successful_analyses = 0
-            
-            for page_data in pages_data:
-                page_number = page_data["page_number"]
-                page_text = page_data["text_content"]
-                page_image = page_data["image_base64"]
-                
-                print(f"\n🤖 Analyzing page {page_number} with multimodal AI...")
-                
-                try:
-                    # Create prompt for this specific page
-                    prompt = self.create_per_page_multimodal_prompt(page_number, page_text)
-                    
-                    # Prepare multimodal message content
-                    message_content = [{"type": "text", "text": prompt}]
-                    
-                    # Add page image if available
-                    if page_image:
-                        message_content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{page_image}"
-                            }
-                        })
-                    
-                    # Send to multimodal model
-                    messages = [HumanMessage(content=message_content)]
-                    response = self.multimodal_model.invoke(messages)
-                    
-                    page_analysis = {
-                        "page_number": page_number,
-                        "text_content": page_text,
-                        "has_image": bool(page_image),
-                        "analysis": response.content,
-                        "status": "success"
-                    }
-                    
-                    successful_analyses += 1
-                    print(f"✅ Page {page_number} analysis completed")
-                    
-                except Exception as e:
-                    page_analysis = {
-                        "page_number": page_number,
-                        "text_content": page_text,
-                        "has_image": bool(page_image),
-                        "analysis": f"Analysis failed: {str(e)}",
-                        "status": "failed"
-                    }
-                    print(f"❌ Page {page_number} analysis failed: {e}")
-                
-                page_analyses.append(page_analysis)
-            
-            # Step 3: Generate overall document summary
+            # Step 3: Generate overall document summary (always rebuilt from the merged set)
             print("\n📊 Generating overall document summary...")
+            notify("summary_started", {})
             overall_summary = self.generate_document_summary_from_pages(page_analyses, doc_type)
+            notify("summary_completed", {"overall_summary": overall_summary})
             
-            return {
+            result = {
                 "document_type": doc_type,
                 "file_path": pdf_path,
-                "total_pages": len(pages_data),
+                "total_pages": len(page_analyses),
                 "successful_analyses": successful_analyses,
+                "reused_pages": reused_pages,
+                "pages_with_images": sum(1 for page in page_analyses if page["has_image"]),
                 "page_analyses": page_analyses,
                 "overall_summary": overall_summary,
-                "analysis_type": "per_page_multimodal",
+                "analysis_type": analysis_type,
                 "status": "success"
             }
+
+            # Only fully successful analyses are worth replaying for the same bytes
+            if document_key and successful_analyses == len(page_analyses) \
+                    and not overall_summary.startswith("Summary generation failed"):
+                self.result_cache.set(document_key, result)
+
+            return {**result, "cache_hit": False}
             
         except Exception as e:
             return {
@@ -182,125 +944,98 @@ class StartupAnalyzer:
             }
 
     def generate_document_summary_from_pages(self, page_analyses: List[Dict], doc_type: str) -> str:
-        """Generate overall document summary from individual page analyses."""
-        try:
-            # Combine all page analyses
-            combined_analysis = ""
-            for page in page_analyses:
-                if page["status"] == "success":
-                    combined_analysis += f"\n=== PAGE {page['page_number']} ANALYSIS ===\n"
-                    combined_analysis += page["analysis"]
-                    combined_analysis += "\n"
-            summary_prompt = """
-    You are a comprehensive data extraction and collation agent. Your task is to compile ALL data points, numbers, text, and visual information from this {doc_type} document into a structured format for downstream analysis agents.
-
-DOCUMENT TYPE: {doc_type}
-
-EXTRACTED PAGE DATA:
-{combined_analysis}
-
-**COMPREHENSIVE DATA COLLATION REQUIREMENTS:**
-
-**1. COMPLETE NUMERICAL DATA EXTRACTION:**
-Extract and organize EVERY number mentioned or shown in charts/graphs:
-- Revenue figures (historical, current, projected) with exact amounts and time periods
-- Growth rates and percentages from all charts and graphs
-- Market size data (TAM, SAM, SOM) with sources and methodology
-- Customer metrics (acquisition numbers, retention rates, churn percentages)
-- Financial ratios (CAC, LTV, burn rate, runway) with exact calculations
-- Team size numbers and hiring projections
-- Funding amounts (raised, seeking, valuation) with round details
-- Timeline data (dates, milestones, deadlines)
-- Performance metrics (KPIs, conversion rates, usage statistics)
-
-**2. COMPLETE TEXTUAL DATA EXTRACTION:**
-Transcribe and organize ALL text content:
-- Company name, legal structure, location, contact information
-- Product/service descriptions and feature lists
-- Target market definitions and customer segments
-- Value propositions and competitive advantages
-- Business model and revenue streams
-- Partnership details and strategic relationships
-- Regulatory or compliance information
-- Technology stack and operational details
-
-**3. VISUAL ELEMENTS DATA EXTRACTION:**
-Extract ALL data from visual elements:
-- Chart types (bar, line, pie, etc.) with all data points
-- Graph axes labels, legends, units, and scales
-- Table contents with all rows and columns
-- Infographic data and statistics
-- Timeline visualizations with events and dates
-- Organizational charts with names and reporting structure
-- Product screenshots with feature callouts
-- Customer logos and testimonial quotes
-
-**4. TEAM AND ORGANIZATION DATA:**
-Complete roster of all people mentioned:
-- Names, titles, and roles
-- Educational backgrounds and institutions
-- Previous work experience and companies
-- Years of experience in relevant fields
-- Advisory board and board members
-- Organizational structure and reporting lines
-
-**5. COMPETITIVE AND MARKET DATA:**
-All market and competition information:
-- Competitor names and positioning
-- Market trends and growth data
-- Customer pain points and solution fit
-- Pricing comparisons and strategies
-- Market share data and penetration rates
-
-**6. OPERATIONAL AND BUSINESS DATA:**
-All business operations information:
-- Revenue models and pricing structures
-- Sales processes and conversion funnels
-- Cost structures and unit economics
-- Partnership agreements and terms
-- Geographic presence and expansion plans
-- Regulatory approvals and compliance status
-
-
-**CRITICAL REQUIREMENTS:**
-- Extract EVERY single number, percentage, and data point
-- Preserve exact wording and figures as presented
-- Note the source (slide number, chart title) for each data point  
-- Include units, currencies, and time periods for all numerical data
-- Distinguish between historical data and projections
-- Capture visual data that text extraction might miss
-- Organize data for easy consumption by downstream analysis agents
-
-**DO NOT:**
-- Provide opinions, analysis, or recommendations
-- Make calculations or derive new metrics
-- Interpret or evaluate the data quality
-- Add subjective assessments
-
-**OUTPUT:** Complete structured data compilation ready for specialized analysis agents to process specific aspects of the investment opportunity.
-"""
-            summary_prompt = summary_prompt.format(doc_type=doc_type, combined_analysis=combined_analysis)
-            
-            messages = [HumanMessage(content=summary_prompt)]
-            response = self.text_model.invoke(messages)
-            
-            return response.content
-            
-        except Exception as e:
-            return f"Summary generation failed: {str(e)}"
+        """Generate overall document summary from individual page analyses.
+
+        Small documents are summarised in one call. Above SUMMARY_SINGLE_SHOT_TOKENS the
+        pages are grouped into token-budgeted chunks, the chunks are condensed
+        concurrently, and the final summary is built from the chunk digests.
+        """
+        with span("summary", doc_type=doc_type, pages=len(page_analyses)) as summary_span:
+            try:
+                # (first page, last page, text) per successful page analysis
+                sections = [
+                    (page["page_number"], page["page_number"],
+                     f"\n=== PAGE {page['page_number']} ANALYSIS ===\n{page['analysis']}\n")
+                    for page in page_analyses if page["status"] == "success"
+                ]
+                total_tokens = sum(count_tokens(text) for _, _, text in sections)
+                summary_span.set_attribute("input_tokens", total_tokens)
+
+                level = 0
+                while total_tokens > SUMMARY_SINGLE_SHOT_TOKENS and len(sections) > 1 \
+                        and level < MAX_SUMMARY_REDUCE_LEVELS:
+                    level += 1
+                    chunks = self._chunk_summary_sections(sections)
+                    print(f"🧩 Summary level {level}: {len(sections)} sections ({total_tokens} tokens) "
+                          f"→ {len(chunks)} chunks")
+                    sections = self._summarize_chunks(chunks, doc_type)
+                    total_tokens = sum(count_tokens(text) for _, _, text in sections)
+
+                combined_analysis = "".join(text for _, _, text in sections)
+                messages = SUMMARY_PROMPT.messages(doc_type=doc_type, combined_analysis=combined_analysis)
+                cache_key = make_cache_key(
+                    "summary", self._model_name(self.text_model), SUMMARY_PROMPT.version, doc_type, combined_analysis
+                )
+                summary, _ = self._invoke_model(self.text_model, messages, cache_key)
+                summary_span.set_attributes({"reduce_levels": level, "status": "success"})
+                return summary
+
+            except Exception as e:
+                set_status(summary_span, "failed", e)
+                return f"Summary generation failed: {str(e)}"
+
+    @staticmethod
+    def _chunk_summary_sections(sections: List[Tuple[int, int, str]],
+                                chunk_tokens: Optional[int] = None) -> List[List[Tuple[int, int, str]]]:
+        """Group consecutive sections into chunks of at most chunk_tokens (oversized sections stand alone).
+
+        chunk_tokens defaults to SUMMARY_CHUNK_TOKENS, read at call time.
+        """
+        if chunk_tokens is None:
+            chunk_tokens = SUMMARY_CHUNK_TOKENS
+        chunks, current, current_tokens = [], [], 0
+        for section in sections:
+            tokens = count_tokens(section[2])
+            if current and current_tokens + tokens > chunk_tokens:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(section)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _summarize_chunks(self, chunks: List[List[Tuple[int, int, str]]], doc_type: str) -> List[Tuple[int, int, str]]:
+        """Condense each chunk with the text model concurrently; returns one digest section per chunk."""
+        def summarize(chunk: List[Tuple[int, int, str]]) -> Tuple[int, int, str]:
+            first, last = chunk[0][0], chunk[-1][1]
+            page_range = str(first) if first == last else f"{first}-{last}"
+            combined_analysis = "".join(text for _, _, text in chunk)
+            messages = CHUNK_SUMMARY_PROMPT.messages(
+                doc_type=doc_type, page_range=page_range, combined_analysis=combined_analysis
+            )
+            cache_key = make_cache_key(
+                "summary_chunk", self._model_name(self.text_model), CHUNK_SUMMARY_PROMPT.version,
+                doc_type, page_range, combined_analysis
+            )
+            with span("summary.chunk", page_range=page_range, sections=len(chunk)):
+                digest, _ = self._invoke_model(self.text_model, messages, cache_key)
+            return first, last, f"\n=== PAGES {page_range} DIGEST ===\n{digest}\n"
+
+        with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), SUMMARY_MAX_CONCURRENT_CHUNKS))) as executor:
+            return list(executor.map(propagate(summarize), chunks))
 
     
     def analyze_raw_email(self, raw_email_text: str) -> Dict[str, Any]:
         """Analyze raw email text."""
         try:
-            prompt = self.create_email_analysis_prompt(raw_email_text)
-            
-            messages = [HumanMessage(content=prompt)]
-            response = self.text_model.invoke(messages)
+            messages = EMAIL_PROMPT.messages(raw_email_text=raw_email_text)
+            cache_key = make_cache_key("email", self._model_name(self.text_model), EMAIL_PROMPT.version, raw_email_text)
+            analysis, _ = self._invoke_model(self.text_model, messages, cache_key)
             
             return {
                 "document_type": "email",
-                "analysis": response.content,
+                "analysis": analysis,
                 "status": "success"
             }
             
@@ -314,14 +1049,13 @@ All business operations information:
     def analyze_raw_call_transcript(self, raw_transcript: str) -> Dict[str, Any]:
         """Analyze raw call transcript text."""
         try:
-            prompt = self.create_call_analysis_prompt(raw_transcript)
-            
-            messages = [HumanMessage(content=prompt)]
-            response = self.text_model.invoke(messages)
+            messages = CALL_PROMPT.messages(raw_transcript=raw_transcript)
+            cache_key = make_cache_key("call", self._model_name(self.text_model), CALL_PROMPT.version, raw_transcript)
+            analysis, _ = self._invoke_model(self.text_model, messages, cache_key)
             
             return {
                 "document_type": "call_transcript",
-                "analysis": response.content,
+                "analysis": analysis,
                 "status": "success"
             }
             
@@ -333,31 +1067,26 @@ All business operations information:
             }
 
     
-def analyze_startup_documents(file_paths: List[str]) -> Dict[str, Any]:
-    """Analyze multiple startup documents."""
+def analyze_startup_documents(file_paths: List[str], max_concurrent_documents: int = 1) -> Dict[str, Any]:
+    """Analyze multiple startup documents, up to max_concurrent_documents at a time."""
     analyzer = StartupAnalyzer()
-    results = {}
-    
-    for file_path in file_paths:
-        file_path = Path(file_path)
-        
+
+    def analyze_file(file_path: Path) -> Dict[str, Any]:
         try:
-            if file_path.suffix.lower() == '.pdf':
-                result = analyzer.analyze_pdf_document(str(file_path))
-            elif file_path.suffix.lower() in ['.pptx', '.ppt']:
-                result = analyzer.analyze_pitch_deck_pptx(str(file_path))
-            else:
-                result = {"error": f"Unsupported file type: {file_path.suffix}"}
-            
-            results[file_path.name] = result
-            
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            return analyzer.analyze_document_bytes(content, str(file_path))
         except Exception as e:
-            results[file_path.name] = {
+            return {
                 "error": f"Processing failed: {str(e)}",
                 "traceback": traceback.format_exc()
             }
-    
-    return results
+
+    paths = [Path(file_path) for file_path in file_paths]
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent_documents), thread_name_prefix="document") as pool:
+        analyses = list(pool.map(analyze_file, paths))
+
+    return {path.name: analysis for path, analysis in zip(paths, analyses)}
 
 def analyze_raw_email_text(raw_email: str) -> Dict[str, Any]:
     """Analyze raw email text."""
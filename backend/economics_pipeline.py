@@ -0,0 +1,113 @@
+"""
+economics_pipeline.py — Startup economics analysis on pooled runners
+• Fans out the Economics_Parallel_Agent branches (revenue, pricing, monetization)
+  concurrently, each under its own timeout
+• Slow or failing branches are reported, not fatal: the report is built from
+  whatever branches finished
+• Per-agent latency is returned with the result, plus event-level agent
+  timings (see agent_telemetry.py)
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from agent_telemetry import AgentRunTelemetry
+from business_model_agent import economics_parallel_agent, report_making_agent
+from session_store import run_agent_once
+
+ECONOMICS_APP_NAME = "Economics-Studio"
+ECONOMICS_USER_ID = "Investment_Analyst"
+
+
+async def _run_branch(runner_pool, session_service, agent, query: str, timeout: float,
+                      telemetry: Optional[AgentRunTelemetry] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    branch = {"agent": agent.name, "analysis": None, "error": None}
+    try:
+        branch["analysis"] = await asyncio.wait_for(
+            run_agent_once(runner_pool, session_service, agent, query, ECONOMICS_USER_ID, telemetry),
+            timeout=timeout
+        )
+        branch["status"] = "success"
+    except asyncio.TimeoutError:
+        branch["status"] = "timeout"
+        branch["error"] = f"{agent.name} did not finish within {timeout:g}s"
+    except Exception as exc:
+        branch["status"] = "failed"
+        branch["error"] = f"{agent.name} failed: {exc}"
+    branch["latency_seconds"] = round(time.perf_counter() - started, 3)
+    print(f"⏱️ {agent.name}: {branch['status']} in {branch['latency_seconds']}s")
+    return branch
+
+
+def _build_report_query(content: str, branches: Dict[str, Dict[str, Any]]) -> str:
+    sections = []
+    for name, branch in branches.items():
+        analysis = branch["analysis"] if branch["status"] == "success" else (
+            f"Not available ({branch['status']}: {branch['error']})"
+        )
+        sections.append(f"### {name} output:\n{analysis}")
+    return (
+        "Synthesize the following specialized analyses into the startup economics report. "
+        "Where an analysis is not available, list it under Areas Requiring Clarification.\n\n"
+        + "\n\n".join(sections)
+        + f"\n\n### Original startup information:\n{content}"
+    )
+
+
+async def analyze_startup_economics(runner_pool, session_service, content: str,
+                                    branch_timeout: float = 60.0,
+                                    report_timeout: float = 90.0,
+                                    telemetry: Optional[AgentRunTelemetry] = None) -> Dict[str, Any]:
+    """
+    Run the three economics branches concurrently, then ReportMaking_Agent.
+
+    Returns partial results (status "partial") when some branches time out or
+    fail, and status "failed" only when no branch produced an analysis.
+    Agent events are recorded in telemetry (a fresh one when not given).
+    """
+    started = time.perf_counter()
+    telemetry = telemetry or AgentRunTelemetry()
+    query = f"Analyze the economics of the following startup information:\n\n{content}"
+
+    branch_results = await asyncio.gather(*[
+        _run_branch(runner_pool, session_service, agent, query, branch_timeout, telemetry)
+        for agent in economics_parallel_agent.sub_agents
+    ])
+    parallel_seconds = time.perf_counter() - started
+    branches = {branch.pop("agent"): branch for branch in branch_results}
+    succeeded = [name for name, branch in branches.items() if branch["status"] == "success"]
+
+    result = {
+        "document_type": "economics",
+        "analysis": None,
+        "branches": branches,
+        "report": None,
+        "timings": {
+            "parallel_seconds": round(parallel_seconds, 3),
+            # What running the branches one after another would have cost
+            "sequential_branch_seconds": round(sum(b["latency_seconds"] for b in branches.values()), 3)
+        },
+        "analysis_type": "startup_economics"
+    }
+
+    if not succeeded:
+        result["status"] = "failed"
+        result["error"] = "All economics branches failed or timed out"
+    else:
+        report = await _run_branch(
+            runner_pool, session_service, report_making_agent,
+            _build_report_query(content, branches), report_timeout, telemetry
+        )
+        report.pop("agent")
+        result["report"] = report
+        result["analysis"] = report["analysis"]
+        complete = len(succeeded) == len(branches) and report["status"] == "success"
+        result["status"] = "success" if complete else "partial"
+        if report["status"] != "success":
+            result["error"] = report["error"]
+
+    result["timings"]["total_seconds"] = round(time.perf_counter() - started, 3)
+    result["agent_timings"] = telemetry.summary()
+    return result
@@ -172,7 +172,7 @@
 
 
 from google.adk.agents import LlmAgent, SequentialAgent
-from google.adk.tools import google_search
+from search_tool import web_search_tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 import os
 
@@ -228,11 +228,13 @@ You are a factual, evidence-first Startup Fact-Checking Agent.
 
 **INPUTS:**
 1. The original startup text.
-2. The Normalization Table (produced by Normalization_Agent).
+2. The Normalization Table (produced by the rule-based normalizer, with Normalization_Agent covering spans it could not parse).
+3. PRECOMPUTED_CALCULATIONS and PRECOMPUTED_CONSISTENCY_CHECKS from the local metrics engine (when provided).
 
 **WORKFLOW:**
 
 1. **INTERNAL ANALYSIS (using normalized values only):**
+   - **Precomputed results:** Values under PRECOMPUTED_CALCULATIONS and PRECOMPUTED_CONSISTENCY_CHECKS were computed deterministically. Quote them as-is in CONSISTENCY_CHECKS and KEY_FINDINGS and do not redo that arithmetic; only calculate what they do not cover, and spend your output on explaining what the numbers mean.
    - **Calculations:** Perform step-by-step math with normalized numbers:
      * Runway: cash_position ÷ monthly_burn = X months
      * Growth rate: (new_value - old_value) ÷ old_value = X (decimal)
@@ -241,10 +243,12 @@ You are a factual, evidence-first Startup Fact-Checking Agent.
    - **Consistency checks:** Quote exact contradictory text, then show normalized contradiction (value1 vs value2).
    - **Plausibility checks (benchmarks):** Compare normalized values to known industry ranges with explicit assumptions.
 
-2. **EXTERNAL VERIFICATION (limited google_search usage):**
+2. **EXTERNAL VERIFICATION (limited web_search usage):**
    - Only when internal analysis is insufficient.
    - Prioritize: Market size > Founder credentials > Competitor revenue > Regulation > Patents/tech.
    - Consolidate queries to minimize searches.
+   - web_search returns cached results for repeated queries (cached: true); these do not count against the quota.
+   - The quota is enforced: once web_search returns status "quota_exceeded", stop searching.
    - Each web-verified claim must include: normalized claim, supporting evidence, exact URL, confidence level.
 
 3. **ERROR HANDLING:**
@@ -278,7 +282,7 @@ You are a factual, evidence-first Startup Fact-Checking Agent.
 
 **SEARCH_LOG:**
 - Query 1: "[search terms]" → [URLs found]
-- Searches used: X/10
+- Searches used: X/10 (use searches_used from the last web_search result)
 
 **RECOMMENDATIONS:**
 - [Actionable next steps]
@@ -291,7 +295,7 @@ factcheck_agent = LlmAgent(
     model="gemini-2.0-flash",
     description="Analyzes normalized data, performs fact-checking, and uses web search if needed",
     instruction=factcheck_instruction,
-    tools=[google_search],
+    tools=[web_search_tool],
 )
 
 # -------------------------------
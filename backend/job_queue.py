@@ -0,0 +1,193 @@
+"""
+job_queue.py — Background document analysis jobs
+• Submissions return job IDs immediately; a bounded worker pool runs them
+• The backlog is bounded: submissions beyond max_queued_jobs are rejected
+• Clients poll (or long-poll) per-page progress, then fetch the result
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class JobQueueFull(Exception):
+    """Raised when a submission would exceed the job backlog."""
+
+
+@dataclass
+class AnalysisJob:
+    """One submitted document and its progress."""
+    job_id: str
+    file_name: str
+    content: Optional[bytes]
+    status: str = "queued"  # queued, running, completed, failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    total_pages: Optional[int] = None
+    pages: List[Dict[str, Any]] = field(default_factory=list)
+    stage: str = "queued"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Bumped on every change so long-polling clients can wait for "newer than N"
+    version: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def touch(self) -> None:
+        self.version += 1
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def record(self, event: str, data: Dict[str, Any]) -> None:
+        """Apply an analyzer progress event (must run on the event loop)."""
+        if event == "document_started":
+            self.total_pages = data.get("total_pages")
+            self.stage = "analyzing_pages"
+        elif event == "page_completed":
+            self.pages.append({
+                "page_number": data["page_number"],
+                "status": data["status"],
+                "reused": data.get("reused", False)
+            })
+        elif event == "summary_started":
+            self.stage = "summarizing"
+        self.touch()
+
+    def to_status(self) -> Dict[str, Any]:
+        finished = self.finished_at or time.time()
+        return {
+            "job_id": self.job_id,
+            "file_name": self.file_name,
+            "status": self.status,
+            "stage": self.stage,
+            "version": self.version,
+            "total_pages": self.total_pages,
+            "pages_completed": len(self.pages),
+            "pages": sorted(self.pages, key=lambda page: page["page_number"]),
+            "created_at": self.created_at,
+            "elapsed_seconds": round(finished - (self.started_at or finished), 3),
+            "error": self.error
+        }
+
+
+# run_job(job, progress_callback) -> analysis result
+JobRunner = Callable[[AnalysisJob, Callable[[str, Dict[str, Any]], None]], Awaitable[Dict[str, Any]]]
+
+
+class AnalysisJobManager:
+    """Bounded queue + fixed worker pool for document analysis jobs."""
+
+    def __init__(self, run_job: JobRunner, workers: int = 2, max_queued_jobs: int = 20,
+                 result_ttl_seconds: float = 3600.0):
+        self.run_job = run_job
+        self.workers = max(1, workers)
+        self.max_queued_jobs = max(1, max_queued_jobs)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.jobs: Dict[str, AnalysisJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    def _ensure_started(self) -> None:
+        """Start workers lazily on the running event loop."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queued_jobs)
+            self._worker_tasks = [
+                asyncio.create_task(self._worker(index)) for index in range(self.workers)
+            ]
+
+    async def shutdown(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def submit(self, files: List[Dict[str, Any]]) -> List[AnalysisJob]:
+        """Enqueue files ({"file_name", "content"}) all-or-nothing.
+
+        Raises JobQueueFull when the backlog cannot take every file, so a data
+        room is never half-submitted.
+        """
+        self._ensure_started()
+        self._prune()
+        if self._queue.qsize() + len(files) > self.max_queued_jobs:
+            raise JobQueueFull(
+                f"Job queue is full ({self._queue.qsize()}/{self.max_queued_jobs} queued). Retry later."
+            )
+
+        jobs = []
+        for file in files:
+            job = AnalysisJob(job_id=uuid.uuid4().hex, file_name=file["file_name"], content=file["content"])
+            self.jobs[job.job_id] = job
+            self._queue.put_nowait(job)
+            jobs.append(job)
+        return jobs
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self.jobs.get(job_id)
+
+    async def wait_for_change(self, job: AnalysisJob, since_version: int, timeout: float) -> AnalysisJob:
+        """Long-poll: return once job.version > since_version, the job ends, or timeout."""
+        deadline = time.monotonic() + timeout
+        while job.version <= since_version and job.status in {"queued", "running"}:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(job.changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for job in self.jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued_jobs": self.max_queued_jobs,
+            "jobs": by_status
+        }
+
+    async def _worker(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.stage = "extracting"
+            job.started_at = time.time()
+            job.touch()
+
+            def progress(event: str, data: Dict[str, Any], job: AnalysisJob = job) -> None:
+                # Analyzer threads report progress; apply it on the event loop
+                loop.call_soon_threadsafe(job.record, event, data)
+
+            try:
+                result = await self.run_job(job, progress)
+                job.result = result
+                job.status = "completed" if result.get("status") == "success" else "failed"
+                job.error = result.get("error")
+            except Exception as exc:
+                job.status = "failed"
+                job.error = f"Document analysis failed: {exc}"
+            finally:
+                job.content = None  # release the upload as soon as it is processed
+                job.finished_at = time.time()
+                job.stage = "done"
+                # Let queued progress callbacks land before waking pollers
+                await asyncio.sleep(0)
+                job.touch()
+                self._queue.task_done()
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the result TTL."""
+        cutoff = time.time() - self.result_ttl_seconds
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
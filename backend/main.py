@@ -1,29 +1,32 @@
 """
 main.py — Fact-checking agent runner
-• Sessions live only in RAM (InMemorySessionService)  
-• Artifacts are persisted (in-memory)
+• SESSION_BACKEND=memory: sessions and artifacts live only in RAM
+• SESSION_BACKEND=sqlite: sessions persist in SQLite, artifacts on disk;
+  set RESUME_SESSION_ID to continue a previous session after a restart
 """
 
 import asyncio, os
 from dotenv import load_dotenv
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.artifacts import InMemoryArtifactService
+from agent_telemetry import AgentRunTelemetry
+from session_store import DEFAULT_ARTIFACT_DIR, DEFAULT_SESSION_DB_PATH, create_agent_services
 from factcheck_agent import factcheck_agent
 from google.genai import types
 
 load_dotenv()
 
 # ────────────────────────────────────────────────────────────────
-# 1. Session service - in-memory, wiped when the app exits
+# 1-2. Session + artifact services (in-memory or persistent)
 # ────────────────────────────────────────────────────────────────
-session_service = InMemorySessionService() # sessions are *not* saved to disk
-
-# ────────────────────────────────────────────────────────────────
-# 2. Artifact service (in-memory)
-# ────────────────────────────────────────────────────────────────
-artifact_service = InMemoryArtifactService()
-print("⚠️ Using in-memory artifacts")
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+session_service, artifact_service = create_agent_services(
+    SESSION_BACKEND,
+    session_db_path=os.getenv("SESSION_DB_PATH", DEFAULT_SESSION_DB_PATH),
+    artifact_dir=os.getenv("ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR),
+    event_window=int(os.getenv("SESSION_EVENT_WINDOW", "0"))
+)
+if SESSION_BACKEND == "memory":
+    print("⚠️ Using in-memory sessions and artifacts")
 
 # ────────────────────────────────────────────────────────────────
 # 3. Helper function for async calls (EXACTLY like your utils.py)
@@ -34,12 +37,13 @@ async def call_agent_async(runner, user_id, session_id, query):
     print(f"\n--- Running Query: {query} ---")
     
     last_response = None
+    telemetry = AgentRunTelemetry()
     try:
-        async for event in runner.run_async(
+        async for event in telemetry.observe(runner.run_async(
             user_id=user_id,
             session_id=session_id,
             new_message=content,
-        ):
+        ), runner.agent.name):
             response = await _process_event(event)
             if response:
                 last_response = response
@@ -48,6 +52,8 @@ async def call_agent_async(runner, user_id, session_id, query):
         error_msg = f"Error during agent call: {exc}"
         print(error_msg)
         return error_msg
+    finally:
+        _print_timings(telemetry.summary())
     
     return last_response or "No response received from agent"
 
@@ -56,12 +62,22 @@ async def _process_event(event):
     final_response = None
     if event.content and event.content.parts:
         for part in event.content.parts:
-            text = getattr(part, "text", "").strip()
+            text = (getattr(part, "text", None) or "").strip()
             if text:
                 final_response = text
                 print(f"🤖 {text}")
     return final_response
 
+def _print_timings(timings) -> None:
+    """One line per agent and per tool call: where the turn's time went"""
+    for name, agent in timings["agents"].items():
+        print(f"⏱️ {name}: first event {agent['first_event_seconds']}s, "
+              f"model {agent['model_seconds']}s over {agent['model_turns']} turns, "
+              f"tools {agent['tool_seconds']}s, {agent['total_tokens']} tokens")
+    for call in timings["tool_calls"]:
+        print(f"🔍 {call['tool']} ({call['agent']}): {call['seconds']}s {call['status']}"
+              f"{' (cached)' if call['cached'] else ''}")
+
 # ────────────────────────────────────────────────────────────────
 # 4. Main event loop (exactly following your pattern)
 # ────────────────────────────────────────────────────────────────
@@ -69,15 +85,26 @@ async def main_async() -> None:
     APP_NAME = "FactCheck-Studio"
     USER_ID = "Investment_Analyst"
     
-    # Always start a fresh session — no DB lookup / resume
-    session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        state={}  # empty initial state
-    )
+    # Resume a stored session when asked to, otherwise start a fresh one
+    session = None
+    resume_id = os.getenv("RESUME_SESSION_ID")
+    if resume_id:
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=resume_id
+        )
+        if session:
+            print(f"♻️ Resumed session: {session.id} ({len(session.events)} events loaded)")
+        else:
+            print(f"⚠️ Session {resume_id} not found, starting a new one")
+    if session is None:
+        session = await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            state={}  # empty initial state
+        )
+        print(f"🔄 New {SESSION_BACKEND} session: {session.id}")
     
     SESSION_ID = session.id
-    print(f"🔄 New ephemeral session: {SESSION_ID}")
     
     runner = Runner(
         agent=factcheck_agent,
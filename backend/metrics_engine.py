@@ -0,0 +1,378 @@
+"""
+metrics_engine.py — Deterministic arithmetic checks for fact-checking
+• Extracts normalized metrics (MRR, burn, CAC, churn, ...) from one or more documents
+• Computes runway, growth, LTV:CAC and MRR×12 vs ARR across every metric pair
+• Flags values of the same metric that disagree (within or across documents)
+• Renders the results as a block the fact-check agent narrates instead of recomputing
+
+numpy is used to vectorise the pairwise comparisons when installed; the
+pure-Python path gives identical results.
+"""
+
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from normalizer import CURRENCY_SYMBOLS, KEYWORD_CONTEXTS, _sentence_bounds, normalize_text
+
+try:
+    import numpy as np
+except ImportError:  # optional: fall back to pure-Python pair loops
+    np = None
+
+# Relative difference above which two values of one metric are flagged
+DEFAULT_TOLERANCE = 0.05
+# Keeps prompts bounded on documents that repeat a metric many times
+MAX_ITEMS_PER_CHECK = 25
+
+# Point-in-time metrics where two different values deserve an explanation
+CONSISTENCY_METRICS = {
+    "mrr", "arr", "revenue", "churn_rate", "monthly_burn", "cash_position", "runway", "cac", "ltv",
+    "gross_margin", "valuation", "headcount", "customers", "conversion_rate"
+}
+# Metrics whose change between two reported values is worth computing
+GROWTH_METRICS = {"mrr", "arr", "revenue", "customers", "cac", "ltv", "churn_rate", "monthly_burn"}
+PROJECTION_WORDS = ("target", "project", "forecast", "goal", "plan", "want", "expect", "aim", "by end of")
+MONTHS_PER_UNIT = {"months": 1.0, "years": 12.0, "weeks": 12 / 52, "days": 12 / 365}
+CURRENCY_UNITS = set(CURRENCY_SYMBOLS.values())
+# Amounts of money: a percentage labelled with one of these is a change in it, or not about it at all
+MONEY_METRICS = {
+    "mrr", "arr", "revenue", "cac", "ltv", "monthly_burn", "cash_position", "valuation", "funding",
+    "price", "profit", "loss", "costs"
+}
+_GROWTH_CUE_RE = re.compile(
+    r"\b(?:" + "|".join(
+        re.escape(phrase) for phrase, context in KEYWORD_CONTEXTS.items() if context == "growth_rate"
+    ) + r"|down|decrease|decreased|decline|declined|mom|qoq|yoy|month-over-month|year-over-year)\b"
+)
+# "3. Q1 Projections (attached spreadsheet):" or "MARCH UPDATE:" on a line of its own
+_HEADER_RE = re.compile(r"^\s*(?:[#*\-\d.)]+\s*)?[^:\n]{1,80}:\s*\**\s*$")
+
+
+@dataclass(frozen=True)
+class Metric:
+    """One normalized value tagged with where it came from."""
+    name: str
+    value: float
+    unit: str
+    original: str
+    source: str
+    position: int
+    projected: bool
+
+
+def _line_before(text: str, start: int) -> str:
+    """Text from the start of the line up to a value ("March revenue target: ")."""
+    return text[text.rfind("\n", 0, start) + 1:start]
+
+
+def _section_header(text: str, start: int) -> Optional[str]:
+    """Header line of the block a value sits in, if any.
+
+    Walks back from the value's line to the first blank line; the nearest line
+    that ends with a colon and has nothing after it is the header.
+    """
+    line_start = text.rfind("\n", 0, start) + 1
+    while line_start > 0:
+        previous_start = text.rfind("\n", 0, line_start - 1) + 1
+        line = text[previous_start:line_start - 1]
+        if not line.strip():
+            return None
+        if _HEADER_RE.match(line):
+            return line
+        line_start = previous_start
+    return None
+
+
+def _is_projection(text: str, start: int) -> bool:
+    context = _line_before(text, start) + " " + (_section_header(text, start) or "")
+    return any(word in context.lower() for word in PROJECTION_WORDS)
+
+
+def _metric_name(text: str, row) -> str:
+    """Normalizer context, except that percentages are never an amount of money.
+
+    "Revenue grew 35%" is revenue growth; "30% sales and marketing" in a use
+    of funds list is just a percentage.
+    """
+    if row.unit != "decimal" or row.context not in MONEY_METRICS:
+        return row.context
+    sentence_start, sentence_end = _sentence_bounds(text, row.start, row.end)
+    sentence = text[sentence_start:sentence_end].lower()
+    signed = text[max(0, row.start - 1):row.start] == "+" or row.normalized.startswith("-")
+    return f"{row.context}_growth" if signed or _GROWTH_CUE_RE.search(sentence) else "percentage"
+
+
+def extract_metrics(text: str, source: str = "document") -> List[Metric]:
+    """Numeric rows of the normalization table as Metrics (dates are skipped)."""
+    metrics = []
+    for row in normalize_text(text)[0]:
+        if row.unit == "date":
+            continue
+        metrics.append(Metric(
+            name=_metric_name(text, row),
+            value=float(row.normalized),
+            unit=row.unit,
+            original=row.original,
+            source=source,
+            position=row.start,
+            projected=_is_projection(text, row.start)
+        ))
+    return metrics
+
+
+def _pairwise_relative_diff(values: Sequence[float]) -> List[Tuple[int, int, float]]:
+    """(i, j, |a-b| / max(|a|, |b|)) for every i < j."""
+    if np is not None:
+        array = np.asarray(values, dtype=float)
+        i, j = np.triu_indices(len(array), k=1)
+        base = np.maximum(np.abs(array[i]), np.abs(array[j]))
+        relative = np.abs(array[j] - array[i]) / np.where(base == 0, 1.0, base)
+        return list(zip(i.tolist(), j.tolist(), relative.tolist()))
+    pairs = []
+    for i in range(len(values)):
+        for j in range(i + 1, len(values)):
+            base = max(abs(values[i]), abs(values[j])) or 1.0
+            pairs.append((i, j, abs(values[j] - values[i]) / base))
+    return pairs
+
+
+def _cross_ratio(numerators: Sequence[float], denominators: Sequence[float]) -> List[Tuple[int, int, float]]:
+    """(i, j, numerators[i] / denominators[j]) for every pair with a non-zero denominator."""
+    if np is not None and numerators and denominators:
+        top = np.asarray(numerators, dtype=float)[:, None]
+        bottom = np.asarray(denominators, dtype=float)[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = top / bottom
+        i, j = np.nonzero(np.broadcast_to(bottom != 0, ratios.shape))
+        return list(zip(i.tolist(), j.tolist(), ratios[i, j].tolist()))
+    return [
+        (i, j, top / bottom)
+        for i, top in enumerate(numerators)
+        for j, bottom in enumerate(denominators) if bottom
+    ]
+
+
+def _fmt(value: float) -> str:
+    return f"{value:,.4f}".rstrip("0").rstrip(".")
+
+
+def _pct(value: float) -> str:
+    return f"{value * 100:+.1f}%"
+
+
+class MetricsEngine:
+    """Runs every deterministic check over metrics from one or more documents."""
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE):
+        self.tolerance = tolerance
+
+    def verify(self, documents: Dict[str, str]) -> Dict[str, Any]:
+        """documents: {source name: text}, oldest first. Returns calculations, contradictions and gaps."""
+        started = time.perf_counter()
+        metrics = [metric for source, text in documents.items() for metric in extract_metrics(text, source)]
+        by_name: Dict[str, List[Metric]] = {}
+        for metric in metrics:
+            by_name.setdefault(metric.name, []).append(metric)
+        reported = {
+            name: [metric for metric in group if not metric.projected] for name, group in by_name.items()
+        }
+
+        calculations: List[Dict[str, Any]] = []
+        insufficient: List[str] = []
+        calculations += self._runway(reported, insufficient)
+        calculations += self._growth(reported, documents)
+        calculations += self._ltv_cac(reported, insufficient)
+        calculations += self._mrr_arr(reported, insufficient)
+
+        return {
+            "metrics": [asdict(metric) for metric in metrics],
+            "calculations": calculations,
+            "consistency_checks": self._consistency(reported),
+            "insufficient_data": insufficient,
+            "numpy": np is not None,
+            "seconds": round(time.perf_counter() - started, 6)
+        }
+
+    def _runway(self, reported: Dict[str, List[Metric]], insufficient: List[str]) -> List[Dict[str, Any]]:
+        cash = reported.get("cash_position", [])
+        burn = [metric for metric in reported.get("monthly_burn", []) if metric.unit not in {"decimal"}]
+        stated = [metric for metric in reported.get("runway", []) if metric.unit in MONTHS_PER_UNIT]
+        results = []
+        if cash and burn:
+            for i, j, months in _cross_ratio([m.value for m in cash], [m.value for m in burn])[:MAX_ITEMS_PER_CHECK]:
+                if cash[i].unit != burn[j].unit:
+                    continue
+                result = {
+                    "type": "runway",
+                    "inputs": [cash[i].original, burn[j].original],
+                    "result": round(months, 2),
+                    "text": f"Runway: {_fmt(cash[i].value)} ÷ {_fmt(burn[j].value)} = {months:.1f} months"
+                }
+                for claim in stated:
+                    claimed_months = claim.value * MONTHS_PER_UNIT[claim.unit]
+                    difference = (months - claimed_months) / claimed_months if claimed_months else 0.0
+                    result["text"] += (
+                        f"; stated \"{claim.original}\" = {claimed_months:.1f} months → "
+                        + ("consistent" if abs(difference) <= self.tolerance else f"contradicted by math ({_pct(difference)})")
+                    )
+                results.append(result)
+        elif burn and stated:
+            insufficient.append("runway verification (no cash position stated)")
+            for claim in stated[:MAX_ITEMS_PER_CHECK]:
+                claimed_months = claim.value * MONTHS_PER_UNIT[claim.unit]
+                results.append({
+                    "type": "implied_cash",
+                    "inputs": [claim.original, burn[-1].original],
+                    "result": round(claimed_months * burn[-1].value, 2),
+                    "text": (
+                        f"Implied cash position: {claimed_months:.1f} months × {_fmt(burn[-1].value)} "
+                        f"= {_fmt(claimed_months * burn[-1].value)} ({burn[-1].unit})"
+                    )
+                })
+        else:
+            insufficient.append("runway (needs cash position and monthly burn)")
+        return results
+
+    def _growth(self, reported: Dict[str, List[Metric]], documents: Dict[str, str]) -> List[Dict[str, Any]]:
+        # Documents are taken to be in chronological order, as are values within one
+        order = {source: index for index, source in enumerate(documents)}
+        results = []
+        for name in sorted(GROWTH_METRICS & set(reported)):
+            series = sorted(reported[name], key=lambda metric: (order[metric.source], metric.position))
+            for earlier, later in zip(series, series[1:]):
+                if earlier.unit != later.unit:
+                    continue
+                old, new = earlier, later
+                # "2.1% (down from 4.3%)": the value after "from" is the older one
+                text = documents[later.source]
+                if earlier.source == later.source and "from" in text[max(0, later.position - 12):later.position].lower():
+                    old, new = later, earlier
+                if not old.value:
+                    continue
+                growth = (new.value - old.value) / old.value
+                results.append({
+                    "type": "growth",
+                    "metric": name,
+                    "inputs": [old.original, new.original],
+                    "result": round(growth, 4),
+                    "text": (
+                        f"Growth ({name}): ({_fmt(new.value)} - {_fmt(old.value)}) ÷ {_fmt(old.value)} "
+                        f"= {growth:.4f} ({_pct(growth)})"
+                    )
+                })
+        return results[:MAX_ITEMS_PER_CHECK]
+
+    def _ltv_cac(self, reported: Dict[str, List[Metric]], insufficient: List[str]) -> List[Dict[str, Any]]:
+        if not (reported.get("ltv") and reported.get("cac")):
+            insufficient.append("LTV:CAC ratio (needs both LTV and CAC)")
+            return []
+        # Only amounts of money: "24-month" lifetimes and bare counts are not an LTV
+        ltv = [metric for metric in reported.get("ltv", []) if metric.unit in CURRENCY_UNITS]
+        cac = [metric for metric in reported.get("cac", []) if metric.unit in CURRENCY_UNITS]
+        results = []
+        for i, j, ratio in _cross_ratio([m.value for m in ltv], [m.value for m in cac]):
+            if ltv[i].unit != cac[j].unit:
+                continue
+            if len(results) == MAX_ITEMS_PER_CHECK:
+                break
+            results.append({
+                "type": "ltv_cac",
+                "inputs": [ltv[i].original, cac[j].original],
+                "result": round(ratio, 2),
+                "text": f"LTV:CAC: {_fmt(ltv[i].value)} ÷ {_fmt(cac[j].value)} = {ratio:.2f}:1"
+            })
+        if not results:
+            insufficient.append("LTV:CAC ratio (needs LTV and CAC in the same currency)")
+        return results
+
+    def _mrr_arr(self, reported: Dict[str, List[Metric]], insufficient: List[str]) -> List[Dict[str, Any]]:
+        mrr, arr = reported.get("mrr", []), reported.get("arr", [])
+        if not mrr:
+            insufficient.append("ARR check (no MRR stated)")
+            return []
+        if not arr:
+            latest = mrr[-1]  # metrics are in document order, then text order
+            return [{
+                "type": "implied_arr",
+                "inputs": [latest.original],
+                "result": latest.value * 12,
+                "text": f"Revenue validation: {_fmt(latest.value)} × 12 = {_fmt(latest.value * 12)} implied ARR (no ARR stated)"
+            }]
+        results = []
+        # arr / (mrr × 12) - 1 is the relative gap for every (MRR, ARR) pair
+        for j, i, ratio in _cross_ratio([m.value for m in arr], [m.value * 12 for m in mrr])[:MAX_ITEMS_PER_CHECK]:
+            gap = ratio - 1
+            results.append({
+                "type": "mrr_arr",
+                "inputs": [mrr[i].original, arr[j].original],
+                "result": round(mrr[i].value * 12, 2),
+                "text": (
+                    f"Revenue validation: {_fmt(mrr[i].value)} × 12 = {_fmt(mrr[i].value * 12)} vs stated ARR "
+                    f"{_fmt(arr[j].value)} → "
+                    + ("consistent" if abs(gap) <= self.tolerance else f"contradiction ({_pct(gap)})")
+                )
+            })
+        return results
+
+    def _consistency(self, reported: Dict[str, List[Metric]]) -> List[Dict[str, Any]]:
+        checks = []
+        for name in sorted(CONSISTENCY_METRICS & set(reported)):
+            group = reported[name]
+            for i, j, relative in _pairwise_relative_diff([metric.value for metric in group]):
+                first, second = group[i], group[j]
+                if relative <= self.tolerance or first.unit != second.unit:
+                    continue
+                checks.append({
+                    "metric": name,
+                    "values": [first.value, second.value],
+                    "originals": [first.original, second.original],
+                    "sources": [first.source, second.source],
+                    "relative_difference": round(relative, 4)
+                })
+        checks.sort(key=lambda check: -check["relative_difference"])
+        return checks[:MAX_ITEMS_PER_CHECK]
+
+
+def format_verification_block(result: Dict[str, Any]) -> str:
+    """Render engine output for the agent prompt, in the fact-check output vocabulary."""
+    lines = ["**PRECOMPUTED_CALCULATIONS (deterministic; use as-is, do not recompute):**"]
+    lines += [f"- {calculation['text']}" for calculation in result["calculations"]] or ["- None"]
+    lines += [f"- Insufficient data for {gap}" for gap in result["insufficient_data"]]
+    lines.append("")
+    lines.append("**PRECOMPUTED_CONSISTENCY_CHECKS:**")
+    if not result["consistency_checks"]:
+        lines.append("- No conflicting values found")
+    for check in result["consistency_checks"]:
+        first, second = check["originals"]
+        where = "" if check["sources"][0] == check["sources"][1] else f" ({check['sources'][0]} vs {check['sources'][1]})"
+        lines.append(f"- \"{first}\" vs \"{second}\"{where}")
+        lines.append(
+            f"  Normalized comparison ({check['metric']}): {_fmt(check['values'][0])} vs "
+            f"{_fmt(check['values'][1])} = {check['relative_difference'] * 100:.1f}% apart"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Excerpts of the founder emails from the document_ingestor.py example
+    february = """
+- Revenue: $38K MRR (up 12% from January)
+- Burn rate: $45K/month
+- Runway: 16 months remaining
+- New customers: 23 this month
+- Team size now 15 people
+"""
+    march = """
+- January CAC: $145
+- February CAC: $189 (+30%)
+- March revenue target: $42K MRR
+- Revenue: $41K MRR (hit target early!)
+- Churn rate: Only 2.1% (down from 4.3%)
+- Engineering team now 8 people
+"""
+    result = MetricsEngine().verify({"email_1": february, "email_3": march})
+    print(format_verification_block(result))
+    print(f"\n⏱️ {len(result['metrics'])} metrics checked in {result['seconds'] * 1e6:.0f}µs "
+          f"({'numpy' if result['numpy'] else 'pure Python'})")
@@ -0,0 +1,400 @@
+"""
+normalizer.py — Rule-based number normalization for fact-checking
+• Converts currency, magnitudes, percentages, durations and number words to
+  precise values ("$30K" → 30000 (USD), "50%" → 0.5 (decimal))
+• Produces the same NORMALIZATION TABLE format as Normalization_Agent, locally
+• Spans it cannot parse (ranges, fractions, odd formats) are returned so only
+  those need an LLM pass
+
+Golden examples (including the Normalization_Agent instruction examples) live
+in tests/golden/normalizer; run them with `python -m pytest tests`.
+"""
+
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+TABLE_HEADER = "**NORMALIZATION TABLE:**\nORIGINAL → NORMALIZED → CONTEXT"
+
+CURRENCY_SYMBOLS = {"$": "USD", "US$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+CURRENCY_WORDS = {
+    "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "eur": "EUR", "euro": "EUR", "euros": "EUR",
+    "gbp": "GBP", "pounds": "GBP",
+    "inr": "INR", "rs": "INR", "rs.": "INR", "rupees": "INR"
+}
+SCALES = {
+    "k": 10 ** 3, "thousand": 10 ** 3,
+    "m": 10 ** 6, "mm": 10 ** 6, "mn": 10 ** 6, "million": 10 ** 6,
+    "b": 10 ** 9, "bn": 10 ** 9, "billion": 10 ** 9,
+    "t": 10 ** 12, "tn": 10 ** 12, "trillion": 10 ** 12,
+    "lakh": 10 ** 5, "lakhs": 10 ** 5, "lac": 10 ** 5, "lacs": 10 ** 5,
+    "crore": 10 ** 7, "crores": 10 ** 7, "cr": 10 ** 7
+}
+DURATIONS = {
+    "day": "days", "days": "days",
+    "week": "weeks", "weeks": "weeks",
+    "month": "months", "months": "months", "mo": "months", "mos": "months",
+    "year": "years", "years": "years", "yr": "years", "yrs": "years"
+}
+
+UNITS = {"zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+         "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+         "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+         "nineteen": 19}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70,
+        "eighty": 80, "ninety": 90}
+WORD_SCALES = {"hundred": 100, "thousand": 10 ** 3, "million": 10 ** 6, "billion": 10 ** 9,
+               "trillion": 10 ** 12}
+
+# Keyword phrases (1-3 words, "|"-separated) → context; the nearest one wins
+CONTEXT_KEYWORDS = [
+    ("runway", "runway"),
+    ("burn|burn rate|burning", "monthly_burn"),
+    ("mrr|monthly recurring revenue", "mrr"),
+    ("arr|annual recurring revenue|run rate|run-rate", "arr"),
+    ("cac|acquisition cost", "cac"),
+    ("ltv|lifetime value", "ltv"),
+    ("churn", "churn_rate"),
+    ("margin|margins", "gross_margin"),
+    ("conversion", "conversion_rate"),
+    ("growth|grew|growing|grow|increase|increased|increases|up", "growth_rate"),
+    ("revenue|revenues|sales|turnover|bookings", "revenue"),
+    ("users|customers|clients|subscribers|downloads|members|accounts|signups", "customers"),
+    ("valuation|valued", "valuation"),
+    ("raised|raising|funding|round|seed|series a|series b|series c|series d|investment", "funding"),
+    ("cash|bank", "cash_position"),
+    ("market|tam|sam|som", "market_size"),
+    ("employees|team|headcount|staff|engineers|founders", "headcount"),
+    ("price|prices|priced|pricing|per seat|subscription", "price"),
+    ("profit|profits|ebitda|net income", "profit"),
+    ("loss|losses", "loss"),
+    ("cost|costs|expense|expenses|spend|opex", "costs"),
+]
+KEYWORD_CONTEXTS = {
+    phrase: context for phrases, context in CONTEXT_KEYWORDS for phrase in phrases.split("|")
+}
+_MAX_KEYWORD_WORDS = max(len(phrase.split()) for phrase in KEYWORD_CONTEXTS)
+_PHRASE_FIRST_WORDS = {phrase.split()[0] for phrase in KEYWORD_CONTEXTS if " " in phrase}
+
+# Words that are never pulled into the ORIGINAL span as the trailing noun
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "from", "by", "with",
+    "per", "is", "are", "was", "were", "be", "been", "as", "than", "over", "under", "into",
+    "this", "that", "these", "those", "it", "its", "our", "their", "we", "they", "which",
+    "while", "but", "so", "if", "since", "after", "before", "within", "across", "each", "every"
+}
+
+_NUMBER = r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|\.\d+"
+_TAIL = r"""
+    (?:(?P<suffix>[kKmMbBtT]|bn|Bn|BN|mn|Mn|MM|mm|tn|cr|Cr)(?![A-Za-z])
+      |\s?(?P<scale>thousand|million|billion|trillion|lakhs?|lacs?|crores?)\b)?
+    (?P<percent>\s?%|\s(?:percent|per\s?cent|pct)\b)?
+    (?P<multiple>x\b)?
+    (?:[\s-]?(?P<duration>days?|weeks?|months?|mos?|years?|yrs?)\b)?
+    (?:\s(?P<currency_word>USD|EUR|GBP|INR|dollars?|euros?|pounds|rupees)\b)?
+"""
+NUMBER_RE = re.compile(
+    rf"""
+    (?:(?<![^\s(\[])(?P<sign>[-−]))?
+    (?<![A-Za-z0-9:.])
+    (?P<currency>US\$|\$|€|£|₹|(?:USD|EUR|GBP|INR|Rs\.?)\s?)?
+    (?P<number>{_NUMBER})
+    {_TAIL}
+    """,
+    re.VERBOSE
+)
+WORD_TAIL_RE = re.compile(_TAIL, re.VERBOSE)
+# Spans kept as-is: fiscal quarters/halves and calendar dates
+DATE_RE = re.compile(
+    r"\b(?:(?:Q[1-4]|H[12])\s?(?:FY\s?)?'?\d{2,4}|FY\s?'?\d{2,4}"
+    r"|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4})\b"
+)
+# Ranges, fractions, N:M ratios and clock times go to the LLM fallback
+AMBIGUOUS_RE = re.compile(
+    r"(?:[$€£₹])?\d[\d.,]*\s?(?:[kKmMbB]|bn|mn)?\s?[-–]\s?[$€£₹]?\d[\d.,]*"
+    r"(?:\s?(?:[kKmMbB]|bn|mn|%)(?![A-Za-z])|\s(?:thousand|million|billion))?"
+    r"|\b\d+/\d+\b"
+    r"|\b\d{1,2}(?::\d{2})?\s?(?:[AaPp]\.?[Mm]\.?)(?![A-Za-z])"
+    r"|\b\d+(?:\.\d+)?:\d+(?:\.\d+)?\b"
+)
+YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+NUMBER_WORDS = set(UNITS) | set(TENS) | set(WORD_SCALES)
+_WORD_RE = re.compile(r"[A-Za-z]+(?:-[A-Za-z]+)*")
+_DIGIT_TOKEN_RE = re.compile(r"[^\s]*\d[^\s]*")
+_TRAILING_WORD_RE = re.compile(r"[ \t]+([A-Za-z][A-Za-z-]*)")
+_AND_RE = re.compile(r"\band\b")
+
+
+@dataclass(frozen=True)
+class NormalizedValue:
+    """One row of the normalization table."""
+    original: str
+    normalized: str
+    unit: str
+    context: str
+    start: int
+    end: int
+
+    def table_row(self) -> str:
+        return f'"{self.original}" → {self.normalized} ({self.unit}) → {self.context}'
+
+
+def format_decimal(value: Decimal) -> str:
+    """Plain notation without trailing zeros: 2500000, 0.5, 0.125."""
+    text = format(value.normalize(), "f")
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+def parse_number_words(words: str) -> Optional[int]:
+    """'three hundred thousand' → 300000, 'twenty-five' → 25, 'a million' → 1000000."""
+    tokens = [token for token in re.split(r"[\s-]+", words.lower()) if token and token != "and"]
+    if not tokens:
+        return None
+    if tokens[0] == "a":
+        tokens = tokens[1:]
+        if not tokens or tokens[0] not in WORD_SCALES:
+            return None
+        tokens = ["one"] + tokens
+    total, current = 0, 0
+    for token in tokens:
+        if token in UNITS:
+            current += UNITS[token]
+        elif token in TENS:
+            current += TENS[token]
+        elif token == "hundred":
+            current = (current or 1) * 100
+        elif token in WORD_SCALES:
+            total += (current or 1) * WORD_SCALES[token]
+            current = 0
+        else:
+            return None
+    return total + current
+
+
+def _sentence_bounds(text: str, start: int, end: int) -> Tuple[int, int]:
+    left = max(text.rfind(mark, 0, start) for mark in (". ", "; ", "\n", "! ", "? "))
+    rights = [pos for pos in (text.find(mark, end) for mark in (". ", "; ", "\n", "! ", "? ")) if pos != -1]
+    return (left + 1 if left != -1 else 0), (min(rights) if rights else len(text))
+
+
+def _find_context(text: str, keywords: List[Tuple[int, int, str]], start: int, number_end: int,
+                  end: int, unit: str) -> str:
+    """Context label from the nearest keyword in the same sentence.
+
+    Keywords after the number ("$2.5M revenue", "$140K monthly burn") beat
+    ones before it, and keywords across a comma are penalised so
+    "MRR is $85K, up 50%" keeps $85K as mrr (likewise across "and").
+    """
+    left, right = _sentence_bounds(text, start, end)
+    window_start, window_end = max(left, start - 60), min(right, end + 40)
+    best = None
+    for keyword_start, keyword_end, context in keywords:
+        if keyword_start < window_start or keyword_end > window_end:
+            continue
+        if keyword_start >= number_end:
+            gap = text[number_end:keyword_start]
+            distance = len(gap)
+        elif keyword_end <= start:
+            gap = text[keyword_end:start]
+            distance = 2 * len(gap)
+        else:
+            continue
+        distance += 40 * (gap.count(",") + len(_AND_RE.findall(gap)))
+        if best is None or distance < best[0]:
+            best = (distance, context)
+    if best:
+        return best[1]
+    if unit == "decimal":
+        return "percentage"
+    if unit in DURATIONS.values():
+        return "duration"
+    return "general"
+
+
+def _trailing_noun(text: str, end: int) -> Optional[Tuple[str, int]]:
+    """The word right after a number ("30K users"), unless it is a stopword."""
+    match = _TRAILING_WORD_RE.match(text, end)
+    if not match or match.group(1).lower() in STOPWORDS:
+        return None
+    return match.group(1), match.end()
+
+
+def _build_value(text: str, keywords: List[Tuple[int, int, str]], start: int, end: int, value: Decimal,
+                 tail: "re.Match", currency: Optional[str]) -> NormalizedValue:
+    scale = tail.group("suffix") or tail.group("scale")
+    if scale:
+        value *= SCALES[scale.lower()]
+    currency_word = tail.group("currency_word")
+    if currency_word:
+        currency = CURRENCY_WORDS[currency_word.lower()]
+
+    if tail.group("percent"):
+        value /= 100
+        unit = "decimal"
+    elif currency:
+        unit = currency
+    elif tail.group("duration"):
+        unit = DURATIONS[tail.group("duration").lower()]
+    elif tail.group("multiple"):
+        unit = "x"
+    else:
+        unit = None
+
+    original_end = end
+    noun = _trailing_noun(text, end)
+    if noun:
+        if unit is None:
+            unit = noun[0].lower()
+        original_end = noun[1]
+    unit = unit or "number"
+
+    return NormalizedValue(
+        original=text[start:original_end],
+        normalized=format_decimal(value),
+        unit=unit,
+        context=_find_context(text, keywords, start, end, original_end, unit),
+        start=start,
+        end=original_end
+    )
+
+
+def _joined_by_space(text: str, end: int, next_start: int) -> bool:
+    return next_start > end and text[end:next_start].isspace()
+
+
+def _find_keywords(text: str, words: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    """(start, end, context) for every keyword phrase, longest phrase first."""
+    keywords = []
+    index = 0
+    while index < len(words):
+        longest = _MAX_KEYWORD_WORDS if words[index][2] in _PHRASE_FIRST_WORDS else 1
+        for size in range(min(longest, len(words) - index), 0, -1):
+            span = words[index:index + size]
+            if size > 1 and not all(
+                _joined_by_space(text, span[i][1], span[i + 1][0]) for i in range(size - 1)
+            ):
+                continue
+            context = KEYWORD_CONTEXTS.get(" ".join(word for _, _, word in span))
+            if context:
+                keywords.append((span[0][0], span[-1][1], context))
+                index += size
+                break
+        else:
+            index += 1
+    return keywords
+
+
+def _is_number_word(word: str) -> bool:
+    return all(part in NUMBER_WORDS for part in word.split("-"))
+
+
+def _number_word_runs(text: str, words: List[Tuple[int, int, str]]) -> List[Tuple[int, int]]:
+    """Spans of spelled-out numbers ("three hundred thousand", "a million", "twenty-five")."""
+    runs = []
+    index = 0
+    while index < len(words):
+        start, end, word = words[index]
+        following = words[index + 1] if index + 1 < len(words) else None
+        leading_a = (word == "a" and following and following[2] in WORD_SCALES
+                     and _joined_by_space(text, end, following[0]))
+        if not (_is_number_word(word) or leading_a):
+            index += 1
+            continue
+        last = index
+        while last + 1 < len(words) and _joined_by_space(text, words[last][1], words[last + 1][0]):
+            candidate = words[last + 1][2]
+            if _is_number_word(candidate) or (leading_a and last == index):
+                last += 1
+            elif (candidate == "and" and last + 2 < len(words) and _is_number_word(words[last + 2][2])
+                  and _joined_by_space(text, words[last + 1][1], words[last + 2][0])):
+                last += 2
+            else:
+                break
+        # A lone "one" is almost always a pronoun ("one of the ...")
+        if not (last == index and word == "one"):
+            runs.append((start, words[last][1]))
+        index = last + 1
+    return runs
+
+
+def normalize_text(text: str) -> Tuple[List[NormalizedValue], List[str]]:
+    """
+    Normalize every numeric span in text.
+
+    Returns (rows in text order, unparsed spans). Dates/quarters become rows
+    kept as-is; plain calendar years are left out like the LLM table does.
+    """
+    rows: List[NormalizedValue] = []
+    words = [(match.start(), match.end(), match.group(0).lower()) for match in _WORD_RE.finditer(text)]
+    keywords = _find_keywords(text, words)
+    unparsed: List[str] = []
+    consumed: List[Tuple[int, int]] = []
+
+    def free(start: int, end: int) -> bool:
+        return all(end <= used_start or start >= used_end for used_start, used_end in consumed)
+
+    for match in DATE_RE.finditer(text):
+        consumed.append(match.span())
+        rows.append(NormalizedValue(match.group(0), match.group(0), "date", "date_reference",
+                                    match.start(), match.end()))
+
+    for match in AMBIGUOUS_RE.finditer(text):
+        if free(*match.span()):
+            consumed.append(match.span())
+            unparsed.append(match.group(0))
+
+    for match in NUMBER_RE.finditer(text):
+        if not free(*match.span()):
+            continue
+        number = match.group("number")
+        has_unit = any(match.group(name) for name in
+                       ("currency", "suffix", "scale", "percent", "multiple", "duration", "currency_word"))
+        if not has_unit and YEAR_RE.fullmatch(number):
+            consumed.append(match.span())
+            continue
+        currency_prefix = (match.group("currency") or "").strip()
+        currency = CURRENCY_SYMBOLS.get(currency_prefix) or CURRENCY_WORDS.get(currency_prefix.lower())
+        value = Decimal(number.replace(",", ""))
+        if match.group("sign"):
+            value = -value
+        row = _build_value(text, keywords, match.start(), match.end(), value, match, currency)
+        consumed.append((row.start, row.end))
+        rows.append(row)
+
+    for start, end in _number_word_runs(text, words):
+        if not free(start, end):
+            continue
+        value = parse_number_words(text[start:end])
+        if value is None:
+            unparsed.append(text[start:end])
+            consumed.append((start, end))
+            continue
+        tail = WORD_TAIL_RE.match(text, end)
+        row = _build_value(text, keywords, start, tail.end(), Decimal(value), tail, None)
+        consumed.append((row.start, row.end))
+        rows.append(row)
+
+    for match in _DIGIT_TOKEN_RE.finditer(text):
+        token = match.group(0).strip(".,;:()")
+        # Identifiers like "Q1", "v2.0" or "B2B" are names, not values
+        if free(*match.span()) and not token[:1].isalpha():
+            unparsed.append(token)
+
+    rows.sort(key=lambda row: row.start)
+    return rows, unparsed
+
+
+def format_normalization_table(rows: List[str]) -> str:
+    """Render table rows (already formatted) under the standard header."""
+    return "\n".join([TABLE_HEADER] + rows) if rows else TABLE_HEADER + "\n(no numeric values found)"
+
+
+def parse_table_rows(table_text: str) -> List[str]:
+    """Row lines from an LLM-produced normalization table."""
+    return [
+        line.strip() for line in table_text.splitlines()
+        if line.strip().startswith('"') and line.count("→") >= 2
+    ]
+
@@ -0,0 +1,126 @@
+"""
+prompt_registry.py — Versioned prompt templates with a reusable instruction prefix
+• Templates from prompts.py are registered once at import and versioned by content hash
+• Each template is split into static instructions (sent as the system instruction,
+  identical across calls so Gemini can reuse the cached prefix) and a payload
+  (the per-call document, email, transcript or page text)
+• Token counts per template are available for budgeting and monitoring
+"""
+
+from functools import cached_property, lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from prompts import (Multimodal_analysis_prompt, Multimodal_batch_prompt, call_analysis_prompt,
+                     document_chunk_summary_prompt, document_summary_prompt, email_analysis_prompt,
+                     pdf_analysis_prompt)
+from result_cache import make_cache_key
+from token_counter import count_tokens
+
+
+class PromptTemplate:
+    """
+    A prompt template split into instructions and payload.
+
+    Lines that reference a payload field (and a heading just above one) move
+    to the user message; every other line stays in the instructions.
+    Instruction fields (like doc_type) take few distinct values, so each
+    rendered instruction text is reused across calls.
+    """
+
+    def __init__(self, name: str, template: str, payload_fields: Tuple[str, ...]):
+        self.name = name
+        self.template = template
+        self.payload_fields = payload_fields
+        self.fields = tuple(dict.fromkeys(
+            field for _, field, _, _ in Formatter().parse(template) if field
+        ))
+        unknown = set(payload_fields) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Prompt '{name}' has no fields {sorted(unknown)}")
+        self.instruction_fields = tuple(field for field in self.fields if field not in payload_fields)
+
+        instruction_lines, payload_lines = [], []
+        previous_in_payload = False
+        for line in template.strip("\n").split("\n"):
+            if any(f"{{{field}}}" in line for field in payload_fields):
+                # A heading introducing a payload line (e.g. "**RAW EMAIL CONTENT:**") moves with it
+                if not previous_in_payload and instruction_lines and instruction_lines[-1].rstrip("*").endswith(":"):
+                    payload_lines.append(instruction_lines.pop())
+                payload_lines.append(line)
+                previous_in_payload = True
+            else:
+                instruction_lines.append(line)
+                previous_in_payload = False
+        self.instructions = "\n".join(instruction_lines).strip()
+        self.payload_template = "\n".join(payload_lines)
+        self.version = make_cache_key("prompt", name, template, *payload_fields)[:16]
+        self._render_instructions = lru_cache(maxsize=64)(self._format_instructions)
+
+    def _format_instructions(self, *values: str) -> str:
+        return self.instructions.format(**dict(zip(self.instruction_fields, values)))
+
+    def render(self, **values: Any) -> str:
+        """The whole template as one prompt string."""
+        return self.template.format(**values)
+
+    def system_text(self, **values: Any) -> str:
+        return self._render_instructions(*(str(values[field]) for field in self.instruction_fields))
+
+    def payload_text(self, **values: Any) -> str:
+        return self.payload_template.format(**values)
+
+    def messages(self, extra_content: List[Dict[str, Any]] = None, **values: Any) -> List[BaseMessage]:
+        """System instruction + user payload; extra_content (e.g. images) is appended to the payload."""
+        payload = self.payload_text(**values)
+        content = [{"type": "text", "text": payload}, *extra_content] if extra_content else payload
+        return [SystemMessage(content=self.system_text(**values)), HumanMessage(content=content)]
+
+    @cached_property
+    def template_tokens(self) -> int:
+        return count_tokens(self.template)
+
+    @cached_property
+    def instruction_tokens(self) -> int:
+        return count_tokens(self.instructions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "payload_fields": list(self.payload_fields),
+            "instruction_fields": list(self.instruction_fields),
+            "template_tokens": self.template_tokens,
+            "instruction_tokens": self.instruction_tokens,
+            "instruction_share": round(self.instruction_tokens / self.template_tokens, 3) if self.template_tokens else 0.0
+        }
+
+
+PROMPTS: Dict[str, PromptTemplate] = {
+    prompt.name: prompt for prompt in (
+        PromptTemplate("pdf_analysis", pdf_analysis_prompt, ("pdf_text",)),
+        PromptTemplate("email_analysis", email_analysis_prompt, ("raw_email_text",)),
+        PromptTemplate("call_analysis", call_analysis_prompt, ("raw_transcript",)),
+        PromptTemplate("page_analysis", Multimodal_analysis_prompt, ("page_number", "page_text")),
+        # Appended to the page_analysis instructions when several pages share a request
+        PromptTemplate("page_batch_analysis", Multimodal_batch_prompt, ()),
+        PromptTemplate("document_summary", document_summary_prompt, ("combined_analysis",)),
+        PromptTemplate("document_chunk_summary", document_chunk_summary_prompt, ("page_range", "combined_analysis")),
+    )
+}
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    return PROMPTS[name]
+
+
+def prompt_stats() -> List[Dict[str, Any]]:
+    """Version and token counts of every registered template."""
+    return [prompt.stats() for prompt in PROMPTS.values()]
+
+
+if __name__ == "__main__":
+    for stats in prompt_stats():
+        print(f"{stats['name']:<24} v{stats['version']}  {stats['template_tokens']:>6} tokens, "
+              f"{stats['instruction_tokens']:>6} in reusable instructions ({stats['instruction_share']:.0%})")
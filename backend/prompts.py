@@ -541,7 +541,7 @@ You are a call transcript information extraction agent. Your role is to thorough
 
 
 Multimodal_analysis_prompt = """
-You are a document information extraction agent. Extract and organize all relevant data from page {page_number} of this document. DO NOT provide opinions, recommendations, or evaluations.
+You are a document information extraction agent. Extract and organize all relevant data from the document page provided. DO NOT provide opinions, recommendations, or evaluations.
 
 **PAGE {page_number} TEXT CONTENT:**
 {page_text}
@@ -611,4 +611,124 @@ You are a document information extraction agent. Extract and organize all releva
 """
 
 
+document_summary_prompt = """
+    You are a comprehensive data extraction and collation agent. Your task is to compile ALL data points, numbers, text, and visual information from this {doc_type} document into a structured format for downstream analysis agents.
+
+DOCUMENT TYPE: {doc_type}
+
+EXTRACTED PAGE DATA:
+{combined_analysis}
+
+**COMPREHENSIVE DATA COLLATION REQUIREMENTS:**
+
+**1. COMPLETE NUMERICAL DATA EXTRACTION:**
+Extract and organize EVERY number mentioned or shown in charts/graphs:
+- Revenue figures (historical, current, projected) with exact amounts and time periods
+- Growth rates and percentages from all charts and graphs
+- Market size data (TAM, SAM, SOM) with sources and methodology
+- Customer metrics (acquisition numbers, retention rates, churn percentages)
+- Financial ratios (CAC, LTV, burn rate, runway) with exact calculations
+- Team size numbers and hiring projections
+- Funding amounts (raised, seeking, valuation) with round details
+- Timeline data (dates, milestones, deadlines)
+- Performance metrics (KPIs, conversion rates, usage statistics)
+
+**2. COMPLETE TEXTUAL DATA EXTRACTION:**
+Transcribe and organize ALL text content:
+- Company name, legal structure, location, contact information
+- Product/service descriptions and feature lists
+- Target market definitions and customer segments
+- Value propositions and competitive advantages
+- Business model and revenue streams
+- Partnership details and strategic relationships
+- Regulatory or compliance information
+- Technology stack and operational details
+
+**3. VISUAL ELEMENTS DATA EXTRACTION:**
+Extract ALL data from visual elements:
+- Chart types (bar, line, pie, etc.) with all data points
+- Graph axes labels, legends, units, and scales
+- Table contents with all rows and columns
+- Infographic data and statistics
+- Timeline visualizations with events and dates
+- Organizational charts with names and reporting structure
+- Product screenshots with feature callouts
+- Customer logos and testimonial quotes
+
+**4. TEAM AND ORGANIZATION DATA:**
+Complete roster of all people mentioned:
+- Names, titles, and roles
+- Educational backgrounds and institutions
+- Previous work experience and companies
+- Years of experience in relevant fields
+- Advisory board and board members
+- Organizational structure and reporting lines
+
+**5. COMPETITIVE AND MARKET DATA:**
+All market and competition information:
+- Competitor names and positioning
+- Market trends and growth data
+- Customer pain points and solution fit
+- Pricing comparisons and strategies
+- Market share data and penetration rates
+
+**6. OPERATIONAL AND BUSINESS DATA:**
+All business operations information:
+- Revenue models and pricing structures
+- Sales processes and conversion funnels
+- Cost structures and unit economics
+- Partnership agreements and terms
+- Geographic presence and expansion plans
+- Regulatory approvals and compliance status
+
+
+**CRITICAL REQUIREMENTS:**
+- Extract EVERY single number, percentage, and data point
+- Preserve exact wording and figures as presented
+- Note the source (slide number, chart title) for each data point  
+- Include units, currencies, and time periods for all numerical data
+- Distinguish between historical data and projections
+- Capture visual data that text extraction might miss
+- Organize data for easy consumption by downstream analysis agents
+
+**DO NOT:**
+- Provide opinions, analysis, or recommendations
+- Make calculations or derive new metrics
+- Interpret or evaluate the data quality
+- Add subjective assessments
+
+**OUTPUT:** Complete structured data compilation ready for specialized analysis agents to process specific aspects of the investment opportunity.
+"""
+
+document_chunk_summary_prompt = """
+You are a data extraction agent condensing one section of a larger {doc_type} document. Your output will be merged with the other sections' outputs before the final data collation, so nothing you drop can be recovered later.
+
+DOCUMENT TYPE: {doc_type}
+SECTION: pages {page_range}
 
+EXTRACTED PAGE DATA:
+{combined_analysis}
+
+**REQUIREMENTS:**
+- Keep EVERY number, percentage, currency amount, date and time period exactly as written
+- Keep the source page number next to each data point (e.g. "(p. 4)")
+- Keep names of people, companies, products, partners and investors
+- Keep chart and table data points, axis labels and units
+- Mark projections as projections and historical figures as historical
+- Remove repetition, filler and formatting only
+
+**DO NOT:**
+- Provide opinions, analysis, or recommendations
+- Make calculations or derive new metrics
+- Merge figures that differ between pages; list both with their pages
+
+**OUTPUT:** A compact, structured list of every data point in this section, grouped by topic (financials, customers, market, team, product, funding, other).
+"""
+
+Multimodal_batch_prompt = """
+**MULTIPLE PAGES IN ONE REQUEST:**
+The user message contains several consecutive pages. Each page starts with its "**PAGE <n> TEXT CONTENT:**" heading, followed by that page's images (if any).
+- Apply every requirement above to each page separately; do not merge data across pages
+- Start each page's analysis with a line containing only "=== PAGE <n> ===" (for example "=== PAGE 3 ===")
+- Cover every page in the order given; if a page has no data, write "No extractable data" under its marker
+"""
@@ -0,0 +1,141 @@
+"""
+result_cache.py — Content-addressed cache for analysis results
+• Keys are SHA-256 digests of the model name, prompt and input bytes/text
+• Entries persist in a local SQLite file and survive restarts
+• Size-bounded: least-recently-used entries are evicted past max_bytes
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "analysis_cache.sqlite3")
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def make_cache_key(*parts: Union[str, bytes, None]) -> str:
+    """Hash an ordered list of key parts into a single hex digest."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            part = b""
+        elif isinstance(part, str):
+            part = part.encode("utf-8")
+        # Length-prefix every part so ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Persistent LRU cache of JSON-serializable analysis results."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting old entries if over budget."""
+        payload = json.dumps(value)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            if previous:
+                self._total_bytes -= previous[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now)
+            )
+            self._total_bytes += size
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        """Drop least-recently-used entries until the cache fits max_bytes."""
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM results ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._total_bytes = 0
+                break
+            self._conn.execute("DELETE FROM results WHERE key = ?", (row[0],))
+            self._total_bytes -= row[1]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+@lru_cache(maxsize=None)
+def default_result_cache() -> Optional[ResultCache]:
+    """Shared process-wide cache built from environment settings (None when disabled)."""
+    if os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() in {"0", "false", "no"}:
+        return None
+    return ResultCache(
+        path=os.getenv("ANALYSIS_CACHE_PATH", DEFAULT_CACHE_PATH),
+        max_bytes=int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(DEFAULT_CACHE_MAX_BYTES)))
+    )
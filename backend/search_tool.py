@@ -0,0 +1,297 @@
+"""
+search_tool.py — Cached, quota-enforced web search tool for FactCheck_Agent
+• Queries are normalized (case, punctuation, stopwords) before lookup
+• Results are cached with a TTL in the shared analysis cache (survives restarts),
+  or in a bounded in-memory LRU without one
+• Near-duplicate queries reuse an earlier result instead of searching again,
+  unless they differ in a name or a number
+• A hard per-session quota is enforced in code, not only in the prompt
+• Backends are pluggable: Gemini with Google Search grounding, or a local stub
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from cassette import Cassette, default_cassette
+from google.adk.tools import FunctionTool, ToolContext
+from result_cache import ResultCache, default_result_cache, make_cache_key
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "gemini")  # gemini or stub
+SEARCH_MODEL = os.getenv("SEARCH_MODEL", "gemini-2.0-flash")
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+SEARCH_QUOTA_PER_SESSION = int(os.getenv("SEARCH_QUOTA_PER_SESSION", "10"))
+SEARCH_SIMILARITY_THRESHOLD = float(os.getenv("SEARCH_SIMILARITY_THRESHOLD", "0.75"))
+SEARCH_STUB_PATH = os.getenv("SEARCH_STUB_PATH")
+
+SEARCH_COUNT_STATE_KEY = "web_search_count"
+MAX_RECENT_QUERIES = 2000
+# Results kept in memory when no persistent cache is configured
+MAX_MEMORY_RESULTS = 500
+
+QUERY_STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "and", "or", "to", "by", "with", "is", "are", "was",
+    "what", "which", "who", "how", "does", "do", "did", "about", "from", "at", "as", "its", "vs"
+}
+
+
+_QUERY_TOKEN_RE = re.compile(r"[A-Za-z0-9$%.]+")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form: lowercase, no punctuation/stopwords or repeated words, word order kept."""
+    words = dict.fromkeys(token.strip(".").lower() for token in _QUERY_TOKEN_RE.findall(query))
+    return " ".join(word for word in words if word and word not in QUERY_STOPWORDS)
+
+
+def distinguishing_words(query: str) -> FrozenSet[str]:
+    """Normalized words that name something: capitalized words, acronyms and numbers.
+
+    Two queries that differ in one of these ("John Smith" vs "Jane Smith",
+    "2023 revenue" vs "2024 revenue") are about different things however much
+    else they share. A query typed all in lowercase only protects its numbers.
+    """
+    words = set()
+    for token in _QUERY_TOKEN_RE.findall(query):
+        if any(char.isdigit() or char.isupper() for char in token):
+            words.add(token.strip(".").lower())
+    return frozenset(words - QUERY_STOPWORDS - {""})
+
+
+def _similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Jaccard similarity of two word sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class GeminiSearchBackend:
+    """Answers a query with one Gemini call grounded on Google Search."""
+
+    name = "gemini"
+
+    def __init__(self, model: str = SEARCH_MODEL):
+        self.model = model
+        self._client = None
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        from google import genai
+        from google.genai import types
+
+        if self._client is None:
+            self._client = genai.Client()
+        response = await self._client.aio.models.generate_content(
+            model=self.model,
+            contents=f"Search the web and summarize the verifiable facts for: {query}",
+            config=types.GenerateContentConfig(tools=[types.Tool(google_search=types.GoogleSearch())])
+        )
+        sources = []
+        candidate = response.candidates[0] if response.candidates else None
+        metadata = candidate.grounding_metadata if candidate else None
+        for chunk in (metadata.grounding_chunks or []) if metadata else []:
+            if chunk.web and chunk.web.uri:
+                sources.append({"title": chunk.web.title, "url": chunk.web.uri})
+        return {"summary": response.text or "", "sources": sources}
+
+
+class StubSearchBackend:
+    """Offline backend: canned results keyed by query, for tests and benchmarks.
+
+    fixtures maps a query (normalized, so case, punctuation and stopwords don't matter) to
+    {"summary": ..., "sources": [{"title", "url"}]}.
+    """
+
+    name = "stub"
+
+    def __init__(self, fixtures: Optional[Dict[str, Dict[str, Any]]] = None, path: Optional[str] = None):
+        if path:
+            with open(path) as f:
+                fixtures = {**json.load(f), **(fixtures or {})}
+        self.fixtures = {normalize_query(query): result for query, result in (fixtures or {}).items()}
+        self.calls: List[str] = []
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        self.calls.append(query)
+        result = self.fixtures.get(normalize_query(query))
+        if result is None:
+            return {"summary": f"No stub result for: {query}", "sources": []}
+        return result
+
+
+class CassetteSearchBackend:
+    """Records or replays another backend's searches through the model cassette."""
+
+    def __init__(self, backend, cassette: Cassette):
+        self.backend = backend
+        self.cassette = cassette
+        self.name = backend.name
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        return await self.cassette.acall("search", [self.name, query], lambda: self.backend.search(query))
+
+
+class SearchService:
+    """Cache + near-duplicate collapsing + quota in front of a search backend."""
+
+    def __init__(self, backend, cache: Optional[ResultCache] = None,
+                 ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+                 quota_per_session: int = SEARCH_QUOTA_PER_SESSION,
+                 similarity_threshold: float = SEARCH_SIMILARITY_THRESHOLD):
+        self.backend = backend
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.quota_per_session = quota_per_session
+        self.similarity_threshold = similarity_threshold
+        # Normalized queries seen recently → (word set, distinguishing words), for near-duplicate lookups
+        self._recent: "OrderedDict[str, Tuple[FrozenSet[str], FrozenSet[str]]]" = OrderedDict()
+        # Results held in memory when no persistent cache is configured (least recently used first)
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"searches": 0, "cache_hits": 0, "collapsed": 0, "quota_rejections": 0, "errors": 0}
+
+    def _cache_key(self, normalized: str) -> str:
+        return make_cache_key("search", self.backend.name, normalized)
+
+    def _load(self, normalized: str) -> Optional[Dict[str, Any]]:
+        key = self._cache_key(normalized)
+        if self.cache is not None:
+            entry = self.cache.get(key)
+        else:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+        if entry is None or time.time() - entry["stored_at"] > self.ttl_seconds:
+            return None
+        return entry["result"]
+
+    def _store(self, query: str, normalized: str, result: Dict[str, Any]) -> None:
+        entry = {"stored_at": time.time(), "result": result}
+        key = self._cache_key(normalized)
+        if self.cache is not None:
+            self.cache.set(key, entry)
+        with self._lock:
+            if self.cache is None:
+                self._memory[key] = entry
+                self._memory.move_to_end(key)
+                while len(self._memory) > MAX_MEMORY_RESULTS:
+                    self._memory.popitem(last=False)
+            self._recent[normalized] = (frozenset(normalized.split()), distinguishing_words(query))
+            self._recent.move_to_end(normalized)
+            while len(self._recent) > MAX_RECENT_QUERIES:
+                self._recent.popitem(last=False)
+
+    def _lookup(self, query: str, normalized: str) -> Optional[Dict[str, Any]]:
+        """Exact cached result, else the closest recent near-duplicate's result.
+
+        Near-duplicates must not differ in a distinguishing word of either query,
+        so only rewordings and extra or missing common words are collapsed.
+        """
+        result = self._load(normalized)
+        if result is not None:
+            self.counters["cache_hits"] += 1
+            return {**result, "cached": True}
+
+        words = frozenset(normalized.split())
+        distinguishing = distinguishing_words(query)
+        with self._lock:
+            candidates = sorted(
+                (
+                    (_similarity(words, other), recent)
+                    for recent, (other, other_distinguishing) in self._recent.items()
+                    if not (words ^ other) & (distinguishing | other_distinguishing)
+                ),
+                reverse=True
+            )
+        for score, recent in candidates:
+            if score < self.similarity_threshold:
+                break
+            result = self._load(recent)
+            if result is not None:
+                self.counters["collapsed"] += 1
+                return {**result, "cached": True, "collapsed_into": recent}
+        return None
+
+    async def search(self, query: str, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run one search. state is the session state dict used for the quota."""
+        normalized = normalize_query(query)
+        used = state.get(SEARCH_COUNT_STATE_KEY, 0) if state is not None else 0
+        base = {"query": query, "search_quota": self.quota_per_session}
+
+        cached = self._lookup(query, normalized)
+        if cached is not None:
+            # Cache hits and collapsed duplicates are free: they do not use quota
+            return {**base, "status": "success", **cached, "searches_used": used}
+
+        if used >= self.quota_per_session:
+            self.counters["quota_rejections"] += 1
+            return {
+                **base,
+                "status": "quota_exceeded",
+                "searches_used": used,
+                "message": "Search quota for this session is used up. Mark remaining claims REQUIRES_VERIFICATION."
+            }
+
+        if state is not None:
+            state[SEARCH_COUNT_STATE_KEY] = used + 1
+        self.counters["searches"] += 1
+        try:
+            result = await self.backend.search(query)
+        except Exception as exc:
+            self.counters["errors"] += 1
+            return {**base, "status": "error", "error": f"Search failed: {exc}", "searches_used": used + 1}
+        self._store(query, normalized, result)
+        return {**base, "status": "success", **result, "cached": False, "searches_used": used + 1}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["searches"] + self.counters["cache_hits"] + self.counters["collapsed"]
+        reused = self.counters["cache_hits"] + self.counters["collapsed"]
+        return {
+            "backend": self.backend.name,
+            **self.counters,
+            "hit_ratio": reused / lookups if lookups else 0.0,
+            "quota_per_session": self.quota_per_session,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+def create_search_backend(name: str = SEARCH_BACKEND):
+    if name == "stub":
+        return StubSearchBackend(path=SEARCH_STUB_PATH)
+    if name == "gemini":
+        return GeminiSearchBackend()
+    raise ValueError(f"Unknown search backend: {name} (expected 'gemini' or 'stub')")
+
+
+@lru_cache(maxsize=None)
+def default_search_service() -> SearchService:
+    """Shared process-wide search service built from environment settings."""
+    backend = create_search_backend()
+    cassette = default_cassette()
+    if cassette is None:
+        return SearchService(backend, cache=default_result_cache())
+    # As in the analyzer, the persistent cache must not answer in place of the cassette
+    return SearchService(CassetteSearchBackend(backend, cassette))
+
+
+async def web_search(query: str, tool_context: ToolContext) -> Dict[str, Any]:
+    """Searches the web and returns a summary of the findings with source URLs.
+
+    Repeated or near-identical queries return cached results without using quota.
+    When status is "quota_exceeded", stop searching.
+
+    Args:
+        query: The search query, e.g. "Acme Robotics founder John Smith prior company".
+
+    Returns:
+        A dict with status, summary, sources (title and url), cached, searches_used and search_quota.
+    """
+    return await default_search_service().search(query, tool_context.state)
+
+
+web_search_tool = FunctionTool(web_search)
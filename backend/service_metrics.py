@@ -0,0 +1,263 @@
+"""
+service_metrics.py — Prometheus text-format metrics for the API (GET /metrics)
+• Counter, Gauge and Histogram with labels, thread-safe (analyzer threads
+  record into them while the event loop serves scrapes)
+• Counters and gauges can instead be read from a callback at scrape time
+  (cache counters, sessions, RSS), so nothing polls in the background
+• Shared series: request latency per route, in-flight analyses, analyzed
+  pages, page analysis latency, model call latency and errors by model
+Written against the text exposition format 0.0.4 directly, so no client
+library is needed.
+"""
+
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers /health up to slow fact-checks and whole-document analyses
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+MODEL_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+PAGE_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+Collector = Callable[[], Dict[LabelValues, float]]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 collect: Optional[Collector] = None):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+        # Scrape-time source of {label values: value}, instead of recorded values
+        self._collect = collect
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        if self._collect is not None:
+            try:
+                values = self._collect()
+            except Exception as e:
+                print(f"⚠️ Metric {self.name} could not be collected: {e}")
+                return []
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [(self.name, _format_labels(self.label_names, key), value) for key, value in values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = REQUEST_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values → [per-bucket counts, sum, count]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        return _Timer(self, labels)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        with self._lock:
+            series_items = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        for key, counts, total, count in series_items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                samples.append((f"{self.name}_bucket", _format_labels(self.label_names, key, le), cumulative))
+            labels = _format_labels(self.label_names, key)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a histogram."""
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric; registering a name again returns the existing metric."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = (),
+                collect: Optional[Collector] = None) -> Counter:
+        return self.register(Counter(name, documentation, labels, collect))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = (),
+              collect: Optional[Collector] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labels, collect))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = REQUEST_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is kilobytes on Linux, bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# Shared process-wide registry and the series recorded outside backend.py
+registry = MetricsRegistry()
+
+MODEL_CALL_SECONDS = registry.histogram(
+    "model_call_duration_seconds", "Live model call latency by model (cache and cassette hits excluded)",
+    labels=("model", "caller"), buckets=MODEL_BUCKETS
+)
+MODEL_CALL_ERRORS = registry.counter(
+    "model_call_errors_total", "Model calls that raised, by model", labels=("model", "caller")
+)
+PAGES_ANALYZED = registry.counter(
+    "pages_analyzed_total", "Pages and slides analyzed, by outcome", labels=("status", "reused")
+)
+PAGE_ANALYSIS_SECONDS = registry.histogram(
+    "page_analysis_duration_seconds",
+    "Page analysis latency per multimodal request, by pages in the request (reused pages excluded)",
+    labels=("batch_size", "status"), buckets=PAGE_BUCKETS
+)
+registry.gauge(
+    "process_resident_memory_bytes", "Resident memory size in bytes",
+    collect=lambda: {(): process_rss_bytes()}
+)
+
+
+class AdkModelTimer:
+    """before/after model callbacks timing ADK agent model calls (see attach_model_callbacks).
+
+    ADK has no model error callback: a call that raises never reaches
+    after_model_callback. Calls still pending after the slowest model bucket
+    are dropped and counted as errors (checked on every model call and scrape).
+    """
+
+    def __init__(self, max_call_seconds: float = MODEL_BUCKETS[-1]):
+        self.max_call_seconds = max_call_seconds
+        self._lock = threading.Lock()
+        # (invocation_id, agent_name) → (model, started)
+        self._pending: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+    def expire(self) -> int:
+        """Drop calls pending longer than max_call_seconds, counting each as a model error."""
+        cutoff = time.perf_counter() - self.max_call_seconds
+        with self._lock:
+            stale = [key for key, (_, started) in self._pending.items() if started < cutoff]
+            models = [self._pending.pop(key)[0] for key in stale]
+        for model in models:
+            MODEL_CALL_ERRORS.inc(model=model, caller="adk")
+        return len(models)
+
+    async def before_model_callback(self, callback_context, llm_request):
+        self.expire()
+        with self._lock:
+            self._pending[(callback_context.invocation_id, callback_context.agent_name)] = (
+                llm_request.model or "unknown", time.perf_counter()
+            )
+        return None
+
+    async def after_model_callback(self, callback_context, llm_response):
+        with self._lock:
+            pending = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if pending is not None:
+            model, started = pending
+            MODEL_CALL_SECONDS.observe(time.perf_counter() - started, model=model, caller="adk")
+        if llm_response.error_code:
+            MODEL_CALL_ERRORS.inc(model=pending[0] if pending else "unknown", caller="adk")
+        return None
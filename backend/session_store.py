@@ -0,0 +1,418 @@
+"""
+session_store.py — Long-lived ADK runners and session/artifact storage
+• One Runner per agent, created once and reused for every request
+• memory backend: sessions are capped and expire (TTL + LRU eviction)
+• sqlite backend: sessions persist in SQLite (WAL), artifacts as files on disk
+• Gauges for live sessions and artifact bytes
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import shutil
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from google.adk.artifacts import BaseArtifactService, InMemoryArtifactService
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+from sqlalchemy import event, text
+
+SessionKey = Tuple[str, str, str]
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+DEFAULT_SESSION_DB_PATH = os.path.join(DEFAULT_STORE_DIR, "sessions.sqlite3")
+DEFAULT_ARTIFACT_DIR = os.path.join(DEFAULT_STORE_DIR, "artifacts")
+
+
+def artifact_bytes(artifact_service: Optional[BaseArtifactService]) -> int:
+    """Approximate bytes held by an artifact service (RAM or disk)."""
+    if isinstance(artifact_service, FileArtifactService):
+        return artifact_service.total_bytes()
+    if not isinstance(artifact_service, InMemoryArtifactService):
+        return 0
+    total = 0
+    for versions in artifact_service.artifacts.values():
+        for part in versions:
+            if part.inline_data and part.inline_data.data:
+                total += len(part.inline_data.data)
+            elif part.text:
+                total += len(part.text.encode("utf-8"))
+    return total
+
+
+def purge_session_artifacts(artifact_service: Optional[BaseArtifactService],
+                            app_name: str, user_id: str, session_id: str) -> None:
+    """Drop every session-scoped artifact (user-scoped "user:" artifacts are kept)."""
+    if isinstance(artifact_service, FileArtifactService):
+        artifact_service.delete_session_artifacts(app_name, user_id, session_id)
+    elif isinstance(artifact_service, InMemoryArtifactService):
+        prefix = f"{app_name}/{user_id}/{session_id}/"
+        for path in [path for path in artifact_service.artifacts if path.startswith(prefix)]:
+            del artifact_service.artifacts[path]
+
+
+class BoundedInMemorySessionService(InMemorySessionService):
+    """InMemorySessionService with a session cap, idle TTL and LRU eviction.
+
+    Evicted sessions also drop their session-scoped artifacts when an
+    InMemoryArtifactService is supplied.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 3600.0,
+                 artifact_service: Optional[BaseArtifactService] = None):
+        super().__init__()
+        self.max_sessions = max(1, max_sessions)
+        self.ttl_seconds = ttl_seconds
+        self.artifact_service = artifact_service
+        self.evictions = 0
+        # Least recently used first
+        self._last_access: "OrderedDict[SessionKey, float]" = OrderedDict()
+
+    def _touch(self, key: SessionKey) -> None:
+        self._last_access[key] = time.monotonic()
+        self._last_access.move_to_end(key)
+
+    def _forget(self, key: SessionKey) -> None:
+        app_name, user_id, session_id = key
+        self._last_access.pop(key, None)
+        user_sessions = self.sessions.get(app_name, {}).get(user_id)
+        if user_sessions is not None:
+            user_sessions.pop(session_id, None)
+            if not user_sessions:
+                del self.sessions[app_name][user_id]
+                if not self.sessions[app_name]:
+                    del self.sessions[app_name]
+        purge_session_artifacts(self.artifact_service, app_name, user_id, session_id)
+
+    def evict_expired(self) -> int:
+        """Drop idle-expired sessions, then the least recently used beyond the cap."""
+        evicted = 0
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._last_access:
+            key, last_access = next(iter(self._last_access.items()))
+            if last_access >= cutoff and len(self._last_access) <= self.max_sessions:
+                break
+            self._forget(key)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    async def create_session(self, *, app_name: str, user_id: str,
+                             state: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None):
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch((app_name, user_id, session.id))
+        self.evict_expired()
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None):
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch((app_name, user_id, session_id))
+        return session
+
+    async def append_event(self, session, event):
+        key = (session.app_name, session.user_id, session.id)
+        # A run still holding an evicted session must not bring its key back as a ghost
+        if key in self._last_access:
+            self._touch(key)
+        return await super().append_event(session=session, event=event)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        self._forget((app_name, user_id, session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "live_sessions": len(self._last_access),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "artifact_bytes": artifact_bytes(self.artifact_service)
+        }
+
+
+class SqliteSessionService(DatabaseSessionService):
+    """ADK DatabaseSessionService tuned for a local SQLite file.
+
+    • WAL journal so readers never block the writer, and cascading deletes
+    • Composite indexes for app/user/session lookups and event history scans
+    • Event history is loaded lazily: only the most recent event_window events
+      are read per turn (0 loads the full history)
+    """
+
+    def __init__(self, path: str = DEFAULT_SESSION_DB_PATH, event_window: int = 0,
+                 artifact_service: Optional[BaseArtifactService] = None):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.event_window = event_window
+        self.artifact_service = artifact_service
+        super().__init__(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+        @event.listens_for(self.db_engine, "connect")
+        def _configure_connection(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+        # The engine may already hold a connection from table creation
+        self.db_engine.dispose()
+        with self.db_engine.begin() as connection:
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_events_session_time "
+                "ON events (app_name, user_id, session_id, timestamp)"
+            ))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_user_updated "
+                "ON sessions (app_name, user_id, update_time)"
+            ))
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str,
+                          config: Optional[GetSessionConfig] = None):
+        if config is None and self.event_window:
+            config = GetSessionConfig(num_recent_events=self.event_window)
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        purge_session_artifacts(self.artifact_service, app_name, user_id, session_id)
+
+    def evict_expired(self) -> int:
+        """Persistent sessions are kept until deleted."""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self.db_engine.connect() as connection:
+            sessions = connection.execute(text("SELECT COUNT(*) FROM sessions")).scalar()
+            events = connection.execute(text("SELECT COUNT(*) FROM events")).scalar()
+        db_bytes = sum(
+            os.path.getsize(self.path + suffix)
+            for suffix in ("", "-wal")
+            if os.path.exists(self.path + suffix)
+        )
+        return {
+            "backend": "sqlite",
+            "live_sessions": sessions,
+            "stored_events": events,
+            "event_window": self.event_window,
+            "database_bytes": db_bytes,
+            "artifact_bytes": artifact_bytes(self.artifact_service)
+        }
+
+
+class FileArtifactService(BaseArtifactService):
+    """Artifacts stored out-of-line on disk, one file per version.
+
+    Layout: {root}/{app}/{user}/{session_id or "user"}/{filename}/{version}.bin
+    with a {version}.json sidecar holding the MIME type. Loads memory-map the
+    version file, so nothing is kept in RAM between calls.
+    """
+
+    def __init__(self, root: str = DEFAULT_ARTIFACT_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _session_dir(self, app_name: str, user_id: str, session_id: str) -> str:
+        return os.path.join(self.root, quote(app_name, safe=""), quote(user_id, safe=""),
+                            quote(session_id, safe=""))
+
+    def _artifact_dir(self, app_name: str, user_id: str, session_id: str, filename: str) -> str:
+        # "user:" artifacts are shared across all of a user's sessions
+        scope = "user" if filename.startswith("user:") else session_id
+        return os.path.join(self._session_dir(app_name, user_id, scope), quote(filename, safe=""))
+
+    def _versions(self, directory: str) -> List[int]:
+        if not os.path.isdir(directory):
+            return []
+        return sorted(int(name[:-4]) for name in os.listdir(directory) if name.endswith(".bin"))
+
+    def _save(self, directory: str, artifact: types.Part) -> int:
+        os.makedirs(directory, exist_ok=True)
+        versions = self._versions(directory)
+        version = versions[-1] + 1 if versions else 0
+        if artifact.inline_data is not None:
+            data = artifact.inline_data.data or b""
+            meta = {"kind": "inline", "mime_type": artifact.inline_data.mime_type}
+        else:
+            data = (artifact.text or "").encode("utf-8")
+            meta = {"kind": "text", "mime_type": "text/plain"}
+        base = os.path.join(directory, str(version))
+        # Write the sidecar first; the version only becomes visible once the .bin lands
+        with open(base + ".json", "w") as f:
+            json.dump(meta, f)
+        with open(base + ".bin.tmp", "wb") as f:
+            f.write(data)
+        os.replace(base + ".bin.tmp", base + ".bin")
+        return version
+
+    def _load(self, directory: str, version: Optional[int]) -> Optional[types.Part]:
+        versions = self._versions(directory)
+        if not versions:
+            return None
+        version = versions[-1] if version is None else version
+        base = os.path.join(directory, str(version))
+        if not os.path.exists(base + ".bin"):
+            return None
+        with open(base + ".json") as f:
+            meta = json.load(f)
+        with open(base + ".bin", "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = mapped[:]
+        if meta["kind"] == "text":
+            return types.Part(text=data.decode("utf-8"))
+        return types.Part.from_bytes(data=data, mime_type=meta["mime_type"])
+
+    async def save_artifact(self, *, app_name: str, user_id: str, session_id: str,
+                            filename: str, artifact: types.Part) -> int:
+        directory = self._artifact_dir(app_name, user_id, session_id, filename)
+        return await asyncio.to_thread(self._save, directory, artifact)
+
+    async def load_artifact(self, *, app_name: str, user_id: str, session_id: str,
+                            filename: str, version: Optional[int] = None) -> Optional[types.Part]:
+        directory = self._artifact_dir(app_name, user_id, session_id, filename)
+        return await asyncio.to_thread(self._load, directory, version)
+
+    async def list_artifact_keys(self, *, app_name: str, user_id: str, session_id: str) -> List[str]:
+        filenames = []
+        for scope in (session_id, "user"):
+            directory = self._session_dir(app_name, user_id, scope)
+            if os.path.isdir(directory):
+                filenames.extend(
+                    name for name in (
+                        unquote(entry) for entry in os.listdir(directory)
+                    ) if (scope == "user") == name.startswith("user:")
+                )
+        return sorted(filenames)
+
+    async def delete_artifact(self, *, app_name: str, user_id: str, session_id: str, filename: str) -> None:
+        shutil.rmtree(self._artifact_dir(app_name, user_id, session_id, filename), ignore_errors=True)
+
+    async def list_versions(self, *, app_name: str, user_id: str, session_id: str, filename: str) -> List[int]:
+        return self._versions(self._artifact_dir(app_name, user_id, session_id, filename))
+
+    def delete_session_artifacts(self, app_name: str, user_id: str, session_id: str) -> None:
+        shutil.rmtree(self._session_dir(app_name, user_id, session_id), ignore_errors=True)
+
+    def total_bytes(self) -> int:
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        return total
+
+
+def create_agent_services(backend: str = "memory", max_sessions: int = 1000, ttl_seconds: float = 3600.0,
+                          session_db_path: str = DEFAULT_SESSION_DB_PATH,
+                          artifact_dir: str = DEFAULT_ARTIFACT_DIR, event_window: int = 0):
+    """Build the (session_service, artifact_service) pair for SESSION_BACKEND."""
+    if backend == "sqlite":
+        artifact_service = FileArtifactService(artifact_dir)
+        session_service = SqliteSessionService(
+            session_db_path, event_window=event_window, artifact_service=artifact_service
+        )
+        print(f"💾 Agent sessions persisted to {session_db_path}, artifacts to {artifact_dir}")
+    elif backend == "memory":
+        artifact_service = InMemoryArtifactService()
+        session_service = BoundedInMemorySessionService(
+            max_sessions=max_sessions, ttl_seconds=ttl_seconds, artifact_service=artifact_service
+        )
+    else:
+        raise ValueError(f"Unknown session backend: {backend} (expected 'memory' or 'sqlite')")
+    return session_service, artifact_service
+
+
+def _callback_list(callbacks) -> List[Any]:
+    if callbacks is None:
+        return []
+    return list(callbacks) if isinstance(callbacks, list) else [callbacks]
+
+
+def attach_model_callbacks(agents, before=None, after=None) -> None:
+    """
+    Add before/after model callbacks to every LlmAgent in the given agent trees.
+
+    before callbacks run ahead of existing ones (so they can short-circuit the
+    model call); after callbacks run after existing ones. Attaching the same
+    callback twice is a no-op.
+    """
+    for agent in agents:
+        if hasattr(agent, "before_model_callback"):
+            existing = _callback_list(agent.before_model_callback)
+            if before is not None and before not in existing:
+                agent.before_model_callback = [before, *existing]
+            existing = _callback_list(agent.after_model_callback)
+            if after is not None and after not in existing:
+                agent.after_model_callback = [*existing, after]
+        attach_model_callbacks(getattr(agent, "sub_agents", None) or [], before, after)
+
+
+class RunnerPool:
+    """Creates one long-lived Runner per agent and hands it out on every request."""
+
+    def __init__(self, app_name: str, session_service, artifact_service):
+        self.app_name = app_name
+        self.session_service = session_service
+        self.artifact_service = artifact_service
+        self._runners: Dict[str, Runner] = {}
+
+    def get(self, agent) -> Runner:
+        runner = self._runners.get(agent.name)
+        if runner is None:
+            runner = Runner(
+                agent=agent,
+                app_name=self.app_name,
+                session_service=self.session_service,
+                artifact_service=self.artifact_service
+            )
+            self._runners[agent.name] = runner
+        return runner
+
+    def __len__(self) -> int:
+        return len(self._runners)
+
+
+async def run_agent_once(runner_pool: RunnerPool, session_service, agent, query: str, user_id: str,
+                         telemetry=None) -> str:
+    """Run one agent on a throwaway session and return its last text response.
+
+    telemetry (an AgentRunTelemetry) records the run's event timings when given.
+    """
+    session = await session_service.create_session(app_name=runner_pool.app_name, user_id=user_id, state={})
+    content = types.Content(role="user", parts=[types.Part(text=query)])
+    last_response = None
+    try:
+        events = runner_pool.get(agent).run_async(
+            user_id=user_id,
+            session_id=session.id,
+            new_message=content,
+        )
+        if telemetry is not None:
+            events = telemetry.observe(events, agent.name)
+        async for event in events:
+            if event.author == agent.name and event.content and event.content.parts:
+                text = "\n".join(part.text for part in event.content.parts if part.text).strip()
+                if text:
+                    last_response = text
+    finally:
+        await session_service.delete_session(
+            app_name=runner_pool.app_name, user_id=user_id, session_id=session.id
+        )
+    if last_response is None:
+        raise RuntimeError("No response received from agent")
+    return last_response
@@ -0,0 +1,172 @@
+"""
+telemetry.py — OpenTelemetry tracing for the document pipeline
+• TRACE_EXPORTER=off (default), console or file
+  - console: one line per finished span on stdout
+  - file: one JSON object per span appended to TRACE_FILE
+• span(): context-manager span; a shared no-op object when tracing is off, so
+  instrumented code costs a constant check and nothing is imported
+• record_span(): span built after the fact from captured wall-clock timings
+  (page rendering may run in worker processes)
+• propagate(): carry the current span into thread-pool work
+ADK's own agent spans go to the same exporter once tracing is enabled.
+"""
+
+import json
+import os
+import threading
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "off").lower()  # off, console or file
+DEFAULT_TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "traces.jsonl")
+TRACE_FILE = os.getenv("TRACE_FILE", DEFAULT_TRACE_FILE)
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "startup-analyzer")
+
+TRACE_EXPORTERS = {"off", "console", "file"}
+if TRACE_EXPORTER not in TRACE_EXPORTERS:
+    raise ValueError(f"Unknown TRACE_EXPORTER: {TRACE_EXPORTER} (expected one of {sorted(TRACE_EXPORTERS)})")
+
+TRACING_ENABLED = TRACE_EXPORTER != "off"
+
+# (stage, start_ns, end_ns) as captured with time.time_ns()
+StageTiming = Tuple[str, int, int]
+
+
+def _span_record(span) -> Dict[str, Any]:
+    return {
+        "name": span.name,
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "start_ns": span.start_time,
+        "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {})
+    }
+
+
+def _console_line(span) -> str:
+    record = _span_record(span)
+    attributes = " ".join(f"{key}={value}" for key, value in record["attributes"].items())
+    return f"🔭 {record['trace_id'][:8]} {record['name']} {record['duration_ms']:.1f}ms {record['status']} {attributes}\n"
+
+
+def _file_exporter(path: str):
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """Appends finished spans to a JSON-lines file."""
+
+        def __init__(self):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> "SpanExportResult":
+            lines = "".join(json.dumps(_span_record(span), default=str) + "\n" for span in spans)
+            with self._lock, open(path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            return SpanExportResult.SUCCESS
+
+    return JsonLinesSpanExporter()
+
+
+@lru_cache(maxsize=None)
+def _tracer():
+    """Install the process-wide tracer provider on first use."""
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    exporter = _file_exporter(TRACE_FILE) if TRACE_EXPORTER == "file" else ConsoleSpanExporter(formatter=_console_line)
+    provider = TracerProvider(resource=Resource.create({"service.name": TRACE_SERVICE_NAME}))
+    # Export happens on the processor's thread, off the request path
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    print(f"🔭 Tracing enabled: {TRACE_EXPORTER}" + (f" → {TRACE_FILE}" if TRACE_EXPORTER == "file" else ""))
+    return trace.get_tracer("startup_analyzer")
+
+
+class _NoOpSpan:
+    """Stands in for a span (and its context manager) when tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def set_status(self, *args, **kwargs) -> None:
+        pass
+
+
+NOOP_SPAN = _NoOpSpan()
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry rejects None attribute values
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def span(name: str, **attributes):
+    """Context manager for a child span of the current one; exceptions mark it as failed."""
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    return _tracer().start_as_current_span(name, attributes=_attributes(attributes))
+
+
+def set_status(current, status: str, error: Optional[BaseException] = None) -> None:
+    """Set the "status" attribute; a handled error also marks the span as failed."""
+    current.set_attribute("status", status)
+    if error is not None and TRACING_ENABLED:
+        from opentelemetry.trace import Status, StatusCode
+        current.record_exception(error)
+        current.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+def record_span(name: str, start_ns: int, end_ns: int,
+                stages: Iterable[StageTiming] = (), **attributes) -> None:
+    """Emit a finished span (plus one child per stage) from timings captured elsewhere."""
+    if not TRACING_ENABLED:
+        return
+    from opentelemetry import trace
+
+    tracer = _tracer()
+    parent = tracer.start_span(name, start_time=start_ns, attributes=_attributes(attributes))
+    parent_context = trace.set_span_in_context(parent)
+    for stage, stage_start, stage_end in stages:
+        tracer.start_span(f"{name}.{stage}", context=parent_context, start_time=stage_start).end(end_time=stage_end)
+    parent.end(end_time=end_ns)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Wrap fn so it runs under the caller's current span on another thread.
+
+    Executors don't carry context variables over, so without this the spans
+    of pooled work would start new traces. Returns fn itself when tracing is off.
+    """
+    if not TRACING_ENABLED:
+        return fn
+    from opentelemetry import context
+
+    captured = context.get_current()
+
+    @wraps(fn)
+    def run(*args, **kwargs):
+        token = context.attach(captured)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            context.detach(token)
+
+    return run
+
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from google.adk.events import Event
+from google.genai import types
+
+import agent_telemetry
+from agent_telemetry import AgentMetrics, AgentRunTelemetry
+
+AGENT = "FactCheck_Agent"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(agent_telemetry.time, "perf_counter", lambda: now[0])
+    return now
+
+
+def search_call(call_id: str) -> Event:
+    return Event(author=AGENT, content=types.Content(role="model", parts=[
+        types.Part(function_call=types.FunctionCall(id=call_id, name="web_search", args={"query": "Acme MRR"}))
+    ]))
+
+
+def search_response(call_id: str, **response) -> Event:
+    return Event(author=AGENT, content=types.Content(role="user", parts=[
+        types.Part(function_response=types.FunctionResponse(id=call_id, name="web_search", response=response))
+    ]))
+
+
+def verdict(partial: bool = False) -> Event:
+    return Event(
+        author=AGENT, partial=partial,
+        content=types.Content(role="model", parts=[types.Part(text="Verdict: consistent")]),
+        usage_metadata=None if partial else types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=100, candidates_token_count=20, total_token_count=120
+        )
+    )
+
+
+def run(telemetry, clock, timeline):
+    """Feed (time, event) pairs through telemetry.observe as if the runner produced them."""
+    async def events():
+        for at, event in timeline:
+            clock[0] = at
+            yield event
+
+    async def consume():
+        return [event async for event in telemetry.observe(events(), AGENT)]
+
+    return asyncio.run(consume())
+
+
+def fact_check_run(clock, started: float = 0.0, search_seconds: float = 2.5, cached: bool = True,
+                   first_event: float = 1.0):
+    clock[0] = started
+    telemetry = AgentRunTelemetry()
+    run(telemetry, clock, [
+        (started + first_event, search_call("call-1")),
+        (started + first_event + search_seconds, search_response("call-1", status="success", cached=cached)),
+        (started + first_event + search_seconds + 1.0, verdict(partial=True)),
+        (started + first_event + search_seconds + 1.5, verdict()),
+    ])
+    return telemetry
+
+
+def test_model_and_tool_time_are_split(clock):
+    summary = fact_check_run(clock).summary()
+    agent = summary["agents"][AGENT]
+    assert (agent["runs"], agent["events"]) == (1, 4)
+    assert (agent["first_event_seconds"], agent["last_event_seconds"]) == (1.0, 5.0)
+    # Before the call (1.0s) and before the final verdict (0.5s); the partial event isn't a turn
+    assert (agent["model_turns"], agent["model_seconds"]) == (2, 1.5)
+    assert (agent["tool_calls"], agent["tool_seconds"]) == (1, 2.5)
+    assert (agent["prompt_tokens"], agent["output_tokens"], agent["total_tokens"]) == (100, 20, 120)
+    assert summary["tool_calls"] == [
+        {"tool": "web_search", "agent": AGENT, "seconds": 2.5, "status": "success", "cached": True}
+    ]
+    assert summary["tools"]["web_search"] == {"calls": 1, "seconds": 2.5, "max_seconds": 2.5}
+
+
+def test_events_pass_through_unchanged(clock):
+    events = [search_call("call-1"), search_response("call-1", status="success")]
+    assert run(AgentRunTelemetry(), clock, [(1.0, events[0]), (2.0, events[1])]) == events
+
+
+def test_metrics_aggregate_requests(clock):
+    metrics = AgentMetrics()
+    metrics.record(fact_check_run(clock, search_seconds=2.0, cached=False))
+    metrics.record(fact_check_run(clock, started=10.0, search_seconds=4.0, first_event=3.0))
+    stats = metrics.stats()
+    assert stats["requests"] == 2
+    agent = stats["agents"][AGENT]
+    assert (agent["runs"], agent["model_turns"], agent["tool_seconds"], agent["total_tokens"]) == (2, 4, 6.0, 240)
+    assert agent["first_event_seconds"] == {"p50": 3.0, "p95": 3.0, "max": 3.0}
+    tool = stats["tools"]["web_search"]
+    assert (tool["calls"], tool["cached"], tool["statuses"]) == (2, 1, {"success": 2})
+    assert tool["latency_seconds"] == {"p50": 4.0, "p95": 4.0, "max": 4.0}
+
+
+def test_metrics_keep_recent_samples_only(clock):
+    metrics = AgentMetrics(samples=2)
+    for search_seconds in (9.0, 1.0, 2.0):
+        metrics.record(fact_check_run(clock, search_seconds=search_seconds))
+    tool = metrics.stats()["tools"]["web_search"]
+    assert tool["calls"] == 3
+    assert tool["latency_seconds"]["max"] == 2.0
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import search_tool
+from cassette import Cassette, CassetteMissError
+from document_ingestor import StartupAnalyzer
+from result_cache import ResultCache
+from search_tool import CassetteSearchBackend, SearchService, StubSearchBackend
+
+
+class CountingModel:
+    model = "gemini-2.0-flash"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=f"Live analysis #{self.calls}")
+
+
+class OfflineModel:
+    model = "gemini-2.0-flash"
+
+    def invoke(self, messages):
+        raise AssertionError("replay must not call the model")
+
+
+PAGE = {"page_number": 1, "text_content": "MRR $41K", "image_base64": "",
+        "fingerprint": "page-1", "render_policy": "adaptive"}
+
+
+def analyzer_with(cassette, model, tmp_path):
+    # A result cache is offered, but must be bypassed while a cassette is active
+    analyzer = StartupAnalyzer(result_cache=ResultCache(str(tmp_path / "cache.sqlite3")), cassette=cassette)
+    analyzer.multimodal_model = model
+    return analyzer
+
+
+def test_record_then_replay_bypasses_the_result_cache(tmp_path):
+    path = str(tmp_path / "cassette.sqlite3")
+    model = CountingModel()
+    recorder = analyzer_with(Cassette("record", path), model, tmp_path)
+    assert recorder.result_cache is None
+    first = recorder.analyze_single_page(PAGE)
+    second = recorder.analyze_single_page(PAGE)
+    # No cache hit stood in for the second call: both went to the model and were recorded
+    assert model.calls == 2 and not second["reused"]
+    assert recorder.cassette.stats()["recorded"] == 2
+
+    replayer = analyzer_with(Cassette("replay", path), OfflineModel(), tmp_path)
+    assert replayer.result_cache is None
+    replayed = replayer.analyze_single_page(PAGE)
+    assert replayed["analysis"] == second["analysis"]
+    assert replayed["status"] == "success"
+    assert replayer.cassette.stats()["replayed"] == 1
+
+    unrecorded = replayer.analyze_single_page({**PAGE, "text_content": "MRR $45K"})
+    assert unrecorded["status"] == "failed"
+    assert replayer.cassette.stats()["misses"] == 1
+
+
+def test_search_records_and_replays_without_the_persistent_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.sqlite3")
+    fixtures = {"Acme Robotics revenue": {"summary": "Acme revenue is $1.2M", "sources": []}}
+    monkeypatch.setattr(search_tool, "create_search_backend", lambda: StubSearchBackend(fixtures))
+    monkeypatch.setattr(search_tool, "default_cassette", lambda: Cassette("record", path))
+    search_tool.default_search_service.cache_clear()
+    try:
+        service = search_tool.default_search_service()
+        assert service.cache is None
+        recorded = asyncio.run(service.search("Acme Robotics revenue", {}))
+    finally:
+        search_tool.default_search_service.cache_clear()
+
+    replay_backend = StubSearchBackend()
+    replayer = SearchService(CassetteSearchBackend(replay_backend, Cassette("replay", path)))
+    replayed = asyncio.run(replayer.search("Acme Robotics revenue", {}))
+    assert replayed["summary"] == recorded["summary"] == "Acme revenue is $1.2M"
+    assert replay_backend.calls == []
+    with pytest.raises(CassetteMissError):
+        asyncio.run(replayer.backend.search("Acme Robotics churn"))
@@ -0,0 +1,82 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
+import document_ingestor
+from document_ingestor import MAX_SUMMARY_REDUCE_LEVELS, StartupAnalyzer
+
+DIGEST_RE = re.compile(r"=== PAGES ([\d-]+) DIGEST ===")
+
+
+class SummaryModel:
+    """Text model stand-in: chunk prompts get a digest of digest_words words, the final prompt a summary."""
+
+    model = "gemini-1.5-flash"
+
+    def __init__(self, digest_words: int = 5):
+        self.digest_words = digest_words
+        self.chunk_prompts = []
+        self.final_prompts = []
+
+    def invoke(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        if "SECTION: pages" in prompt:
+            self.chunk_prompts.append(prompt)
+            return SimpleNamespace(content=" ".join(["digest"] * self.digest_words))
+        self.final_prompts.append(prompt)
+        return SimpleNamespace(content="Final summary")
+
+
+def page_analyses(count: int, words: int = 100, failed=()):
+    return [{"page_number": number, "status": "failed" if number in failed else "success",
+             "analysis": " ".join([f"page{number}"] * words)} for number in range(1, count + 1)]
+
+
+@pytest.fixture
+def summarize(monkeypatch):
+    # Word counts keep the budgets independent of the tokenizer
+    monkeypatch.setattr(document_ingestor, "count_tokens", lambda text: len(text.split()))
+    monkeypatch.setattr(document_ingestor, "SUMMARY_SINGLE_SHOT_TOKENS", 300)
+    monkeypatch.setattr(document_ingestor, "SUMMARY_CHUNK_TOKENS", 250)
+
+    def run(pages, model):
+        analyzer = StartupAnalyzer(use_cache=False)
+        analyzer.cassette = None
+        analyzer.text_model = model
+        return analyzer.generate_document_summary_from_pages(pages, "pitch_deck")
+    return run
+
+
+def test_small_document_is_summarised_in_one_call(summarize):
+    model = SummaryModel()
+    assert summarize(page_analyses(2), model) == "Final summary"
+    assert model.chunk_prompts == []
+    assert "=== PAGE 2 ANALYSIS ===" in model.final_prompts[0]
+
+
+def test_large_document_is_reduced_through_chunk_digests(summarize):
+    model = SummaryModel()
+    assert summarize(page_analyses(9, failed={5}), model) == "Final summary"
+    # 104 words per page section and 250 per chunk: two pages per chunk, failed page 5 left out
+    assert DIGEST_RE.findall(model.final_prompts[0]) == ["1-2", "3-4", "6-7", "8-9"]
+    assert len(model.chunk_prompts) == 4
+    assert "page5" not in "".join(model.chunk_prompts)
+    # The final call sees only the digests
+    assert "ANALYSIS ===" not in model.final_prompts[0]
+
+
+def test_reduction_stops_after_max_levels(summarize):
+    # Digests as long as their input never get under the single-shot budget
+    model = SummaryModel(digest_words=300)
+    assert summarize(page_analyses(3, words=200), model) == "Final summary"
+    assert len(model.chunk_prompts) == 3 * MAX_SUMMARY_REDUCE_LEVELS
+    assert len(model.final_prompts) == 1
+
+
+def test_model_failure_is_reported_in_the_summary(summarize):
+    class BrokenModel(SummaryModel):
+        def invoke(self, messages):
+            raise RuntimeError("quota exceeded")
+
+    assert summarize(page_analyses(2), BrokenModel()) == "Summary generation failed: quota exceeded"
@@ -0,0 +1,32 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import backend
+
+LEGACY_PPT = ("deck.ppt", b"\xd0\xcf\x11\xe0" + b"0" * 100, "application/vnd.ms-powerpoint")
+
+
+@pytest.fixture
+def client():
+    return TestClient(backend.app)
+
+
+@pytest.mark.parametrize("path", ["/analyze/document", "/analyze/document/stream"])
+def test_legacy_ppt_is_rejected(client, path):
+    response = client.post(path, files={"file": LEGACY_PPT})
+    assert response.status_code == 415
+
+
+def test_job_submission_with_a_legacy_ppt_queues_nothing(client):
+    queued = backend.job_manager.stats()
+    response = client.post("/jobs/documents", files=[
+        ("files", ("deck.pdf", b"%PDF-1.4", "application/pdf")),
+        ("files", LEGACY_PPT),
+    ])
+    assert response.status_code == 415
+    assert backend.job_manager.stats() == queued
+
+
+def test_unknown_type_is_a_bad_request(client):
+    response = client.post("/analyze/document", files={"file": ("notes.txt", b"MRR $41K", "text/plain")})
+    assert response.status_code == 400
@@ -0,0 +1,47 @@
+import asyncio
+
+import economics_pipeline
+from business_model_agent import economics_parallel_agent, report_making_agent
+from economics_pipeline import analyze_startup_economics
+
+SLOW_AGENT = economics_parallel_agent.sub_agents[0].name
+
+
+def fake_agents(monkeypatch, slow=(SLOW_AGENT,)):
+    queries = {}
+
+    async def run_agent_once(runner_pool, session_service, agent, query, user_id, telemetry=None):
+        queries[agent.name] = query
+        if agent.name in slow:
+            await asyncio.sleep(5)
+        return f"{agent.name} analysis"
+
+    monkeypatch.setattr(economics_pipeline, "run_agent_once", run_agent_once)
+    return queries
+
+
+def analyze(**kwargs):
+    return asyncio.run(analyze_startup_economics(None, None, "Acme sells robots at $340 a month.",
+                                                 branch_timeout=0.05, **kwargs))
+
+
+def test_timed_out_branch_gives_a_partial_report(monkeypatch):
+    queries = fake_agents(monkeypatch)
+    result = analyze()
+    assert result["status"] == "partial"
+    assert result["branches"][SLOW_AGENT]["status"] == "timeout"
+    assert result["branches"][SLOW_AGENT]["error"] == f"{SLOW_AGENT} did not finish within 0.05s"
+    assert [branch["status"] for name, branch in result["branches"].items() if name != SLOW_AGENT] == ["success"] * 2
+    assert result["analysis"] == f"{report_making_agent.name} analysis"
+    # The report is told which analysis is missing
+    assert f"### {SLOW_AGENT} output:\nNot available (timeout:" in queries[report_making_agent.name]
+    # Branches ran concurrently, so the slow one cost its timeout, not the sum
+    assert result["timings"]["parallel_seconds"] < 1
+
+
+def test_every_branch_timing_out_fails_without_a_report(monkeypatch):
+    queries = fake_agents(monkeypatch, slow=[agent.name for agent in economics_parallel_agent.sub_agents])
+    result = analyze()
+    assert result["status"] == "failed"
+    assert result["report"] is None
+    assert report_making_agent.name not in queries
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend
+
+
+def factcheck_sessions():
+    listing = asyncio.run(backend.session_service.list_sessions(
+        app_name=backend.FACTCHECK_APP_NAME, user_id=backend.FACTCHECK_USER_ID
+    ))
+    return len(listing.sessions)
+
+
+def failing_verification(request):
+    raise RuntimeError("metrics engine failed")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backend, "verify_for_factcheck", failing_verification)
+    return TestClient(backend.app)
+
+
+def test_failed_preparation_leaves_no_session(client):
+    before = factcheck_sessions()
+    response = client.post("/analyze/factcheck", json={"content": "We hit $41K MRR in March."})
+    assert response.status_code == 500
+    assert factcheck_sessions() == before
+
+
+def test_failed_stream_deletes_its_session(client):
+    before = factcheck_sessions()
+    response = client.post("/analyze/factcheck/stream", json={"content": "We hit $41K MRR in March."})
+    assert "event: error" in response.text
+    assert factcheck_sessions() == before
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend
+from job_queue import AnalysisJobManager
+
+PDF = ("deck.pdf", b"%PDF-1.4", "application/pdf")
+
+
+async def two_page_job(job, progress_callback):
+    progress_callback("document_started", {"total_pages": 2})
+    for page_number in (1, 2):
+        await asyncio.sleep(0.2)
+        progress_callback("page_completed", {"page_number": page_number, "status": "success"})
+    return {"status": "success", "file_name": job.file_name}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backend, "job_manager", AnalysisJobManager(two_page_job, workers=1, max_queued_jobs=2))
+    # The render pool isn't needed for fake jobs
+    monkeypatch.setattr(backend, "warm_render_pool", lambda: None)
+    # One event loop for the whole test, so the queue and its workers outlive each request
+    with TestClient(backend.app) as client:
+        yield client
+
+
+def test_full_queue_rejects_the_whole_submission(client):
+    response = client.post("/jobs/documents", files=[("files", PDF)] * 3)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+    assert backend.job_manager.jobs == {}
+
+
+def test_long_poll_returns_on_each_change(client):
+    job, = client.post("/jobs/documents", files=[("files", PDF)]).json()["jobs"]
+    status, seen = job, []
+    while status["status"] not in {"completed", "failed"}:
+        started = time.perf_counter()
+        status = client.get(f"/jobs/{job['job_id']}", params={"wait": 5, "since": status["version"]}).json()
+        assert time.perf_counter() - started < 5
+        seen.append(status["pages_completed"])
+    assert status["status"] == "completed"
+    assert status["total_pages"] == 2
+    # Progress only moves forward, and the poller saw the last page land
+    assert seen == sorted(seen) and seen[-1] == 2
+    assert client.get(f"/jobs/{job['job_id']}/result").json()["file_name"] == "deck.pdf"
+
+
+def test_long_poll_times_out_without_changes(client):
+    job, = client.post("/jobs/documents", files=[("files", PDF)]).json()["jobs"]
+    started = time.perf_counter()
+    status = client.get(f"/jobs/{job['job_id']}", params={"wait": 0.05, "since": 10 ** 6}).json()
+    assert time.perf_counter() - started < 1
+    assert status["status"] in {"queued", "running"}
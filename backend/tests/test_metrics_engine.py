@@ -0,0 +1,95 @@
+import pytest
+
+import metrics_engine
+from metrics_engine import MetricsEngine, extract_metrics, format_verification_block
+
+
+def verify(*texts):
+    return MetricsEngine().verify({f"doc_{index}": text for index, text in enumerate(texts)})
+
+
+def calculations(result, kind):
+    return [calculation for calculation in result["calculations"] if calculation["type"] == kind]
+
+
+def test_runway_from_cash_and_burn():
+    result = verify("We have $850K in the bank and burn $52K per month, about 16 months runway.")
+    runway, = calculations(result, "runway")
+    assert runway["result"] == pytest.approx(16.35, abs=0.01)
+    assert "consistent" in runway["text"]
+
+
+def test_ltv_cac_only_divides_matching_currencies():
+    result = verify(
+        "CAC is averaging $165 across all channels. LTV is $2,400 based on a 24-month average lifetime. "
+        "That's roughly 14 LTV to CAC."
+    )
+    ratios = calculations(result, "ltv_cac")
+    assert [ratio["inputs"][0] for ratio in ratios] == ["$2,400 based"]
+    assert ratios[0]["result"] == pytest.approx(14.55)
+
+
+def test_ltv_cac_without_a_currency_pair_is_insufficient():
+    result = verify("CAC is €150. LTV is $2,400.")
+    assert calculations(result, "ltv_cac") == []
+    assert "LTV:CAC ratio (needs LTV and CAC in the same currency)" in result["insufficient_data"]
+
+
+def test_use_of_funds_percentages_are_not_revenue():
+    text = ("Use of funds: 50% engineering team expansion, 30% sales and marketing, "
+            "15% operations and infrastructure, 5% working capital buffer.")
+    result = verify(text)
+    assert not [m for m in result["metrics"] if m["name"] == "revenue"]
+    assert result["consistency_checks"] == []
+    assert not [c for c in calculations(result, "growth") if c["metric"] == "revenue"]
+
+
+@pytest.mark.parametrize("text, name", [
+    ("Revenue: +35% QoQ", "revenue_growth"),
+    ("Revenue: 35% of bookings", "percentage"),
+])
+def test_revenue_percentage_needs_a_growth_cue(text, name):
+    assert [metric.name for metric in extract_metrics(text)] == [name]
+
+
+def test_section_header_marks_projections():
+    text = """
+3. Q1 Projections (attached spreadsheet):
+   - Q1 ending MRR: $45K
+
+MARCH UPDATE (First half):
+- Revenue: $41K MRR
+"""
+    metrics = {metric.original: metric for metric in extract_metrics(text) if metric.name == "mrr"}
+    assert metrics["$45K"].projected
+    assert not metrics["$41K MRR"].projected
+    result = verify("- Revenue: $38K MRR", text)
+    growth = [c for c in calculations(result, "growth") if c["metric"] == "mrr"]
+    assert [c["inputs"] for c in growth] == [["$38K MRR", "$41K MRR"]]
+
+
+def test_churn_from_value_is_the_older_one():
+    result = verify("Churn rate: Only 2.1% (down from 4.3%)")
+    growth, = [c for c in calculations(result, "growth") if c["metric"] == "churn_rate"]
+    assert growth["inputs"] == ["4.3%", "2.1%"]
+
+
+def test_mrr_vs_arr_contradiction():
+    result = verify("MRR is $50K and ARR is $900K.")
+    check, = calculations(result, "mrr_arr")
+    assert "contradiction (+50.0%)" in check["text"]
+
+
+def test_block_lists_insufficient_data():
+    block = format_verification_block(verify("Team of 12 engineers."))
+    assert block.startswith("**PRECOMPUTED_CALCULATIONS")
+    assert "- Insufficient data for runway (needs cash position and monthly burn)" in block
+
+
+def test_pure_python_path_matches_numpy(monkeypatch):
+    text = "MRR $38K in January, $41K MRR in February, $45K MRR in March. ARR is $500K. CAC $150, LTV $2,400."
+    expected = verify(text)
+    monkeypatch.setattr(metrics_engine, "np", None)
+    fallback = verify(text)
+    assert fallback["calculations"] == expected["calculations"]
+    assert fallback["consistency_checks"] == expected["consistency_checks"]
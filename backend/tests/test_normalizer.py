@@ -0,0 +1,61 @@
+"""
+Golden tests for the rule-based normalizer.
+
+Each golden/normalizer/NAME.txt is normalized and compared with the table in
+NAME.table. The first cases are the examples from the Normalization_Agent
+instructions. After an intended change, rewrite the tables with
+UPDATE_GOLDEN=1 python -m pytest tests/test_normalizer.py and review the diff.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from normalizer import format_normalization_table, normalize_text
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "normalizer"
+CASES = sorted(path.stem for path in GOLDEN_DIR.glob("*.txt"))
+
+
+def render_table(text: str) -> str:
+    rows, _ = normalize_text(text)
+    return format_normalization_table([row.table_row() for row in rows]) + "\n"
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_golden_table(name):
+    text = (GOLDEN_DIR / f"{name}.txt").read_text(encoding="utf-8").rstrip("\n")
+    expected_path = GOLDEN_DIR / f"{name}.table"
+    actual = render_table(text)
+    if os.getenv("UPDATE_GOLDEN"):
+        expected_path.write_text(actual, encoding="utf-8")
+    assert actual == expected_path.read_text(encoding="utf-8")
+
+
+def test_ranges_are_left_for_the_llm():
+    text = (GOLDEN_DIR / "founder_update.txt").read_text(encoding="utf-8")
+    _, unparsed = normalize_text(text)
+    assert unparsed == ["$3-5M"]
+
+
+@pytest.mark.parametrize("name, unparsed", [
+    ("ratio", ["3:1"]),
+    ("clock_time", ["2 PM"]),
+    ("version_number", []),
+    ("quarter_then_total", []),
+])
+def test_ratios_and_times_are_left_for_the_llm(name, unparsed):
+    text = (GOLDEN_DIR / f"{name}.txt").read_text(encoding="utf-8")
+    assert normalize_text(text)[1] == unparsed
+
+
+@pytest.mark.parametrize("text, normalized", [
+    ("Revenue growth of -5% year over year", "-0.05"),
+    ("Net loss of −$1.2M", "-1200000"),
+    ("Burn is -$85K", "-85000"),
+    ("the Tier-2 plan", "2"),
+])
+def test_sign(text, normalized):
+    rows, _ = normalize_text(text)
+    assert [row.normalized for row in rows] == [normalized]
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+from document_ingestor import StartupAnalyzer
+from result_cache import ResultCache
+
+
+class ScriptedModel:
+    """Multimodal model stand-in answering calls from a script (an Exception is raised)."""
+
+    model = "scripted-gemini"
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(content=reply)
+
+
+def pages(*numbers):
+    return [{"page_number": number, "text_content": f"Slide {number}: MRR $4{number}K",
+             "image_base64": "", "fingerprint": f"fingerprint-{number}", "render_policy": "adaptive"}
+            for number in numbers]
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    analyzer = StartupAnalyzer(result_cache=ResultCache(str(tmp_path / "cache.sqlite3")), page_batch_tokens=8000)
+    analyzer.cassette = None
+    return analyzer
+
+
+def analyze(analyzer, replies, batch):
+    analyzer.multimodal_model = ScriptedModel(replies)
+    return analyzer.analyze_page_batch(batch), analyzer.multimodal_model
+
+
+def test_well_formed_reply_is_split_per_page(analyzer):
+    results, model = analyze(analyzer, ["=== PAGE 1 ===\nFirst\n=== PAGE 2 ===\nSecond"], pages(1, 2))
+    assert [result["analysis"] for result in results] == ["First", "Second"]
+    assert len(model.calls) == 1
+
+
+def test_pages_missing_from_the_reply_fall_back_to_single_requests(analyzer):
+    # Page 2's marker is mangled and page 3 is missing altogether
+    reply = "=== PAGE 1 ===\nFirst\nPAGE 2 -- Second\nThird"
+    results, model = analyze(analyzer, [reply, "Second alone", "Third alone"], pages(1, 2, 3))
+    # Page 1 keeps everything up to the next valid marker
+    assert [result["analysis"] for result in results] == [reply.split("\n", 1)[1], "Second alone", "Third alone"]
+    assert [result["status"] for result in results] == ["success"] * 3
+    assert len(model.calls) == 3
+    # The fallback requests carry one page each
+    assert "Slide 2" in str(model.calls[1][-1].content) and "Slide 3" not in str(model.calls[1][-1].content)
+
+
+def test_failed_batch_request_falls_back_page_by_page(analyzer):
+    results, model = analyze(analyzer, [RuntimeError("quota"), "First alone", "Second alone"], pages(1, 2))
+    assert [result["analysis"] for result in results] == ["First alone", "Second alone"]
+    assert len(model.calls) == 3
+
+
+def test_cached_pages_are_not_resent(analyzer):
+    analyze(analyzer, ["=== PAGE 1 ===\nFirst\n=== PAGE 2 ===\nSecond"], pages(1, 2))
+    results, model = analyze(analyzer, ["Third alone"], pages(1, 2, 3))
+    assert [(result["analysis"], result["reused"]) for result in results] == [
+        ("First", True), ("Second", True), ("Third alone", False)
+    ]
+    assert len(model.calls) == 1
@@ -0,0 +1,48 @@
+import fitz
+import pytest
+
+from document_ingestor import RENDER_POLICIES, StartupAnalyzer, render_pdf_page
+
+SLIDE_TEXT = "Revenue by quarter"
+
+
+def chart_slide(bar_height: float) -> bytes:
+    """A slide whose title text never changes while its bar chart does."""
+    doc = fitz.open()
+    page = doc.new_page(width=720, height=405)
+    page.insert_text((40, 40), SLIDE_TEXT, fontsize=24)
+    page.draw_rect(fitz.Rect(100, 380 - bar_height, 160, 380), color=(0, 0, 1), fill=(0, 0, 1))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def render(pdf_bytes: bytes, policy_name: str = "adaptive"):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return render_pdf_page(doc, 0, RENDER_POLICIES[policy_name])
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return StartupAnalyzer(use_cache=False)
+
+
+def test_changed_chart_with_the_same_text_is_not_reused(analyzer):
+    before, after = render(chart_slide(200)), render(chart_slide(201))
+    assert before["text_content"] == after["text_content"]
+    assert before["fingerprint"] != after["fingerprint"]
+    assert analyzer._page_cache_key(before) != analyzer._page_cache_key(after)
+
+
+def test_reexported_page_is_reused(analyzer):
+    original = chart_slide(200)
+    with fitz.open(stream=original, filetype="pdf") as doc:
+        # Different bytes (garbage collection, new xref table), same page
+        reexported = doc.tobytes(garbage=4, deflate=True)
+    assert reexported != original
+    assert analyzer._page_cache_key(render(original)) == analyzer._page_cache_key(render(reexported))
+
+
+def test_render_policy_is_part_of_the_key(analyzer):
+    page = render(chart_slide(200))
+    assert analyzer._page_cache_key(page) != analyzer._page_cache_key({**page, "render_policy": "compact"})
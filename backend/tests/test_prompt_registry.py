@@ -0,0 +1,72 @@
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from prompt_registry import PROMPTS, PromptTemplate, get_prompt
+
+TEMPLATE = """
+You analyse {doc_type} documents.
+
+**RULES:**
+- Keep every number
+
+**DOCUMENT:**
+{text}
+"""
+
+
+def test_payload_lines_and_their_heading_go_to_the_user_message():
+    prompt = PromptTemplate("example", TEMPLATE, ("text",))
+    assert prompt.instruction_fields == ("doc_type",)
+    assert prompt.payload_text(text="MRR $41K") == "**DOCUMENT:**\nMRR $41K"
+    assert prompt.system_text(doc_type="pitch deck") == (
+        "You analyse pitch deck documents.\n\n**RULES:**\n- Keep every number"
+    )
+
+
+def test_heading_above_a_later_payload_line_moves_with_it():
+    prompt = get_prompt("document_chunk_summary")
+    assert prompt.payload_text(page_range="1-8", combined_analysis="MRR $41K (p. 3)") == (
+        "SECTION: pages 1-8\nEXTRACTED PAGE DATA:\nMRR $41K (p. 3)"
+    )
+    assert "EXTRACTED PAGE DATA:" not in prompt.system_text(doc_type="pitch deck")
+
+
+def test_instructions_are_shared_across_payloads():
+    prompt = get_prompt("email_analysis")
+    first = prompt.messages(raw_email_text="We hit $41K MRR.")
+    second = prompt.messages(raw_email_text="Burn is $85K a month.")
+    assert isinstance(first[0], SystemMessage) and isinstance(first[1], HumanMessage)
+    assert first[0].content == second[0].content
+    assert "$41K" not in first[0].content and "$41K" in first[1].content
+
+
+def test_extra_content_follows_the_payload_text():
+    image = {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}}
+    _, user = get_prompt("page_analysis").messages([image], page_number=3, page_text="Revenue chart")
+    assert user.content == [{"type": "text", "text": "**PAGE 3 TEXT CONTENT:**\nRevenue chart"}, image]
+
+
+def test_render_keeps_the_whole_template():
+    prompt = PromptTemplate("example", TEMPLATE, ("text",))
+    assert prompt.render(doc_type="email", text="MRR $41K") == TEMPLATE.format(doc_type="email", text="MRR $41K")
+
+
+def test_version_follows_the_template():
+    assert PromptTemplate("example", TEMPLATE, ("text",)).version == PromptTemplate("example", TEMPLATE, ("text",)).version
+    assert PromptTemplate("example", TEMPLATE + "- Be brief\n", ("text",)).version != \
+        PromptTemplate("example", TEMPLATE, ("text",)).version
+
+
+def test_unknown_payload_field_is_rejected():
+    with pytest.raises(ValueError, match="no fields"):
+        PromptTemplate("example", TEMPLATE, ("body",))
+
+
+@pytest.mark.parametrize("name", sorted(PROMPTS))
+def test_registered_prompts_render_every_field(name):
+    prompt = PROMPTS[name]
+    values = {field: f"<{field}>" for field in prompt.fields}
+    system, user = prompt.messages(**values)
+    for field in prompt.payload_fields:
+        assert f"<{field}>" in user.content and f"<{field}>" not in system.content
+    assert prompt.stats()["instruction_tokens"] <= prompt.stats()["template_tokens"]
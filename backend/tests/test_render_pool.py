@@ -0,0 +1,59 @@
+import fitz
+import pytest
+
+import document_ingestor
+from document_ingestor import StartupAnalyzer
+
+
+class RecordingPool:
+    """Stands in for the render pool and records how many ranges are in flight."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.ranges = []
+
+    def submit(self, fn, path, start, stop, policy):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        self.ranges.append((start, stop))
+        return RecordedRange(self, start, stop)
+
+
+class RecordedRange:
+    def __init__(self, pool, start, stop):
+        self.pool, self.start, self.stop = pool, start, stop
+
+    def result(self):
+        self.pool.in_flight -= 1
+        return [{"page_number": page + 1} for page in range(self.start, self.stop)]
+
+    def cancel(self):
+        pass
+
+
+@pytest.mark.parametrize("workers, max_concurrent_pages, peak", [
+    (8, 4, 8),   # every worker gets a range even when analysis concurrency is lower
+    (2, 8, 2),   # 4-page ranges, two in flight
+    (1, 1, 1),
+])
+def test_in_flight_ranges_cover_every_worker(monkeypatch, workers, max_concurrent_pages, peak):
+    pool = RecordingPool()
+    monkeypatch.setattr(document_ingestor, "render_pool", lambda _: pool)
+    analyzer = StartupAnalyzer(max_concurrent_pages=max_concurrent_pages, render_workers=workers, use_cache=False)
+    pages = list(analyzer._iter_pdf_pages_pooled(b"%PDF-1.4", 40))
+    assert [page["page_number"] for page in pages] == list(range(1, 41))
+    assert pool.peak == peak
+
+
+def test_api_renders_out_of_process_by_default(monkeypatch):
+    # MuPDF holds the GIL while rasterising; rendering on the server's own threads stalls /health
+    import backend
+
+    pool = RecordingPool()
+    monkeypatch.setattr(document_ingestor, "render_pool", lambda _: pool)
+    pdf = fitz.open()
+    pdf.new_page()
+    pages = list(backend.analyzer.iter_pdf_pages(pdf.tobytes()))
+    assert [page["page_number"] for page in pages] == [1]
+    assert pool.ranges == [(0, 1)]
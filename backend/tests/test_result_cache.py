@@ -0,0 +1,57 @@
+import itertools
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Distinct, increasing access times so LRU order is deterministic
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(result_cache.time, "time", lambda: float(next(ticks)))
+
+
+def value(size: int) -> str:
+    return "x" * (size - 2)  # JSON quotes make up the rest
+
+
+def test_evicts_least_recently_used_past_max_bytes(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+    for key in ("a", "b", "c"):
+        cache.set(key, value(100))
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("d", value(100))
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in ("a", "c", "d")] == [True] * 3
+    assert cache.stats()["size_bytes"] == 300
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_an_entry_counts_its_size_once(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+    cache.set("a", value(100))
+    cache.set("a", value(250))
+    assert (cache.stats()["entries"], cache.stats()["size_bytes"], cache.stats()["evictions"]) == (1, 250, 0)
+
+
+def test_oversized_value_is_not_stored(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+    cache.set("a", value(100))
+    cache.set("huge", value(301))
+    assert cache.get("huge") is None
+    assert cache.get("a") == value(100)
+
+
+def test_size_survives_a_restart(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    ResultCache(path, max_bytes=300).set("a", value(200))
+    reopened = ResultCache(path, max_bytes=300)
+    reopened.set("b", value(200))
+    assert reopened.get("a") is None
+    assert reopened.stats()["size_bytes"] == 200
+
+
+def test_key_parts_are_length_prefixed():
+    assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
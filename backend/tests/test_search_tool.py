@@ -0,0 +1,47 @@
+import asyncio
+
+import search_tool
+from search_tool import SearchService, StubSearchBackend, normalize_query
+
+
+def run_searches(service, queries):
+    async def run():
+        return [await service.search(query, {}) for query in queries]
+    return asyncio.run(run())
+
+
+def test_normalize_query_keeps_word_order():
+    assert normalize_query("The Revenue of Acme, Acme revenue") == "revenue acme"
+    assert normalize_query("Acme revenue") != normalize_query("revenue Acme")
+
+
+def test_rewordings_collapse():
+    service = SearchService(StubSearchBackend())
+    first, reworded = run_searches(service, [
+        "Acme Robotics founder John Smith prior company",
+        "prior company of Acme Robotics founder John Smith",
+    ])
+    assert not first["cached"]
+    assert reworded["collapsed_into"] == normalize_query(first["query"])
+
+
+def test_names_and_numbers_do_not_collapse():
+    service = SearchService(StubSearchBackend())
+    results = run_searches(service, [
+        "Acme Robotics founder John Smith prior company",
+        "Acme Robotics founder Jane Smith prior company",
+        "Acme Robotics revenue 2023",
+        "Acme Robotics revenue 2024",
+    ])
+    assert [result["cached"] for result in results] == [False] * 4
+    assert service.backend.calls == [result["query"] for result in results]
+
+
+def test_memory_results_are_bounded(monkeypatch):
+    monkeypatch.setattr(search_tool, "MAX_MEMORY_RESULTS", 2)
+    service = SearchService(StubSearchBackend())
+    run_searches(service, ["Acme 2021", "Acme 2022", "Acme 2021", "Acme 2023"])
+    # "Acme 2021" was used again, so "Acme 2022" is the one evicted
+    assert [entry["result"]["summary"] for entry in service._memory.values()] == [
+        "No stub result for: Acme 2021", "No stub result for: Acme 2023"
+    ]
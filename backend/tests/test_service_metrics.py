@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import backend
+import service_metrics
+from service_metrics import CONTENT_TYPE, MODEL_CALL_ERRORS, MODEL_CALL_SECONDS, AdkModelTimer, MetricsRegistry
+
+
+def test_counter_and_gauge_exposition():
+    registry = MetricsRegistry()
+    pages = registry.counter("pages_analyzed_total", "Pages analyzed", labels=("status", "reused"))
+    pages.inc(status="success", reused="false")
+    pages.inc(2, status="success", reused="false")
+    registry.gauge("analyses_in_flight", "Analyzer calls in flight").set(0.5)
+    assert registry.render() == (
+        "# HELP pages_analyzed_total Pages analyzed\n"
+        "# TYPE pages_analyzed_total counter\n"
+        'pages_analyzed_total{status="success",reused="false"} 3\n'
+        "# HELP analyses_in_flight Analyzer calls in flight\n"
+        "# TYPE analyses_in_flight gauge\n"
+        "analyses_in_flight 0.5\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("page_analysis_duration_seconds", "Page latency",
+                                 labels=("batch_size",), buckets=(1, 5))
+    for seconds in (0.5, 2, 7):
+        latency.observe(seconds, batch_size=1)
+    lines = registry.render().splitlines()[2:]
+    assert lines == [
+        'page_analysis_duration_seconds_bucket{batch_size="1",le="1"} 1',
+        'page_analysis_duration_seconds_bucket{batch_size="1",le="5"} 2',
+        'page_analysis_duration_seconds_bucket{batch_size="1",le="+Inf"} 3',
+        'page_analysis_duration_seconds_sum{batch_size="1"} 9.5',
+        'page_analysis_duration_seconds_count{batch_size="1"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", labels=("detail",)).inc(detail='bad "quote"\\\n')
+    assert registry.render().splitlines()[-1] == 'errors_total{detail="bad \\"quote\\"\\\\\\n"} 1'
+
+
+def test_collected_metrics_are_read_at_scrape_time():
+    registry = MetricsRegistry()
+    sessions = {"memory": 2}
+    registry.gauge("sessions_live", "Live sessions", labels=("backend",),
+                   collect=lambda: {(name,): count for name, count in sessions.items()})
+
+    def broken():
+        raise RuntimeError("cache closed")
+
+    registry.counter("cache_hits_total", "Cache hits", collect=broken)
+    sessions["memory"] = 5
+    rendered = registry.render()
+    assert 'sessions_live{backend="memory"} 5' in rendered
+    # A failing collector drops its samples, not the scrape
+    assert "# TYPE cache_hits_total counter\n" in rendered
+
+
+def test_registering_a_name_again_returns_the_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("jobs_total", "Jobs") is registry.counter("jobs_total", "Jobs")
+
+
+def test_metrics_endpoint():
+    client = TestClient(backend.app)
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    body = response.text
+    assert body.endswith("\n")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    for name in ("model_call_duration_seconds", "pages_analyzed_total", "page_analysis_duration_seconds",
+                 "process_resident_memory_bytes", "document_jobs_queued"):
+        assert f"# TYPE {name} " in body
+
+
+def adk_call(invocation_id: str, model: str):
+    context = SimpleNamespace(invocation_id=invocation_id, agent_name="FactCheck_Agent")
+    return context, SimpleNamespace(model=model)
+
+
+def test_adk_calls_that_never_finish_are_counted_as_errors(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(service_metrics.time, "perf_counter", lambda: now[0])
+    timer = AdkModelTimer()
+    model = "gemini-raises"
+    errors = lambda: MODEL_CALL_ERRORS._values.get((model, "adk"), 0)
+    finished = lambda: MODEL_CALL_SECONDS._series.get((model, "adk"), [None, 0.0, 0])[2]
+
+    context, request = adk_call("ok", model)
+    asyncio.run(timer.before_model_callback(context, request))
+    now[0] += 2
+    asyncio.run(timer.after_model_callback(context, SimpleNamespace(error_code=None)))
+    assert (finished(), errors()) == (1, 0)
+
+    # This call raises inside ADK, so its after callback never runs
+    asyncio.run(timer.before_model_callback(*adk_call("raised", model)))
+    now[0] += timer.max_call_seconds - 1
+    assert timer.expire() == 0
+    now[0] += 2
+    asyncio.run(timer.before_model_callback(*adk_call("next", model)))
+    assert errors() == 1
+    assert list(timer._pending) == [("next", "FactCheck_Agent")]
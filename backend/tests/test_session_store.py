@@ -0,0 +1,89 @@
+import asyncio
+
+from google.adk.events import Event
+from google.genai import types
+
+import session_store
+from session_store import BoundedInMemorySessionService, FileArtifactService, SqliteSessionService
+
+APP, USER = "startup_analyzer", "tester"
+
+
+def create(service):
+    return asyncio.run(service.create_session(app_name=APP, user_id=USER))
+
+
+def live(service):
+    return [session_id for _, _, session_id in service._last_access]
+
+
+def test_least_recently_used_session_is_evicted():
+    service = BoundedInMemorySessionService(max_sessions=2)
+    first, second = create(service), create(service)
+    # An event on the first session makes the second the least recently used
+    asyncio.run(service.append_event(first, Event(author="user")))
+    third = create(service)
+    assert live(service) == [first.id, third.id]
+    assert service.stats()["evictions"] == 1
+
+
+def test_idle_sessions_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: clock[0])
+    service = BoundedInMemorySessionService(ttl_seconds=60)
+    idle = create(service)
+    clock[0] += 61
+    fresh = create(service)
+    assert live(service) == [fresh.id]
+    assert asyncio.run(service.get_session(app_name=APP, user_id=USER, session_id=idle.id)) is None
+
+
+def test_event_on_an_evicted_session_does_not_bring_it_back():
+    service = BoundedInMemorySessionService(max_sessions=2)
+    evicted = create(service)
+    create(service), create(service)
+    asyncio.run(service.append_event(evicted, Event(author="user")))
+    assert evicted.id not in live(service)
+    assert service.stats()["live_sessions"] == 2
+
+
+def sqlite_round_trip(path, event_window):
+    async def run():
+        artifacts = FileArtifactService(str(path.parent / "artifacts"))
+        service = SqliteSessionService(str(path), artifact_service=artifacts)
+        session = await service.create_session(app_name=APP, user_id=USER, state={"deck": "acme.pdf"})
+        for turn in range(5):
+            await service.append_event(session, Event(
+                author="user", invocation_id=f"turn-{turn}",
+                content=types.Content(role="user", parts=[types.Part(text=f"turn {turn}")])
+            ))
+        await artifacts.save_artifact(app_name=APP, user_id=USER, session_id=session.id,
+                                      filename="notes.txt", artifact=types.Part(text="MRR $41K"))
+
+        # A fresh service on the same file, as after a restart
+        reopened = SqliteSessionService(str(path), event_window=event_window, artifact_service=artifacts)
+        loaded = await reopened.get_session(app_name=APP, user_id=USER, session_id=session.id)
+        keys = await artifacts.list_artifact_keys(app_name=APP, user_id=USER, session_id=session.id)
+        await reopened.delete_session(app_name=APP, user_id=USER, session_id=session.id)
+        left = await artifacts.list_artifact_keys(app_name=APP, user_id=USER, session_id=session.id)
+        return loaded, keys, left, reopened.stats()
+    return asyncio.run(run())
+
+
+def event_texts(session):
+    return [event.content.parts[0].text for event in session.events]
+
+
+def test_sqlite_sessions_survive_a_restart(tmp_path):
+    loaded, keys, left, stats = sqlite_round_trip(tmp_path / "sessions.db", event_window=0)
+    assert loaded.state == {"deck": "acme.pdf"}
+    assert event_texts(loaded) == [f"turn {turn}" for turn in range(5)]
+    assert keys == ["notes.txt"]
+    # Deleting the session drops its events and artifacts
+    assert left == []
+    assert stats["live_sessions"] == 0 and stats["stored_events"] == 0
+
+
+def test_sqlite_event_window_loads_recent_events(tmp_path):
+    loaded, _, _, _ = sqlite_round_trip(tmp_path / "sessions.db", event_window=2)
+    assert event_texts(loaded) == ["turn 3", "turn 4"]
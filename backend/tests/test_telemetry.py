@@ -0,0 +1,107 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import fitz
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+import telemetry
+from document_ingestor import RENDER_POLICIES, StartupAnalyzer, render_pdf_page, trace_page_render
+from telemetry import NOOP_SPAN, propagate, record_span, set_status, span
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    """Tracing on, with finished spans collected in memory (the global provider is left alone)."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(telemetry, "TRACING_ENABLED", True)
+    monkeypatch.setattr(telemetry, "_tracer", lambda: provider.get_tracer("test"))
+    return exporter
+
+
+def by_name(exporter):
+    return {finished.name: finished for finished in exporter.get_finished_spans()}
+
+
+def test_tracing_off_costs_nothing():
+    assert span("upload", bytes=10) is NOOP_SPAN
+    assert propagate(len) is len
+    record_span("page.render", 0, 1, stages=[("get_text", 0, 1)])
+
+
+def test_nested_spans_share_a_trace(spans):
+    with span("document", file_name="deck.pdf", pages=None):
+        with span("page.analyze", page_number=1):
+            pass
+    finished = by_name(spans)
+    document, page = finished["document"], finished["page.analyze"]
+    assert page.parent.span_id == document.context.span_id
+    assert page.context.trace_id == document.context.trace_id
+    # None attributes are dropped rather than rejected
+    assert dict(document.attributes) == {"file_name": "deck.pdf"}
+
+
+def test_handled_error_marks_the_span_failed(spans):
+    with span("summary") as current:
+        set_status(current, "failed", RuntimeError("quota exceeded"))
+    summary = by_name(spans)["summary"]
+    assert summary.attributes["status"] == "failed"
+    assert summary.status.status_code == StatusCode.ERROR
+    assert summary.events[0].name == "exception"
+
+
+def test_record_span_rebuilds_stages(spans):
+    record_span("page.render", 1_000, 5_000, stages=[("get_text", 1_000, 2_000), ("get_pixmap", 2_000, 5_000)],
+                page_number=3)
+    finished = by_name(spans)
+    render = finished["page.render"]
+    assert (render.start_time, render.end_time, render.attributes["page_number"]) == (1_000, 5_000, 3)
+    assert finished["page.render.get_pixmap"].parent.span_id == render.context.span_id
+    assert (finished["page.render.get_text"].start_time, finished["page.render.get_text"].end_time) == (1_000, 2_000)
+
+
+def test_propagate_carries_the_span_into_a_thread_pool(spans):
+    def work():
+        with span("summary.chunk"):
+            pass
+
+    with span("summary"), ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(propagate(work)).result()
+    finished = by_name(spans)
+    assert finished["summary.chunk"].parent.span_id == finished["summary"].context.span_id
+
+
+def test_page_pipeline_spans(spans):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "MRR $41K")
+    page_data = render_pdf_page(doc, 0, RENDER_POLICIES["adaptive"])
+    trace_page_render(page_data)
+    assert "render_timings" not in page_data
+
+    analyzer = StartupAnalyzer(use_cache=False)
+    analyzer.cassette = None
+    analyzer.multimodal_model = SimpleNamespace(model="fake", invoke=lambda messages: SimpleNamespace(content="ok"))
+    analyzer.analyze_single_page(page_data)
+
+    finished = by_name(spans)
+    assert {"page.render.get_text", "page.render.plan", "page.render.get_pixmap", "page.render.encode",
+            "page.render.fingerprint"} <= set(finished)
+    assert finished["model.invoke"].parent.span_id == finished["page.analyze"].context.span_id
+    assert finished["page.analyze"].attributes["status"] == "success"
+
+
+def test_file_exporter_writes_json_lines(spans, tmp_path):
+    with span("upload.read", bytes=12):
+        pass
+    path = tmp_path / "traces.jsonl"
+    telemetry._file_exporter(str(path)).export(spans.get_finished_spans())
+    record = json.loads(path.read_text())
+    assert record["name"] == "upload.read"
+    assert record["attributes"] == {"bytes": 12}
+    assert record["parent_id"] is None and len(record["trace_id"]) == 32
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import backend
+
+OVERSIZED = b"%PDF-" + b"0" * 300_000
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backend, "MAX_UPLOAD_BYTES", 100_000)
+    return TestClient(backend.app)
+
+
+def multipart_chunks(content: bytes, chunk_bytes: int = 64 * 1024):
+    body = (b'--b\r\nContent-Disposition: form-data; name="file"; filename="deck.pdf"\r\n'
+            b"Content-Type: application/pdf\r\n\r\n" + content + b"\r\n--b--\r\n")
+    for start in range(0, len(body), chunk_bytes):
+        yield body[start:start + chunk_bytes]
+
+
+def test_rejects_declared_content_length(client):
+    response = client.post("/analyze/document", files={"file": ("deck.pdf", OVERSIZED, "application/pdf")})
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize("path", ["/analyze/document", "/analyze/document/stream"])
+def test_rejects_streamed_body_without_content_length(client, path):
+    # A generator body is sent chunked, so only the running byte count can catch it
+    response = client.post(path, content=multipart_chunks(OVERSIZED),
+                           headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Request too large")
+
+
+def test_rejection_carries_cors_headers(client):
+    response = client.post("/analyze/document", files={"file": ("deck.pdf", OVERSIZED, "application/pdf")},
+                           headers={"origin": "http://localhost:3000"})
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+
+def test_upload_limit_is_read_at_call_time(client):
+    # Within the request allowance (limit + multipart overhead), over the per-file limit
+    response = client.post("/analyze/document",
+                           files={"file": ("deck.pdf", b"%PDF-" + b"0" * 150_000, "application/pdf")})
+    assert response.status_code == 413
+    assert response.json()["detail"] == "File too large. Maximum size is 100000 bytes"
@@ -0,0 +1,42 @@
+"""
+token_counter.py — Token counts for prompt budgeting
+• Uses tiktoken (cl100k_base by default) as a close stand-in for Gemini's tokenizer
+• Falls back to a length-based estimate when the encoding can't be loaded
+  (tiktoken downloads encodings on first use, which fails offline)
+"""
+
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+
+TOKEN_ENCODING = os.getenv("TOKEN_ENCODING", "cl100k_base")
+
+# Average characters per token for English prose, used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+_encoder_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_encoder(encoding_name: str):
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        print(f"⚠️ tiktoken encoding '{encoding_name}' unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def _encoder(encoding_name: str):
+    # Loading may download the encoding; concurrent first calls wait for one load
+    with _encoder_lock:
+        return _load_encoder(encoding_name)
+
+
+def count_tokens(text: str, encoding_name: Optional[str] = None) -> int:
+    """Number of tokens in text (estimated when tiktoken can't load the encoding)."""
+    encoder = _encoder(encoding_name or TOKEN_ENCODING)
+    if encoder is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoder.encode(text, disallowed_special=()))
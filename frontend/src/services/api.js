@@ -58,6 +58,43 @@ export const analyzeDocument = async (formData) => {
   }
 };
 
+// Background document jobs API (no long-held request, works for large decks)
+export const submitDocumentJobs = async (files) => {
+  try {
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file));
+    const response = await api.post('/jobs/documents', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    });
+    return response.data.jobs;
+  } catch (error) {
+    throw new Error(`Job submission failed: ${error.message}`);
+  }
+};
+
+// Long-polls until the job changes after `since` (or `wait` seconds pass)
+export const getDocumentJob = async (jobId, since = -1, wait = 25) => {
+  try {
+    const response = await api.get(`/jobs/${jobId}`, {
+      params: { since, wait },
+    });
+    return response.data;
+  } catch (error) {
+    throw new Error(`Job status failed: ${error.message}`);
+  }
+};
+
+export const getDocumentJobResult = async (jobId) => {
+  try {
+    const response = await api.get(`/jobs/${jobId}/result`);
+    return response.data;
+  } catch (error) {
+    throw new Error(`Job result failed: ${error.message}`);
+  }
+};
+
 // Email analysis API
 export const analyzeEmail = async (emailText) => {
   try {